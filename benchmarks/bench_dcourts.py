@@ -0,0 +1,95 @@
+# benchmarks/bench_dcourts.py
+"""
+District court fallback benchmark: the stand-in server publishes a day's cause lists
+as PDF (and one HTML) files, and DCourtsScraper downloads and extracts them with
+different extraction process counts. Checks that every listed case comes back.
+
+    python benchmarks/bench_dcourts.py --courts 12 --rows 400 --workers 1 4
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from scraper.dcourts_scraper import DCourtsScraper  # noqa: E402
+from scraper.html_table import rows_to_html  # noqa: E402
+from scraper.pdf_render import render_pdf  # noqa: E402
+from scraper.standin import StandInServer, add_documents  # noqa: E402
+
+HEADERS = ["Sr No", "Cases", "Party Name", "Advocate"]
+
+
+def court_rows(court, n):
+    stages = ["Hearing", "Evidence", "Awaiting Summons"]
+    rows = []
+    for i in range(1, n + 1):
+        if i % 25 == 1:
+            rows.append({"Sr No": stages[(i // 25) % len(stages)]})
+        rows.append({
+            "Sr No": str(i),
+            "Cases": f"R.C.S./{court * 1000 + i}/2024",
+            "Party Name": f"Petitioner {i}\nversus\nRespondent {i}",
+            "Advocate": f"Advocate {i % 40}",
+        })
+    return rows
+
+
+def build_recording(tmp, courts, rows, date_str):
+    day = "-".join(reversed(date_str.split("-")))
+    documents = []
+    expected = 0
+    for c in range(1, courts + 1):
+        data = court_rows(c, rows)
+        expected += sum(1 for r in data if len(r) > 1)
+        if c == courts:
+            documents.append((f"court{c}_{day}.html", f"Court {c} cause list {day}",
+                              rows_to_html(data), "text/html"))
+            continue
+        path = os.path.join(tmp, f"court{c}.pdf")
+        render_pdf(data, path, title=f"Court {c} - Cause List {day}", headers=HEADERS)
+        with open(path, "rb") as f:
+            documents.append((f"court{c}_{day}.pdf", f"Court {c} cause list {day}", f.read(), "application/pdf"))
+    # another day's file on the same page must be ignored
+    documents.append(("court1_01-01-2020.pdf", "Court 1 cause list 01-01-2020", b"%PDF-1.4", "application/pdf"))
+    return add_documents({"routes": {}}, documents), expected
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--courts", type=int, default=12, help="files published for the day")
+    ap.add_argument("--rows", type=int, default=400, help="cases per file")
+    ap.add_argument("--workers", type=int, nargs="+", default=[1, os.cpu_count() or 2])
+    ap.add_argument("--pool", type=int, default=4, help="concurrent downloads")
+    ap.add_argument("--date", default="2025-10-27")
+    args = ap.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="ecourts_dcourts_")
+    try:
+        recording, expected = build_recording(tmp, args.courts, args.rows, args.date)
+        with StandInServer(recording) as server:
+            print(f"stand-in at {server.url}, {args.courts} files, {expected} cases")
+            for workers in args.workers:
+                download_dir = os.path.join(tmp, f"run{workers}")
+                scraper = DCourtsScraper(download_dir=download_dir, district="Pune", base_url=server.url,
+                                         pool_size=args.pool, workers=workers)
+                t0 = time.perf_counter()
+                pdf_path, data = scraper.download_all_for_date(args.date)
+                dt = time.perf_counter() - t0
+                scraper.close()
+                cases = sum(1 for r in data if len(r) > 1)
+                errors = [d["error"] for d in scraper.last_documents if d["error"]]
+                status = "ok" if cases == expected and not errors else f"MISMATCH ({cases}/{expected}) {errors[:2]}"
+                print(f"workers={workers:2d}  {len(scraper.last_documents):3d} files  {cases:6d} cases  "
+                      f"{dt:7.2f} s  {len(scraper.last_documents) / dt:6.1f} files/s  {status}")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
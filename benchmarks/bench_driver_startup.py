@@ -0,0 +1,81 @@
+# benchmarks/bench_driver_startup.py
+"""
+Startup latency of a scraper session: cold (new ECourtsScraper per call, as the
+Streamlit button used to do) versus warm (borrowing a DriverService session).
+
+    python benchmarks/bench_driver_startup.py --runs 5 --port 9222
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import scraper.driver_service as driver_service  # noqa: E402
+from scraper.driver_service import DriverService, resolve_chromedriver  # noqa: E402
+from scraper.ecourts_scraper import ECourtsScraper  # noqa: E402
+
+
+def _summary(label, samples):
+    if not samples:
+        print(f"{label:28s} no samples")
+        return
+    print(f"{label:28s} median {statistics.median(samples) * 1000:9.1f} ms   "
+          f"min {min(samples) * 1000:9.1f} ms   max {max(samples) * 1000:9.1f} ms")
+
+
+def _timed(fn):
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--port", type=int, default=9222)
+    ap.add_argument("--download-dir", default=str(ROOT / "downloads"))
+    args = ap.parse_args()
+
+    # chromedriver resolution: network lookup vs in-process memo
+    try:
+        resolve_first = _timed(lambda: resolve_chromedriver(refresh=True))
+    except Exception as e:
+        print(f"chromedriver could not be resolved ({e}); nothing to measure.")
+        return
+    resolve_memo = [_timed(resolve_chromedriver) for _ in range(args.runs)]
+    _summary("resolve chromedriver (lookup)", [resolve_first])
+    _summary("resolve chromedriver (memo)", resolve_memo)
+
+    # cold: forget the memo so each construction pays the lookup, like the old per-instance setup
+    cold = []
+    for _ in range(args.runs):
+        driver_service._chromedriver_path = None
+        try:
+            cold.append(_timed(lambda: ECourtsScraper(download_dir=args.download_dir,
+                                                      debug_port=args.port).close()))
+        except Exception as e:
+            print(f"cold start failed: {e}")
+            break
+
+    service = DriverService(debug_port=args.port)
+    warm = []
+    try:
+        service.warm_up()
+        for _ in range(args.runs):
+            warm.append(_timed(lambda: ECourtsScraper(download_dir=args.download_dir,
+                                                      driver_service=service).close()))
+    except Exception as e:
+        print(f"warm start failed: {e}")
+    finally:
+        service.shutdown()
+
+    _summary("cold scraper start", cold)
+    _summary("warm scraper start", warm)
+
+
+if __name__ == "__main__":
+    main()
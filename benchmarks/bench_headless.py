@@ -0,0 +1,72 @@
+# benchmarks/bench_headless.py
+"""
+Page-load time and bytes transferred for the cause list page per browser mode:
+visible (attached debug-port Chrome), headless, and headless with images, fonts,
+stylesheets and analytics blocked.
+
+    python benchmarks/bench_headless.py --runs 5
+    python benchmarks/bench_headless.py --url http://127.0.0.1:8765/ --modes headless headless+block
+"""
+import argparse
+import statistics
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from scraper.driver_service import DriverService  # noqa: E402
+from scraper.ecourts_scraper import ECourtsScraper  # noqa: E402
+
+MODES = {
+    "visible": {"headless": False, "block_resources": False},
+    "visible+block": {"headless": False, "block_resources": True},
+    "headless": {"headless": True, "block_resources": False},
+    "headless+block": {"headless": True, "block_resources": True},
+}
+
+
+def measure(mode, url, runs, port):
+    service = DriverService(debug_port=port, **MODES[mode])
+    loads, sizes = [], []
+    try:
+        scraper = ECourtsScraper(driver_service=service, base_url=url)
+        try:
+            for _ in range(runs):
+                # a cold cache every time, so bytes reflect a first visit
+                scraper.driver.execute_cdp_cmd("Network.clearBrowserCache", {})
+                scraper.open_page()
+                stats = scraper.last_page_load
+                if stats.get("load_ms") is not None:
+                    loads.append(stats["load_ms"])
+                sizes.append(stats.get("transfer_bytes") or 0)
+        finally:
+            scraper.close()
+    finally:
+        service.shutdown()
+    return loads, sizes
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--url", default=ECourtsScraper.BASE_URL)
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--port", type=int, default=9222, help="debug port for the visible modes")
+    ap.add_argument("--modes", nargs="+", default=list(MODES), choices=list(MODES))
+    args = ap.parse_args()
+
+    for mode in args.modes:
+        try:
+            loads, sizes = measure(mode, args.url, args.runs, args.port)
+        except Exception as e:
+            print(f"{mode:16s} skipped: {e}")
+            continue
+        if not sizes:
+            print(f"{mode:16s} no samples")
+            continue
+        load = f"{statistics.median(loads):8.0f} ms" if loads else "       ? ms"
+        print(f"{mode:16s} load median {load}   transferred median {statistics.median(sizes) / 1024:8.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
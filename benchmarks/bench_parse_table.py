@@ -0,0 +1,159 @@
+# benchmarks/bench_parse_table.py
+"""
+Compare the element-by-element parse_table path with the single round-trip
+outerHTML path on the saved HTML fixtures in benchmarks/fixtures/.
+
+    python benchmarks/bench_parse_table.py            # in-process parse + headless Chrome if available
+    python benchmarks/bench_parse_table.py --no-browser
+    python benchmarks/bench_parse_table.py --write-fixtures
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from scraper.html_table import parse_tables_html, rows_to_html  # noqa: E402
+
+FIXTURES_DIR = ROOT / "benchmarks" / "fixtures"
+PUNE_JSON = ROOT / "downloads" / "Maharashtra_Pune_Pune_Civil_and_Criminal_Court_2025-10-27.json"
+
+
+def _page(tables_html, title):
+    return f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>{title}</title></head><body>{''.join(tables_html)}</body></html>"
+
+
+def synthetic_rows(n):
+    stages = ["Hearing", "Evidence", "Awaiting Summons", "Argument"]
+    rows = []
+    for i in range(1, n + 1):
+        if i % 25 == 1:
+            rows.append({"Sr No": stages[(i // 25) % len(stages)]})
+        rows.append({
+            "Sr No": str(i),
+            "Cases": f"ViewR.C.S./{1000 + i}/20{10 + i % 15}",
+            "Party Name": f"Petitioner {i} Kumar\nversus\nRespondent {i} Patil",
+            "Advocate": f"Advocate A{i % 40}\n\nAdvocate B{i % 55}",
+        })
+    return rows
+
+
+def write_fixtures():
+    FIXTURES_DIR.mkdir(parents=True, exist_ok=True)
+    with open(PUNE_JSON, encoding="utf-8") as f:
+        pune = json.load(f)
+    (FIXTURES_DIR / "pune_2025-10-27.html").write_text(
+        _page([rows_to_html(pune)], "Pune cause list"), encoding="utf-8")
+    rows = synthetic_rows(300)
+    half = len(rows) // 2
+    # two result tables on one page, as when a complex lists several courts
+    (FIXTURES_DIR / "synthetic_300.html").write_text(
+        _page([rows_to_html(rows[:half], "resultTable"), rows_to_html(rows[half:], "resultTable2")],
+              "Synthetic cause list"), encoding="utf-8")
+
+
+def _time(fn, repeat):
+    best = None
+    out = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        dt = time.perf_counter() - t0
+        best = dt if best is None else min(best, dt)
+    return best, out
+
+
+class _CountingDriver:
+    """Counts WebDriver commands issued through driver.execute."""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.calls = 0
+        self._execute = driver.execute
+        driver.execute = self._counted
+
+    def _counted(self, *args, **kwargs):
+        self.calls += 1
+        return self._execute(*args, **kwargs)
+
+
+def bench_browser(fixtures, repeat):
+    try:
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.common.by import By
+        from scraper.ecourts_scraper import ECourtsScraper
+    except ImportError as e:
+        print(f"browser benchmark skipped: {e}")
+        return
+    options = Options()
+    options.add_argument("--headless=new")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    try:
+        driver = webdriver.Chrome(options=options)
+    except Exception as e:
+        print(f"browser benchmark skipped: could not start headless Chrome ({e})")
+        return
+    counter = _CountingDriver(driver)
+    try:
+        scraper = ECourtsScraper(download_dir=os.path.join(str(ROOT), "downloads"), driver=driver)
+        for path in fixtures:
+            driver.get(Path(path).as_uri())
+            table = driver.find_element(By.TAG_NAME, "table")
+
+            counter.calls = 0
+            t_old, old = _time(lambda: scraper.parse_table(table, fast=False), repeat)
+            calls_old = counter.calls // repeat
+            counter.calls = 0
+            t_new, new = _time(lambda: scraper.parse_table(table), repeat)
+            calls_new = counter.calls // repeat
+            counter.calls = 0
+            t_all, all_tables = _time(scraper.parse_result_tables, repeat)
+            calls_all = counter.calls // repeat
+
+            print(f"{os.path.basename(path)}")
+            print(f"  elements   : {t_old * 1000:9.1f} ms  {calls_old:6d} calls  {len(old)} rows (first table)")
+            print(f"  outerHTML  : {t_new * 1000:9.1f} ms  {calls_new:6d} calls  {len(new)} rows (first table)  same={old == new}")
+            print(f"  all tables : {t_all * 1000:9.1f} ms  {calls_all:6d} calls  "
+                  f"{sum(len(t) for t in all_tables)} rows in {len(all_tables)} tables")
+    finally:
+        driver.quit()
+
+
+def bench_in_process(fixtures, repeat):
+    for path in fixtures:
+        with open(path, encoding="utf-8") as f:
+            page = f.read()
+        t, tables = _time(lambda: parse_tables_html(page), repeat)
+        print(f"{os.path.basename(path)}: parsed {sum(len(x) for x in tables)} rows "
+              f"in {len(tables)} tables, {t * 1000:.2f} ms in-process")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--no-browser", action="store_true", help="only time the in-process HTML parse")
+    ap.add_argument("--write-fixtures", action="store_true", help="regenerate fixtures from downloads/ and exit")
+    args = ap.parse_args()
+
+    if args.write_fixtures:
+        write_fixtures()
+        return
+    fixtures = sorted(glob.glob(str(FIXTURES_DIR / "*.html")))
+    if not fixtures:
+        write_fixtures()
+        fixtures = sorted(glob.glob(str(FIXTURES_DIR / "*.html")))
+
+    bench_in_process(fixtures, args.repeat)
+    if not args.no_browser:
+        bench_browser(fixtures, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
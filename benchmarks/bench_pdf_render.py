@@ -0,0 +1,55 @@
+# benchmarks/bench_pdf_render.py
+"""
+Rendering benchmark for the PDF table engine over synthetic cause lists.
+
+    python benchmarks/bench_pdf_render.py --rows 2000 20000 --workers 1 4
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from scraper.pdf_render import render_pdf  # noqa: E402
+
+
+def synthetic_rows(n):
+    stages = ["Hearing", "Evidence", "Awaiting Summons", "Argument on Exh.____Unready"]
+    for i in range(1, n + 1):
+        if i % 25 == 1:
+            yield {"Sr No": stages[(i // 25) % len(stages)]}
+        yield {
+            "Sr No": str(i),
+            "Cases": f"ViewR.C.S./{1000 + i}/20{10 + i % 15}",
+            "Party Name": f"Petitioner {i} Ramchandra Kulkarni and others\nversus\n"
+                          f"Respondent {i} Municipal Corporation through its Commissioner",
+            "Advocate": f"Patil Shivajirao Janardanrao {i % 40}\n\nKshirsagar Akshay Sudhakar {i % 55}",
+        }
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--rows", type=int, nargs="+", default=[2000, 20000])
+    ap.add_argument("--workers", type=int, nargs="+", default=[1, os.cpu_count() or 2])
+    ap.add_argument("--chunk-rows", type=int, default=2000)
+    args = ap.parse_args()
+
+    headers = ["Sr No", "Cases", "Party Name", "Advocate"]
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.rows:
+            for workers in args.workers:
+                out = os.path.join(tmp, f"bench_{n}_{workers}.pdf")
+                t0 = time.perf_counter()
+                render_pdf(synthetic_rows(n), out, title="Benchmark Cause List", headers=headers,
+                           workers=workers, chunk_rows=args.chunk_rows)
+                dt = time.perf_counter() - t0
+                size_kb = os.path.getsize(out) / 1024
+                print(f"rows={n:7d} workers={workers:2d}  {dt:7.2f} s  {n / dt:9.0f} rows/s  {size_kb:9.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+# benchmarks/bench_replay.py
+"""
+End-to-end replay benchmark against the local stand-in server: every engine fetches
+the recorded cause lists through BatchRunner, sequentially and with a pool, and
+reports latency percentiles and lists per minute. No live eCourts access needed
+(the selenium engine needs a local Chrome; it is skipped when none can be started).
+
+    python benchmarks/bench_replay.py --engines http selenium --lists 20 --concurrency 1 4
+    python benchmarks/bench_replay.py --json out.json --baseline last.json --tolerance 0.2
+"""
+import argparse
+import itertools
+import json
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from scraper.batch import BatchRunner  # noqa: E402
+from scraper.standin import StandInServer, load_recording  # noqa: E402
+
+DEFAULT_RECORDING = ROOT / "benchmarks" / "fixtures" / "recordings" / "pune.json"
+
+
+def recorded_targets(recording, state, district, court_complex):
+    """One target per date that has a recorded (non-empty) list."""
+    dates = []
+    for candidate in recording["routes"].get("cause_list/submitCauseList", []):
+        d = candidate.get("match", {}).get("causelist_date")
+        if d:
+            dates.append("-".join(reversed(d.split("-"))))
+    return [(state, district, court_complex, d) for d in sorted(set(dates))]
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile."""
+    if not samples:
+        return float("nan")
+    ordered = sorted(samples)
+    k = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered) + 0.5)) - 1))
+    return ordered[k]
+
+
+class _Timed:
+    """Wraps an engine session and records the latency of every list it fetches."""
+
+    def __init__(self, scraper, samples, lock, page_url=None):
+        self.scraper = scraper
+        self.samples = samples
+        self.lock = lock
+        self.page_url = page_url
+        self.base_url = getattr(scraper, "base_url", None)
+
+    def generate_pdf_for_date(self, state, district, court_complex, date_str, **kwargs):
+        if self.page_url:
+            # the browser page picks its date from ?date=
+            self.scraper.base_url = f"{self.page_url}?date={date_str}"
+        t0 = time.perf_counter()
+        result = self.scraper.generate_pdf_for_date(state, district, court_complex, date_str, **kwargs)
+        elapsed = time.perf_counter() - t0
+        with self.lock:
+            self.samples.append(elapsed)
+        return result
+
+    def close(self):
+        self.scraper.close()
+
+
+def _engine_factory(engine, url, download_dir, index):
+    if engine == "http":
+        from scraper.http_scraper import HttpCourtsScraper
+        return HttpCourtsScraper(download_dir=download_dir, base_url=url), None
+    from scraper.ecourts_scraper import ECourtsScraper
+    return ECourtsScraper(download_dir=download_dir, base_url=url, debug_port=9300 + index,
+                          user_data_dir=str(Path(tempfile.gettempdir()) / f"ecourts-bench-{index}")), url
+
+
+def run_case(engine, url, targets, concurrency, download_dir):
+    samples = []
+    lock = threading.Lock()
+
+    def factory(index):
+        # one directory per session so concurrent runs of the same date don't share files
+        scraper, page_url = _engine_factory(engine, url, str(Path(download_dir) / f"s{index}"), index)
+        return _Timed(scraper, samples, lock, page_url)
+
+    runner = BatchRunner(pool_size=concurrency, download_dir=download_dir,
+                         max_per_host=concurrency, min_interval=0.0, scraper_factory=factory)
+    t0 = time.perf_counter()
+    results = runner.run(targets)
+    wall = time.perf_counter() - t0
+    ok = len(samples)
+    return {
+        "engine": engine,
+        "concurrency": concurrency,
+        "lists": len(targets),
+        "ok": ok,
+        "rows": sum(len(r.get("data") or []) for r in results),
+        "errors": sorted(set(runner.errors.values()))[:3],
+        "p50_ms": percentile(samples, 50) * 1000,
+        "p90_ms": percentile(samples, 90) * 1000,
+        "p99_ms": percentile(samples, 99) * 1000,
+        "wall_s": wall,
+        "lists_per_min": ok / wall * 60 if wall else 0.0,
+    }
+
+
+def _print(case):
+    label = f"{case['engine']} x{case['concurrency']}"
+    if not case["ok"]:
+        print(f"{label:14s} no successful runs: {'; '.join(case['errors']) or 'unknown error'}")
+        return
+    print(f"{label:14s} {case['ok']:4d}/{case['lists']:<4d} lists {case['rows']:6d} rows   "
+          f"p50 {case['p50_ms']:8.1f} ms   p90 {case['p90_ms']:8.1f} ms   p99 {case['p99_ms']:8.1f} ms   "
+          f"{case['lists_per_min']:8.1f} lists/min")
+
+
+def _regressions(cases, baseline_path, tolerance):
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {(c["engine"], c["concurrency"]): c for c in json.load(f)}
+    out = []
+    for case in cases:
+        base = baseline.get((case["engine"], case["concurrency"]))
+        if base and case["ok"] and case["lists_per_min"] < base["lists_per_min"] * (1 - tolerance):
+            out.append(f"{case['engine']} x{case['concurrency']}: {case['lists_per_min']:.1f} lists/min "
+                       f"vs baseline {base['lists_per_min']:.1f}")
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--recording", default=str(DEFAULT_RECORDING))
+    ap.add_argument("--engines", nargs="+", default=["http", "selenium"], choices=["http", "selenium"])
+    ap.add_argument("--lists", type=int, default=20, help="lists fetched per case (recorded dates repeat)")
+    ap.add_argument("--concurrency", type=int, nargs="+", default=[1, 4])
+    ap.add_argument("--state", default="Maharashtra")
+    ap.add_argument("--district", default="Pune")
+    ap.add_argument("--court-complex", default="Pune, Civil and Criminal Court")
+    ap.add_argument("--json", help="write the results here")
+    ap.add_argument("--baseline", help="earlier --json output; exit 1 if throughput regressed")
+    ap.add_argument("--tolerance", type=float, default=0.2, help="allowed lists/min drop vs baseline")
+    args = ap.parse_args()
+
+    recording = load_recording(args.recording)
+    dates = recorded_targets(recording, args.state, args.district, args.court_complex)
+    if not dates:
+        print(f"{args.recording} has no recorded cause lists.")
+        return
+    targets = list(itertools.islice(itertools.cycle(dates), args.lists))
+
+    cases = []
+    download_dir = tempfile.mkdtemp(prefix="ecourts_replay_")
+    try:
+        with StandInServer(recording) as server:
+            print(f"stand-in at {server.url}, {len(dates)} recorded dates, {len(targets)} lists per case")
+            for engine in args.engines:
+                for concurrency in args.concurrency:
+                    case = run_case(engine, server.url, targets, concurrency, download_dir)
+                    _print(case)
+                    cases.append(case)
+                    if not case["ok"]:
+                        break
+    finally:
+        shutil.rmtree(download_dir, ignore_errors=True)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(cases, f, indent=2)
+    if args.baseline:
+        regressions = _regressions(cases, args.baseline, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
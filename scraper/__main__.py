@@ -0,0 +1,6 @@
+# scraper/__main__.py
+import sys
+
+from .cli import main
+
+sys.exit(main())
@@ -0,0 +1,565 @@
+# scraper/archive.py
+"""
+Append-only compressed archive of scraped cause lists. A row that repeats across dates
+(most of a court's list does) is stored once; each listing records only the
+fingerprints of its rows plus the rows the archive has not seen before.
+PDF/CSV/JSON files are generated from the archive on demand into a size-bounded
+export directory instead of being kept for every court and date.
+
+    python -m scraper.archive migrate --from downloads --remove
+    python -m scraper.archive export Maharashtra_Pune_Pune_Civil_and_Criminal_Court 2025-10-27 --format pdf csv
+    python -m scraper.archive stats
+"""
+import argparse
+import glob
+import hashlib
+import json
+import mmap
+import os
+import re
+import struct
+import threading
+import time
+import zlib
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from .utils import ensure_dir, export_basename, DEFAULT_CACHE_DIR, DEFAULT_PDF_WORKERS
+from .export_pipeline import export_stream
+from .search_index import FILENAME_RE
+
+DEFAULT_ARCHIVE_DIR = os.path.join(DEFAULT_CACHE_DIR, "archive")
+DEFAULT_EXPORT_DIR = os.path.join(DEFAULT_CACHE_DIR, "exports")
+# files written this recently are never pruned: another export (thread or process)
+# may still be writing them or handing them to its caller
+EXPORT_GRACE_SECONDS = 300
+
+MAGIC = b"ECA1"
+FRAME_HEAD = struct.Struct("<4sII")  # magic, compressed payload length, crc32 of the payload
+ROW_REC = struct.Struct("<8sIQI")  # row fingerprint -> segment, frame offset, frame length
+LISTING_REC = struct.Struct("<20sIQId")  # sha1(court|date) -> segment, frame offset, frame length, stored at
+FRAME_CACHE = 64
+SERIAL_COLUMN_RE = re.compile(r"^\s*(sr|s|sl)\.?\s*(no|number)\.?\s*$", re.I)
+
+
+def court_key(state, district, court_complex):
+    """The court part of the export file names, e.g. 'Maharashtra_Pune_Pune_Civil_and_Criminal_Court'."""
+    return export_basename(state, district, court_complex, "")[:-1]
+
+
+def row_id(row):
+    """Exact content hash of a row (values and column order), as 16 hex chars."""
+    canon = json.dumps(row, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.blake2b(canon.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def split_serial(row):
+    """
+    (row with its serial number blanked, serial number). Lists are renumbered whenever a
+    case is added or dropped above a row, so rows are deduplicated without their 'Sr No'
+    and the numbers are kept per listing. (row, None) when the row has no serial number.
+    """
+    for k, v in row.items():
+        if SERIAL_COLUMN_RE.match(k):
+            if not v:
+                break
+            blanked = dict(row)
+            blanked[k] = ""
+            return blanked, v
+    return row, None
+
+
+def _restore_serial(row, serial):
+    for k in row:
+        if SERIAL_COLUMN_RE.match(k):
+            row[k] = serial
+            return
+
+
+def _listing_digest(court, date_str):
+    return hashlib.sha1(f"{court}|{date_str}".encode("utf-8")).digest()
+
+
+@contextmanager
+def _exclusive(f):
+    """Hold an exclusive lock on an open file, across processes."""
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _drop_torn_tail(path, record_size):
+    # a crash mid-append can leave a partial record at the end of an index
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        return
+    if size % record_size:
+        with open(path, "r+b") as f:
+            f.truncate(size - size % record_size)
+
+
+class ArchiveStore:
+    """
+    Segment files seg-000001.dat, ... hold zlib-compressed frames, one per stored listing:
+        {"court", "date", "ts", "fps": [row ids in order], "rows": {row id: row} for new rows only,
+         "sr": [serial number of each row, or null] when any row has one}
+    Rows are stored and fingerprinted with their serial number blanked (see split_serial).
+    Two fixed-width indexes sit beside them:
+        rows.idx      row id -> the frame holding that row (loaded into memory, it drives dedup)
+        listings.idx  court/date digest -> its latest frame; memory-mapped and searched from the
+                      end, so a lookup costs one index probe plus the frames it touches
+    Everything is append-only: storing a changed list adds a new frame and index record
+    (the last record for a key wins); storing an unchanged list writes nothing.
+    Thread-safe, and several processes may write at once: every append happens under an
+    exclusive lock on write.lock and goes to the current end of the newest segment.
+    """
+
+    def __init__(self, root=DEFAULT_ARCHIVE_DIR, export_dir=DEFAULT_EXPORT_DIR, segment_bytes=64 * 1024 * 1024,
+                 max_export_bytes=128 * 1024 * 1024, level=6, export_grace=EXPORT_GRACE_SECONDS):
+        """
+        segment_bytes: start a new segment file once the current one reaches this size
+        max_export_bytes: generated files kept in export_dir before the oldest are deleted
+        export_grace: seconds a generated file is safe from pruning (the bound may be
+                      exceeded meanwhile)
+        level: zlib compression level
+        """
+        self.root = root
+        self.export_dir = export_dir
+        self.segment_bytes = segment_bytes
+        self.max_export_bytes = max_export_bytes
+        self.export_grace = export_grace
+        self.level = level
+        self._exporting = Counter()  # export paths in flight in this process -> exports using them
+        ensure_dir(root)
+        self._lock = threading.Lock()
+        self._lock_f = open(os.path.join(root, "write.lock"), "a+b")
+        self._rows_path = os.path.join(root, "rows.idx")
+        self._listings_path = os.path.join(root, "listings.idx")
+        with _exclusive(self._lock_f):
+            # under the lock: another process's append in progress is not a torn tail
+            _drop_torn_tail(self._rows_path, ROW_REC.size)
+            _drop_torn_tail(self._listings_path, LISTING_REC.size)
+        self._rows_f = open(self._rows_path, "ab")
+        self._listings_f = open(self._listings_path, "ab")
+        self._rows = {}  # row fingerprint (8 bytes) -> (segment, offset, length)
+        self._rows_read = 0
+        self._load_rows()
+        self._map = None
+        self._mapped = 0
+        segments = sorted(int(m.group(1)) for m in
+                          (re.match(r"seg-(\d+)\.dat$", n) for n in os.listdir(root)) if m)
+        self._segment = segments[-1] if segments else 1
+        self._seg_f = open(self._segment_path(self._segment), "ab")
+        self._readers = {}
+        self._frames = OrderedDict()
+
+    # ---------- Files ----------
+    def _segment_path(self, segment):
+        return os.path.join(self.root, f"seg-{segment:06d}.dat")
+
+    def _load_rows(self):
+        # also picks up rows appended by another process since the last call
+        with open(self._rows_path, "rb") as f:
+            f.seek(self._rows_read)
+            data = f.read()
+        data = data[:len(data) - len(data) % ROW_REC.size]
+        for fp, seg, off, length in ROW_REC.iter_unpack(data):
+            self._rows[fp] = (seg, off, length)
+        self._rows_read += len(data)
+
+    def _listing_map(self):
+        size = os.path.getsize(self._listings_path)
+        size -= size % LISTING_REC.size
+        if size != self._mapped:
+            if self._map is not None:
+                self._map.close()
+            self._map = None
+            if size:
+                with open(self._listings_path, "rb") as f:
+                    self._map = mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ)
+            self._mapped = size
+        return self._map
+
+    def _find_listing(self, digest):
+        """Latest (segment, offset, length, ts) stored for a digest, or None."""
+        m = self._listing_map()
+        if m is None:
+            return None
+        end = len(m)
+        while True:
+            pos = m.rfind(digest, 0, end)
+            if pos < 0:
+                return None
+            if pos % LISTING_REC.size == 0:
+                return LISTING_REC.unpack_from(m, pos)[1:]
+            # the bytes happened to occur inside another record; keep looking further back
+            end = pos + len(digest) - 1
+
+    def _append_frame(self, payload):
+        body = zlib.compress(json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8"),
+                             self.level)
+        frame = FRAME_HEAD.pack(MAGIC, len(body), zlib.crc32(body)) + body
+        # another process may have appended to this segment or started a newer one;
+        # the caller holds write.lock, so the end of the newest segment is ours
+        while os.path.exists(self._segment_path(self._segment + 1)):
+            self._seg_f.close()
+            self._segment += 1
+            self._seg_f = open(self._segment_path(self._segment), "ab")
+        offset = os.fstat(self._seg_f.fileno()).st_size
+        if offset and offset + len(frame) > self.segment_bytes:
+            self._seg_f.close()
+            self._segment += 1
+            self._seg_f = open(self._segment_path(self._segment), "ab")
+            offset = 0
+        self._seg_f.write(frame)
+        return self._segment, offset, len(frame)
+
+    def _read_frame(self, segment, offset, length):
+        key = (segment, offset)
+        frame = self._frames.get(key)
+        if frame is not None:
+            self._frames.move_to_end(key)
+            return frame
+        f = self._readers.get(segment)
+        if f is None:
+            if segment == self._segment:
+                self._seg_f.flush()
+            f = self._readers[segment] = open(self._segment_path(segment), "rb")
+        f.seek(offset)
+        raw = f.read(length)
+        magic, size, crc = FRAME_HEAD.unpack_from(raw)
+        body = raw[FRAME_HEAD.size:FRAME_HEAD.size + size]
+        if magic != MAGIC or len(body) != size or zlib.crc32(body) != crc:
+            raise ValueError(f"corrupt archive frame at {self._segment_path(segment)}:{offset}")
+        frame = json.loads(zlib.decompress(body))
+        self._frames[key] = frame
+        if len(self._frames) > FRAME_CACHE:
+            self._frames.popitem(last=False)
+        return frame
+
+    def sync(self):
+        """Flush and fsync segments before the indexes that point into them."""
+        with self._lock:
+            self._sync()
+
+    def _sync(self):
+        for f in (self._seg_f, self._rows_f, self._listings_f):
+            f.flush()
+            os.fsync(f.fileno())
+
+    # ---------- Store ----------
+    def put_key(self, court, date_str, rows, ts=None, sync=True):
+        """
+        Store one listing under a court key (see court_key). Nothing is written when the
+        rows are identical to the latest stored version.
+        Returns {"court", "date", "rows", "new_rows", "stored", "bytes"}.
+        """
+        parts = [split_serial(row) for row in rows]
+        rows = [row for row, _ in parts]
+        fps = [row_id(row) for row in rows]
+        serials = [serial for _, serial in parts]
+        if all(serial is None for serial in serials):
+            serials = None
+        digest = _listing_digest(court, date_str)
+        with self._lock, _exclusive(self._lock_f):
+            latest = self._find_listing(digest)
+            if latest is not None:
+                frame = self._read_frame(*latest[:3])
+                if frame["fps"] == fps and frame.get("sr") == serials:
+                    return {"court": court, "date": date_str, "rows": len(rows), "new_rows": 0,
+                            "stored": False, "bytes": 0}
+            self._load_rows()  # rows other writers stored since the last put
+            new = {}
+            for fp, row in zip(fps, rows):
+                if fp not in new and bytes.fromhex(fp) not in self._rows:
+                    new[fp] = row
+            ts = time.time() if ts is None else ts
+            payload = {"court": court, "date": date_str, "ts": ts, "fps": fps, "rows": new}
+            if serials is not None:
+                payload["sr"] = serials
+            seg, off, length = self._append_frame(payload)
+            # segment first, then the indexes: a crash in between leaves an unreferenced frame
+            self._seg_f.flush()
+            self._rows_f.write(b"".join(ROW_REC.pack(bytes.fromhex(fp), seg, off, length) for fp in new))
+            self._listings_f.write(LISTING_REC.pack(digest, seg, off, length, ts))
+            self._rows_f.flush()
+            self._listings_f.flush()
+            if sync:
+                self._sync()
+            for fp in new:
+                self._rows[bytes.fromhex(fp)] = (seg, off, length)
+            self._rows_read = os.path.getsize(self._rows_path)
+        return {"court": court, "date": date_str, "rows": len(rows), "new_rows": len(new),
+                "stored": True, "bytes": length}
+
+    def put(self, state, district, court_complex, date_str, rows, ts=None, sync=True):
+        return self.put_key(court_key(state, district, court_complex), date_str, rows, ts=ts, sync=sync)
+
+    # ---------- Read ----------
+    def info_key(self, court, date_str):
+        """{"ts", "rows"} of the latest stored version, or None."""
+        with self._lock:
+            latest = self._find_listing(_listing_digest(court, date_str))
+            if latest is None:
+                return None
+            frame = self._read_frame(*latest[:3])
+        return {"ts": latest[3], "rows": len(frame["fps"])}
+
+    def info(self, state, district, court_complex, date_str):
+        return self.info_key(court_key(state, district, court_complex), date_str)
+
+    def get_key(self, court, date_str):
+        """Rows of the latest stored version, or None when the listing was never stored."""
+        with self._lock:
+            latest = self._find_listing(_listing_digest(court, date_str))
+            if latest is None:
+                return None
+            frame = self._read_frame(*latest[:3])
+            serials = frame.get("sr")
+            rows = []
+            for i, fp in enumerate(frame["fps"]):
+                row = frame["rows"].get(fp)
+                if row is None:
+                    loc = self._rows.get(bytes.fromhex(fp))
+                    if loc is None:
+                        self._load_rows()
+                        loc = self._rows[bytes.fromhex(fp)]
+                    row = self._read_frame(*loc)["rows"][fp]
+                row = dict(row)
+                if serials is not None and serials[i] is not None:
+                    _restore_serial(row, serials[i])
+                rows.append(row)
+        return rows
+
+    def get(self, state, district, court_complex, date_str):
+        return self.get_key(court_key(state, district, court_complex), date_str)
+
+    def listings(self, court=None):
+        """(court, date, ts, rows) of every stored listing, latest version only."""
+        with self._lock:
+            m = self._listing_map()
+            latest = {}
+            if m is not None:
+                for digest, seg, off, length, ts in LISTING_REC.iter_unpack(m):
+                    latest[digest] = (seg, off, length, ts)
+            out = []
+            for seg, off, length, ts in latest.values():
+                frame = self._read_frame(seg, off, length)
+                if court is None or court.lower() in frame["court"].lower():
+                    out.append((frame["court"], frame["date"], ts, len(frame["fps"])))
+        return sorted(out)
+
+    def changes(self, since=0):
+        """
+        Listings stored after position since of listings.idx: (end, [(court, date, ts), ...]),
+        latest version per listing. Pass end back in to get only the ones stored later.
+        """
+        with self._lock:
+            m = self._listing_map()
+            end = len(m) if m is not None else 0
+            if since > end or since % LISTING_REC.size:
+                since = 0  # not a position in this index (e.g. the archive was rebuilt)
+            latest = {}
+            if end > since:
+                for digest, seg, off, length, ts in LISTING_REC.iter_unpack(m[since:end]):
+                    latest[digest] = (seg, off, length, ts)
+            out = []
+            for seg, off, length, ts in latest.values():
+                frame = self._read_frame(seg, off, length)
+                out.append((frame["court"], frame["date"], ts))
+        return end, out
+
+    def stats(self):
+        with self._lock:
+            self._seg_f.flush()
+            self._load_rows()
+            m = self._listing_map()
+            versions = len(m) // LISTING_REC.size if m is not None else 0
+            digests = {m[i:i + 20] for i in range(0, len(m), LISTING_REC.size)} if m is not None else set()
+            segments = glob.glob(os.path.join(self.root, "seg-*.dat"))
+            return {
+                "listings": len(digests),
+                "versions": versions,
+                "unique_rows": len(self._rows),
+                "segments": len(segments),
+                "segment_bytes": sum(os.path.getsize(p) for p in segments),
+                "index_bytes": os.path.getsize(self._rows_path) + os.path.getsize(self._listings_path),
+            }
+
+    # ---------- Exports ----------
+    def export_paths(self, state, district, court_complex, date_str, out_dir=None):
+        base = os.path.join(out_dir or self.export_dir, export_basename(state, district, court_complex, date_str))
+        return {"pdf": f"{base}.pdf", "json": f"{base}.json", "csv": f"{base}.csv"}
+
+    def export(self, state, district, court_complex, date_str, formats=("pdf", "json", "csv"), out_dir=None,
+               rows=None, pdf_workers=DEFAULT_PDF_WORKERS):
+        """
+        Write the stored listing as files (the generate_pdf_for_date result shape; formats
+        not requested are None). Files already generated since the listing was stored are
+        reused. rows: the listing's rows when the caller already has them.
+        Returns None when the listing is not in the archive.
+        """
+        return self._export(court_key(state, district, court_complex), date_str,
+                            self.export_paths(state, district, court_complex, date_str, out_dir),
+                            f"Cause List - {state} / {district} / {court_complex}", formats, out_dir, rows,
+                            pdf_workers)
+
+    def export_key(self, court, date_str, formats=("pdf", "json", "csv"), out_dir=None,
+                   pdf_workers=DEFAULT_PDF_WORKERS):
+        base = os.path.join(out_dir or self.export_dir, f"{court}_{date_str}")
+        paths = {"pdf": f"{base}.pdf", "json": f"{base}.json", "csv": f"{base}.csv"}
+        return self._export(court, date_str, paths, f"Cause List - {court.replace('_', ' ')}", formats, out_dir, None,
+                            pdf_workers)
+
+    def _export(self, court, date_str, paths, title, formats, out_dir, rows, pdf_workers):
+        info = self.info_key(court, date_str)
+        if info is None:
+            return None
+        wanted = {k: p for k, p in paths.items() if k in formats}
+        claimed = list(wanted.values())
+        with self._lock:
+            self._exporting.update(claimed)
+        try:
+            fresh = all(os.path.exists(p) and os.path.getmtime(p) >= info["ts"] for p in wanted.values())
+            if rows is None:
+                rows = self.get_key(court, date_str)
+            if not fresh:
+                out = export_stream(rows, json_path=wanted.get("json"), csv_path=wanted.get("csv"),
+                                    pdf_path=wanted.get("pdf"), title=title, pdf_workers=pdf_workers)
+                wanted = {k: out[k] for k in wanted}
+            if out_dir is None:
+                self._prune_exports()
+        finally:
+            with self._lock:
+                self._exporting.subtract(claimed)
+                self._exporting += Counter()  # drop paths no export uses any more
+        return {"pdf": wanted.get("pdf"), "json": wanted.get("json"), "csv": wanted.get("csv"), "data": rows}
+
+    def _prune_exports(self):
+        # only files older than the grace period and not claimed by an export in this process go;
+        # exports in other processes are covered by the grace period
+        cutoff = time.time() - self.export_grace
+        with self._lock:
+            keep = {os.path.abspath(p) for p in self._exporting}
+        files = []
+        for entry in os.scandir(self.export_dir):
+            if entry.is_file():
+                st = entry.stat()
+                files.append((st.st_mtime, st.st_size, entry.path))
+        total = sum(size for _, size, _ in files)
+        for mtime, size, path in sorted(files):
+            if total <= self.max_export_bytes or mtime >= cutoff:
+                break
+            if os.path.abspath(path) in keep:
+                continue
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+    # ---------- Migration ----------
+    def migrate(self, download_dir="downloads", remove=False):
+        """
+        Import every <court>_YYYY-MM-DD.json export in download_dir (stored at the file's
+        mtime). remove=True then deletes each JSON/CSV/PDF triple once its rows read back
+        identical from the archive.
+        Returns {"files", "rows", "new_rows", "removed", "bytes_removed"}.
+        """
+        counts = {"files": 0, "rows": 0, "new_rows": 0, "removed": 0, "bytes_removed": 0}
+        imported = []
+        for path in sorted(glob.glob(os.path.join(download_dir, "*.json"))):
+            m = FILENAME_RE.match(os.path.basename(path))
+            if not m:
+                continue
+            try:
+                with open(path, encoding="utf-8") as f:
+                    rows = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if not isinstance(rows, list):
+                continue
+            res = self.put_key(m.group("court"), m.group("date"), rows, ts=os.path.getmtime(path), sync=False)
+            counts["files"] += 1
+            counts["rows"] += res["rows"]
+            counts["new_rows"] += res["new_rows"]
+            imported.append((path, m.group("court"), m.group("date"), rows))
+        self.sync()
+        if remove:
+            for path, court, date_str, rows in imported:
+                if self.get_key(court, date_str) != rows:
+                    continue
+                base = path[:-len(".json")]
+                for p in (path, f"{base}.csv", f"{base}.pdf"):
+                    if os.path.exists(p):
+                        counts["bytes_removed"] += os.path.getsize(p)
+                        os.remove(p)
+                counts["removed"] += 1
+        return counts
+
+    def close(self):
+        with self._lock:
+            for f in [self._seg_f, self._rows_f, self._listings_f, self._lock_f] + list(self._readers.values()):
+                f.close()
+            self._readers.clear()
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+                self._mapped = 0
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Maintain the compressed cause list archive.")
+    ap.add_argument("--root", default=DEFAULT_ARCHIVE_DIR)
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    mig = sub.add_parser("migrate", help="import exports from a downloads directory")
+    mig.add_argument("--from", dest="download_dir", default="downloads")
+    mig.add_argument("--remove", action="store_true", help="delete each triple once it is archived")
+    exp = sub.add_parser("export", help="write one listing as files")
+    exp.add_argument("court", help="court part of the file name, e.g. Maharashtra_Pune_Pune_Civil_and_Criminal_Court")
+    exp.add_argument("date", help="YYYY-MM-DD")
+    exp.add_argument("--format", nargs="+", default=["pdf", "csv", "json"], choices=["pdf", "csv", "json"])
+    exp.add_argument("--out", default="downloads")
+    lst = sub.add_parser("list", help="stored listings")
+    lst.add_argument("--court", help="court name contains")
+    sub.add_parser("stats")
+    args = ap.parse_args()
+
+    store = ArchiveStore(args.root)
+    try:
+        if args.cmd == "migrate":
+            print(json.dumps(store.migrate(args.download_dir, remove=args.remove)))
+        elif args.cmd == "export":
+            result = store.export_key(args.court, args.date, formats=args.format, out_dir=args.out)
+            if result is None:
+                raise SystemExit(f"{args.court} {args.date} is not in the archive")
+            print(json.dumps({k: v for k, v in result.items() if k != "data"}))
+        elif args.cmd == "list":
+            for court, date_str, ts, rows in store.listings(args.court):
+                print(f"{date_str}  {court}  {rows} rows")
+        else:
+            print(json.dumps(store.stats()))
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
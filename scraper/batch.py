@@ -0,0 +1,234 @@
+# scraper/batch.py
+import queue
+import random
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+from .catalogue import NameNotFound
+from .driver_service import DEFAULT_DEBUG_PORT, DEFAULT_USER_DATA_DIR
+
+
+def empty_result():
+    """Same shape generate_pdf_for_date returns when nothing was scraped."""
+    return {"pdf": None, "json": None, "csv": None, "data": []}
+
+
+def normalize_target(target):
+    """
+    Accept a dict with state/district/court_complex/date_str (or date) keys,
+    or a (state, district, court_complex, date_str) tuple.
+    """
+    if isinstance(target, dict):
+        return {
+            "state": target.get("state"),
+            "district": target.get("district"),
+            "court_complex": target.get("court_complex"),
+            "date_str": target.get("date_str") or target.get("date"),
+        }
+    state, district, court_complex, date_str = target
+    return {"state": state, "district": district, "court_complex": court_complex, "date_str": date_str}
+
+
+class HostRateLimiter:
+    """
+    Per-host concurrency cap plus a minimum interval between request starts.
+    Shared by every session in a pool so the target site sees one polite client.
+    """
+
+    def __init__(self, max_concurrent=2, min_interval=1.0):
+        self.max_concurrent = max_concurrent
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._hosts = {}  # host -> {"sem": Semaphore, "next": earliest start time}
+
+    def _host(self, host):
+        with self._lock:
+            h = self._hosts.get(host)
+            if h is None:
+                h = {"sem": threading.Semaphore(self.max_concurrent), "next": 0.0}
+                self._hosts[host] = h
+            return h
+
+    def acquire(self, host):
+        h = self._host(host)
+        h["sem"].acquire()
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now >= h["next"]:
+                    h["next"] = now + self.min_interval
+                    return
+                delay = h["next"] - now
+            time.sleep(delay)
+
+    def release(self, host):
+        self._host(host)["sem"].release()
+
+    @contextmanager
+    def limit(self, host):
+        self.acquire(host)
+        try:
+            yield
+        finally:
+            self.release(host)
+
+
+class BatchRunner:
+    """
+    Runs many (state, district, court_complex, date) targets across a pool of
+    scraper sessions. Every session gets its own Chrome debug port and user-data dir,
+    pulls jobs from one shared queue and goes through a shared per-host rate limiter.
+    """
+
+    def __init__(self,
+                 pool_size=2,
+                 download_dir="downloads",
+                 base_debug_port=DEFAULT_DEBUG_PORT,
+                 user_data_dir=DEFAULT_USER_DATA_DIR,
+                 max_per_host=2,
+                 min_interval=1.0,
+                 allow_manual_fill=False,
+                 scraper_factory=None,
+                 scraper_kwargs=None,
+                 retries=0,
+                 backoff=2.0,
+                 max_backoff=60.0):
+        """
+        pool_size: number of browser sessions (worker threads)
+        base_debug_port: session i uses base_debug_port + i
+        user_data_dir: session i uses f"{user_data_dir}-{i}"
+        max_per_host / min_interval: per-host concurrency and spacing between request starts
+        scraper_factory: optional callable(index) -> scraper with generate_pdf_for_date/close;
+                         defaults to ECourtsScraper sessions
+        retries: extra attempts for a target that raised (a NameNotFound is final);
+                 the session is rebuilt before each retry
+        backoff / max_backoff: wait backoff * 2**(attempt-1) seconds (capped) before retry number attempt
+        """
+        self.pool_size = max(1, int(pool_size))
+        self.download_dir = download_dir
+        self.base_debug_port = base_debug_port
+        self.user_data_dir = user_data_dir
+        self.allow_manual_fill = allow_manual_fill
+        self.scraper_factory = scraper_factory or self._default_factory
+        self.scraper_kwargs = scraper_kwargs or {}
+        self.limiter = HostRateLimiter(max_concurrent=max_per_host, min_interval=min_interval)
+        self.retries = max(0, int(retries))
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.errors = {}
+        self.attempts = {}
+        self.report_errors = {}
+        self._report_lock = threading.Lock()
+
+    def session_options(self, index):
+        return {
+            "download_dir": self.download_dir,
+            "debug_port": self.base_debug_port + index,
+            "user_data_dir": f"{self.user_data_dir}-{index}",
+        }
+
+    def _default_factory(self, index):
+        from .ecourts_scraper import ECourtsScraper
+
+        kwargs = dict(self.session_options(index))
+        kwargs.update(self.scraper_kwargs)
+        return ECourtsScraper(**kwargs)
+
+    @staticmethod
+    def _host_of(scraper):
+        url = getattr(scraper, "base_url", None) or getattr(scraper, "BASE_URL", "") or ""
+        return urlparse(url).netloc or "default"
+
+    def retry_delay(self, attempt):
+        """Seconds to wait before retry number attempt (1-based), with +/-20% jitter."""
+        delay = min(self.max_backoff, self.backoff * (2 ** (attempt - 1)))
+        return delay * random.uniform(0.8, 1.2)
+
+    def _worker(self, index, jobs, results, on_result):
+        scraper = None
+        try:
+            while True:
+                try:
+                    pos, target = jobs.get_nowait()
+                except queue.Empty:
+                    return
+                error = None
+                try:
+                    for attempt in range(self.retries + 1):
+                        if attempt:
+                            time.sleep(self.retry_delay(attempt))
+                        self.attempts[pos] = attempt + 1
+                        try:
+                            if scraper is None:
+                                scraper = self.scraper_factory(index)
+                            with self.limiter.limit(self._host_of(scraper)):
+                                results[pos] = scraper.generate_pdf_for_date(
+                                    allow_manual_fill=self.allow_manual_fill, **target)
+                            error = None
+                            break
+                        except NameNotFound as e:
+                            # a misspelt name stays misspelt: no retry
+                            error = f"{type(e).__name__}: {e}"
+                            break
+                        except Exception as e:
+                            error = f"{type(e).__name__}: {e}"
+                            if scraper is not None:
+                                # a failed session (dead browser, broken pool) is not reused,
+                                # not by a retry and not by the next target either
+                                try:
+                                    scraper.close()
+                                except Exception:
+                                    pass
+                                scraper = None
+                    if error is not None:
+                        self.errors[pos] = error
+                        results[pos] = empty_result()
+                    if on_result is not None:
+                        with self._report_lock:
+                            try:
+                                on_result(pos, target, results[pos], error)
+                            except Exception as e:
+                                # a failing callback must not stop this worker's share of the queue
+                                self.report_errors[pos] = f"{type(e).__name__}: {e}"
+                finally:
+                    jobs.task_done()
+        finally:
+            if scraper is not None:
+                scraper.close()
+
+    def run(self, targets, on_result=None):
+        """
+        Run all targets and return a list of result dicts (same shape as
+        ECourtsScraper.generate_pdf_for_date), in the order of targets.
+        Failed jobs get an empty result; their error text is in self.errors[position]
+        and the number of attempts made in self.attempts[position].
+        on_result: optional callable(position, target, result, error) run (one at a time)
+                   as each target finishes; error is None on success. An exception raised
+                   by on_result is kept in self.report_errors[position].
+        """
+        targets = [normalize_target(t) for t in targets]
+        self.errors = {}
+        self.attempts = {}
+        self.report_errors = {}
+        results = [None] * len(targets)
+        jobs = queue.Queue()
+        for pos, target in enumerate(targets):
+            jobs.put((pos, target))
+
+        workers = []
+        for i in range(min(self.pool_size, len(targets))):
+            t = threading.Thread(target=self._worker, args=(i, jobs, results, on_result), daemon=True)
+            t.start()
+            workers.append(t)
+        for t in workers:
+            t.join()
+        return [r if r is not None else empty_result() for r in results]
+
+
+def run_batch(targets, pool_size=2, **kwargs):
+    """
+    Convenience wrapper: BatchRunner(pool_size, **kwargs).run(targets).
+    """
+    return BatchRunner(pool_size=pool_size, **kwargs).run(targets)
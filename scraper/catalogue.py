@@ -0,0 +1,247 @@
+# scraper/catalogue.py
+"""
+Local catalogue of the eCourts state -> district -> court complex hierarchy with
+the option values the site's dropdowns use, so names can be matched offline and
+dropdowns set by value.
+
+    python -m scraper.catalogue refresh --state Maharashtra
+    python -m scraper.catalogue match Maharashtra Pune "pune civil & criminal"
+"""
+import argparse
+import difflib
+import json
+import os
+import re
+import threading
+import time
+
+from .utils import ensure_dir, DEFAULT_CACHE_DIR
+
+DEFAULT_CATALOGUE_PATH = os.path.join(DEFAULT_CACHE_DIR, "catalogue.json")
+FUZZY_CUTOFF = 0.6
+
+
+def normalize_name(text):
+    """'Pune, Civil & Criminal Court' -> 'pune civil and criminal court'."""
+    text = (text or "").lower().replace("&", " and ")
+    return " ".join(re.sub(r"[^0-9a-z]+", " ", text).split())
+
+
+class NameNotFound(ValueError):
+    """A state/district/court complex name that only resembles an option (suggestion)."""
+
+    def __init__(self, level, name, suggestion):
+        self.level = level
+        self.name = name
+        self.suggestion = suggestion
+        super().__init__(f"{level} {name!r} not found; did you mean {suggestion[1]!r}?")
+
+
+def best_match(options, desired, cutoff=FUZZY_CUTOFF, fuzzy=False):
+    """
+    Pick the (value, text) option naming desired: exact normalized name first, then
+    substring either way (shortest name wins); with fuzzy, then the closest difflib match.
+    Returns None when nothing matches. Fuzzy hits are off by default: a near name is as
+    likely another court of the same district, so callers report it (see suggest).
+    """
+    want = normalize_name(desired)
+    if not want:
+        return None
+    named = [(normalize_name(t), (v, t)) for v, t in options if v]
+    for name, opt in named:
+        if name == want:
+            return opt
+    contains = [(len(name), opt) for name, opt in named if want in name or (name and name in want)]
+    if contains:
+        return min(contains, key=lambda c: c[0])[1]
+    return suggest(options, desired, cutoff) if fuzzy else None
+
+
+def suggest(options, desired, cutoff=FUZZY_CUTOFF):
+    """The (value, text) option whose name is closest to desired (difflib), or None."""
+    named = [(normalize_name(t), (v, t)) for v, t in options if v]
+    close = difflib.get_close_matches(normalize_name(desired), [name for name, _ in named], n=1, cutoff=cutoff)
+    if close:
+        return next(opt for name, opt in named if name == close[0])
+    return None
+
+
+def require_match(options, desired, level):
+    """
+    best_match, but a name that only resembles an option raises NameNotFound naming it
+    instead of returning None, so a typo is reported rather than mistaken for no data.
+    """
+    hit = best_match(options, desired)
+    if hit is None and desired:
+        hint = suggest(options, desired)
+        if hint is not None:
+            raise NameNotFound(level, desired, hint)
+    return hit
+
+
+class CourtCatalogue:
+    """
+    JSON file of states, their districts and their court complexes:
+        {"states": {code: {"name": ..., "districts": {code: {"name": ..., "complexes": {value: name}}}}}}
+    Complex values keep the site's '<complex>@<est codes>@<flag>' form. Levels fill in
+    from refresh() or as the engines see dropdown options (learn_* methods).
+    """
+
+    def __init__(self, path=DEFAULT_CATALOGUE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self.data = {"states": {}, "updated_at": None}
+        try:
+            with open(path, encoding="utf-8") as f:
+                loaded = json.load(f)
+            if isinstance(loaded.get("states"), dict):
+                self.data = loaded
+        except (OSError, ValueError, AttributeError):
+            pass
+
+    # ---------- Persistence ----------
+    def save(self):
+        with self._lock:
+            self.data["updated_at"] = time.time()
+            ensure_dir(os.path.dirname(self.path) or ".")
+            tmp = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.data, f, ensure_ascii=False, indent=1)
+            os.replace(tmp, self.path)
+
+    # ---------- Levels ----------
+    def states(self):
+        return [(code, s["name"]) for code, s in self.data["states"].items()]
+
+    def districts(self, state_code):
+        state = self.data["states"].get(state_code)
+        if not state or state.get("districts") is None:
+            return None
+        return [(code, d["name"]) for code, d in state["districts"].items()]
+
+    def complexes(self, state_code, dist_code):
+        state = self.data["states"].get(state_code) or {}
+        district = (state.get("districts") or {}).get(dist_code)
+        if not district or district.get("complexes") is None:
+            return None
+        return list(district["complexes"].items())
+
+    def learn_states(self, options):
+        """Merge (value, text) options of the state dropdown; returns True if anything changed."""
+        changed = False
+        with self._lock:
+            for value, text in options:
+                if not value:
+                    continue
+                state = self.data["states"].get(value)
+                if state is None:
+                    self.data["states"][value] = {"name": text, "districts": None}
+                    changed = True
+                elif state["name"] != text:
+                    state["name"] = text
+                    changed = True
+        return changed
+
+    def learn_districts(self, state_code, options, state_name=None):
+        with self._lock:
+            state = self.data["states"].setdefault(state_code, {"name": state_name or state_code, "districts": None})
+            old = state.get("districts") or {}
+            state["districts"] = {
+                value: {"name": text, "complexes": (old.get(value) or {}).get("complexes")}
+                for value, text in options if value
+            }
+            return {k: v["name"] for k, v in old.items()} != {k: v["name"] for k, v in state["districts"].items()}
+
+    def learn_complexes(self, state_code, dist_code, options, district_name=None):
+        with self._lock:
+            state = self.data["states"].setdefault(state_code, {"name": state_code, "districts": None})
+            if state.get("districts") is None:
+                state["districts"] = {}
+            district = state["districts"].setdefault(dist_code, {"name": district_name or dist_code,
+                                                                 "complexes": None})
+            new = {value: text for value, text in options if value}
+            changed = district.get("complexes") != new
+            district["complexes"] = new
+            return changed
+
+    # ---------- Matching ----------
+    def match_state(self, name):
+        return best_match(self.states(), name)
+
+    def match_district(self, state_code, name):
+        return best_match(self.districts(state_code) or [], name)
+
+    def match_complex(self, state_code, dist_code, name):
+        return best_match(self.complexes(state_code, dist_code) or [], name)
+
+    def resolve(self, state, district, court_complex):
+        """
+        Offline lookup of all three names. Returns {"state", "district", "complex"} with a
+        (value, name) pair or None for each level that is unknown or unmatched.
+        """
+        out = {"state": self.match_state(state), "district": None, "complex": None}
+        if out["state"]:
+            out["district"] = self.match_district(out["state"][0], district)
+        if out["district"]:
+            out["complex"] = self.match_complex(out["state"][0], out["district"][0], court_complex)
+        return out
+
+    # ---------- Refresh ----------
+    def refresh(self, source, state=None, district=None):
+        """
+        Walk the hierarchy through source (an HttpCourtsScraper or anything with
+        state_options(), district_options(state_code) and complex_options(state_code, dist_code))
+        and save. state/district: limit the walk to matching names.
+        Returns {"states": n, "districts": n, "complexes": n} walked.
+        """
+        counts = {"states": 0, "districts": 0, "complexes": 0}
+        self.learn_states(source.state_options())
+        states = self.states()
+        if state:
+            hit = require_match(states, state, "state")
+            states = [hit] if hit else []
+        for st_code, st_name in states:
+            counts["states"] += 1
+            self.learn_districts(st_code, source.district_options(st_code), st_name)
+            dists = self.districts(st_code) or []
+            if district:
+                hit = require_match(dists, district, "district")
+                dists = [hit] if hit else []
+            for dist_code, dist_name in dists:
+                counts["districts"] += 1
+                options = source.complex_options(st_code, dist_code)
+                self.learn_complexes(st_code, dist_code, options, dist_name)
+                counts["complexes"] += len(options)
+        self.save()
+        return counts
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Maintain the local court catalogue.")
+    ap.add_argument("--path", default=DEFAULT_CATALOGUE_PATH)
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    ref = sub.add_parser("refresh", help="re-read the hierarchy from the site")
+    ref.add_argument("--state")
+    ref.add_argument("--district")
+    ref.add_argument("--base-url", help="site root, e.g. a stand-in server")
+    m = sub.add_parser("match", help="resolve names offline")
+    m.add_argument("state")
+    m.add_argument("district")
+    m.add_argument("court_complex")
+    args = ap.parse_args()
+
+    catalogue = CourtCatalogue(args.path)
+    if args.cmd == "refresh":
+        from .http_scraper import HttpCourtsScraper
+
+        source = HttpCourtsScraper(base_url=args.base_url)
+        try:
+            print(json.dumps(catalogue.refresh(source, args.state, args.district)))
+        finally:
+            source.close()
+    else:
+        print(json.dumps(catalogue.resolve(args.state, args.district, args.court_complex), ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+# scraper/cli.py
+"""
+Command-line entry point for cron jobs and scripts. Every target prints one JSON
+line on stdout; a summary line goes to stderr and the exit status is 1 when any
+target failed, missed or (fetch, unless --allow-empty) came back empty: an empty
+eCourts result is usually a cause list table that timed out.
+
+    python -m scraper fetch Maharashtra Pune "Pune, Civil and Criminal Court" 2025-10-27
+    python -m scraper fetch --targets targets.csv --engine http --pool 4
+    python -m scraper lookup --targets targets.jsonl
+    python -m scraper export --targets targets.jsonl --format csv json --out exports
+
+Targets files are CSV with a state,district,court_complex,date header, or JSON lines
+with the same keys ('-' reads stdin). Only the standard library is imported up front:
+the browser engine, requests and ReportLab load when a fetch or PDF actually needs them.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+
+from .utils import export_basename
+
+TARGET_FIELDS = ("state", "district", "court_complex", "date_str")
+
+
+def load_targets(path):
+    """Targets from a CSV (with header) or JSON lines file, as dicts with TARGET_FIELDS keys."""
+    f = sys.stdin if path == "-" else open(path, encoding="utf-8", newline="")
+    try:
+        text = f.read()
+    finally:
+        if f is not sys.stdin:
+            f.close()
+    if text.lstrip().startswith(("{", "[")):
+        stripped = text.strip()
+        if stripped.startswith("["):
+            records = json.loads(stripped)
+        else:
+            records = [json.loads(line) for line in text.splitlines() if line.strip()]
+    else:
+        records = list(csv.DictReader(text.splitlines()))
+    targets = []
+    for rec in records:
+        target = {k: (rec.get(k) or "").strip() for k in TARGET_FIELDS}
+        target["date_str"] = target["date_str"] or (rec.get("date") or "").strip()
+        if not all(target.values()):
+            raise ValueError(f"incomplete target in {path}: {rec}")
+        targets.append(target)
+    return targets
+
+
+def _targets(args):
+    if args.targets:
+        return load_targets(args.targets)
+    if not args.target:
+        raise SystemExit("give a target (STATE DISTRICT COURT_COMPLEX DATE) or --targets FILE")
+    if len(args.target) != 4:
+        raise SystemExit("a target is STATE DISTRICT COURT_COMPLEX DATE")
+    return [dict(zip(TARGET_FIELDS, args.target))]
+
+
+def _line(target, status, result=None, error=None, with_rows=False, **extra):
+    result = result or {}
+    out = dict(target, status=status, rows=len(result.get("data") or []))
+    for kind in ("pdf", "json", "csv"):
+        out[kind] = result.get(kind)
+    if error:
+        out["error"] = error
+    out.update(extra)
+    if with_rows:
+        out["data"] = result.get("data") or []
+    return out
+
+
+def _archive(args):
+    if not args.archive:
+        return None
+    from .archive import ArchiveStore
+
+    return ArchiveStore()
+
+
+def _stored_rows(target, download_dir, cache, archive):
+    """Rows already on disk for a target (downloads JSON, archive, then result cache), or None."""
+    path = os.path.join(download_dir, export_basename(**target) + ".json")
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        pass
+    if archive is not None:
+        rows = archive.get(**target)
+        if rows is not None:
+            return rows
+    hit = cache.get(**target)
+    return hit.get("data") if hit else None
+
+
+# ---------- Commands ----------
+def cmd_lookup(args, emit):
+    """Cache-only: answer from the result cache, downloads or archive; never opens a browser."""
+    from .result_cache import ResultCache, CachedScraper
+
+    archive = _archive(args)
+    cached = CachedScraper(None, cache=ResultCache(), download_dir=args.download_dir, archive=archive)
+    failures = 0
+    try:
+        for target in _targets(args):
+            result = cached.lookup(**target)
+            if result is None:
+                failures += 1
+                emit(_line(target, "miss"))
+            else:
+                emit(_line(target, "hit", result, with_rows=args.with_rows))
+    finally:
+        cached.cache.close()
+        if archive is not None:
+            archive.close()
+    return failures
+
+
+def cmd_export(args, emit):
+    """Re-export stored rows in the requested formats without fetching anything."""
+    from .result_cache import ResultCache
+    from .export_pipeline import export_stream
+
+    archive = _archive(args)
+    cache = ResultCache()
+    failures = 0
+    try:
+        for target in _targets(args):
+            rows = _stored_rows(target, args.download_dir, cache, archive)
+            if not rows:
+                failures += 1
+                emit(_line(target, "miss"))
+                continue
+            base = os.path.join(args.out, export_basename(**target))
+            out = export_stream(
+                rows,
+                json_path=f"{base}.json" if "json" in args.format else None,
+                csv_path=f"{base}.csv" if "csv" in args.format else None,
+                pdf_path=f"{base}.pdf" if "pdf" in args.format else None,
+                title=f"Cause List - {target['state']} / {target['district']} / {target['court_complex']}",
+                pdf_workers=args.pdf_workers,
+            )
+            emit(_line(target, "exported", dict(out, data=rows), with_rows=args.with_rows))
+    finally:
+        cache.close()
+        if archive is not None:
+            archive.close()
+    return failures
+
+
+def cmd_fetch(args, emit):
+    """Cached targets are answered first; the rest go through a BatchRunner pool."""
+    from .result_cache import ResultCache, CachedScraper
+    from .batch import BatchRunner
+
+    archive = _archive(args)
+    cache = ResultCache()
+    cached = CachedScraper(None, cache=cache, download_dir=args.download_dir, archive=archive)
+    failures = 0
+    todo = []
+    try:
+        for target in _targets(args):
+            hit = None if args.refresh else cached.lookup(**target)
+            if hit is not None:
+                emit(_line(target, "hit", hit, with_rows=args.with_rows))
+            else:
+                todo.append(target)
+        if not todo:
+            return 0
+
+        factory = None
+        kwargs = {"archive": archive}
+        if args.engine == "http":
+            from .http_scraper import HttpCourtsScraper
+
+            def factory(index):
+                return HttpCourtsScraper(download_dir=args.download_dir, base_url=args.base_url, archive=archive,
+                                         pdf_workers=args.pdf_workers)
+        else:
+            kwargs["pdf_workers"] = args.pdf_workers
+            kwargs["headless"] = args.headless
+            if args.base_url:
+                kwargs["base_url"] = args.base_url
+        runner = BatchRunner(pool_size=args.pool, download_dir=args.download_dir, max_per_host=args.max_per_host,
+                             min_interval=args.min_interval, scraper_factory=factory, scraper_kwargs=kwargs,
+                             retries=args.retries)
+
+        def on_result(pos, target, result, error):
+            nonlocal failures
+            if error is not None:
+                failures += 1
+                emit(_line(target, "failed", error=error, attempts=runner.attempts.get(pos, 1)))
+                return
+            if result.get("data"):
+                cache.put(target["state"], target["district"], target["court_complex"], target["date_str"], result)
+            elif not args.allow_empty:
+                failures += 1
+            emit(_line(target, "ok" if result.get("data") else "empty", result, with_rows=args.with_rows,
+                       attempts=runner.attempts.get(pos, 1)))
+
+        runner.run(todo, on_result=on_result)
+        return failures
+    finally:
+        cache.close()
+        if archive is not None:
+            archive.close()
+
+
+def build_parser():
+    ap = argparse.ArgumentParser(prog="python -m scraper", description="eCourts cause list tools.")
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("target", nargs="*", metavar="STATE DISTRICT COURT_COMPLEX DATE")
+    common.add_argument("--targets", help="CSV or JSON lines file of targets ('-' for stdin)")
+    common.add_argument("--download-dir", default="downloads")
+    common.add_argument("--archive", action="store_true", help="also use the .ecourts_cache/archive store")
+    common.add_argument("--with-rows", action="store_true", help="include the rows in each output line")
+    common.add_argument("--pdf-workers", type=int, default=1,
+                        help="processes rendering each PDF; lists over 2000 rows are drawn in parallel")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    fetch = sub.add_parser("fetch", parents=[common], help="fetch targets (cached ones are not refetched)")
+    fetch.add_argument("--engine", choices=["http", "selenium"], default="http")
+    fetch.add_argument("--base-url", help="site root (http engine) or page (selenium), e.g. a stand-in server")
+    fetch.add_argument("--headless", action="store_true", help="selenium engine: headless Chrome per session")
+    fetch.add_argument("--refresh", action="store_true", help="ignore cached results")
+    fetch.add_argument("--pool", type=int, default=2)
+    fetch.add_argument("--max-per-host", type=int, default=2)
+    fetch.add_argument("--min-interval", type=float, default=1.0)
+    fetch.add_argument("--retries", type=int, default=2)
+    fetch.add_argument("--allow-empty", action="store_true",
+                       help="exit 0 when a target comes back with no rows (e.g. a court holiday)")
+    fetch.set_defaults(func=cmd_fetch)
+
+    lookup = sub.add_parser("lookup", parents=[common], help="answer targets from local data only")
+    lookup.set_defaults(func=cmd_lookup)
+
+    export = sub.add_parser("export", parents=[common], help="re-export stored rows")
+    export.add_argument("--format", nargs="+", default=["json", "csv"], choices=["json", "csv", "pdf"])
+    export.add_argument("--out", default="exports")
+    export.set_defaults(func=cmd_export)
+    return ap
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    started = time.perf_counter()
+    counts = {}
+
+    def emit(line):
+        counts[line["status"]] = counts.get(line["status"], 0) + 1
+        sys.stdout.write(json.dumps(line, ensure_ascii=False) + "\n")
+        sys.stdout.flush()
+
+    try:
+        failures = args.func(args, emit)
+    except (OSError, ValueError) as e:
+        sys.stderr.write(json.dumps({"error": f"{type(e).__name__}: {e}"}) + "\n")
+        return 2
+    summary = dict(counts, command=args.cmd, seconds=round(time.perf_counter() - started, 3))
+    sys.stderr.write(json.dumps(summary) + "\n")
+    return 1 if failures else 0
@@ -0,0 +1,305 @@
+# scraper/crawl.py
+"""
+Crawl every court complex of a state (or one district) over a date range, with a
+durable journal so an interrupted crawl resumes where it stopped.
+
+    python -m scraper.crawl --state Maharashtra --from 2025-10-01 --to 2025-10-31 --engine http --pool 4
+    python -m scraper.crawl --state Maharashtra --district Pune --from 2025-10-27 --to 2025-10-27
+"""
+import argparse
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+
+from .utils import ensure_dir, DEFAULT_CACHE_DIR
+from .catalogue import CourtCatalogue, best_match, require_match
+from .batch import BatchRunner
+
+DEFAULT_JOURNAL_DIR = os.path.join(DEFAULT_CACHE_DIR, "crawls")
+
+
+def date_range(date_from, date_to, skip_weekdays=()):
+    """Inclusive YYYY-MM-DD strings; skip_weekdays uses date.weekday() numbers (6 = Sunday)."""
+    day = datetime.strptime(date_from, "%Y-%m-%d").date()
+    end = datetime.strptime(date_to, "%Y-%m-%d").date()
+    out = []
+    while day <= end:
+        if day.weekday() not in skip_weekdays:
+            out.append(day.isoformat())
+        day += timedelta(days=1)
+    return out
+
+
+def target_key(target):
+    return "|".join([target["state"], target["district"], target["court_complex"], target["date_str"]])
+
+
+def _needs_refresh(catalogue, state, district):
+    st = catalogue.match_state(state)
+    districts = catalogue.districts(st[0]) if st else None
+    if districts is None:
+        return True
+    if district is not None:
+        hit = best_match(districts, district)
+        if hit is None:
+            return True
+        districts = [hit]
+    return any(catalogue.complexes(st[0], code) is None for code, _ in districts)
+
+
+def expand_targets(catalogue, state, district=None, date_from=None, date_to=None, skip_weekdays=(), source=None):
+    """
+    Every (state, district, court complex, date) target for a state, or one of its districts,
+    from the catalogue. Levels the catalogue lacks are filled through source (e.g. an
+    HttpCourtsScraper) first when one is given. Targets are ordered date by date.
+    """
+    if source is not None and _needs_refresh(catalogue, state, district):
+        catalogue.refresh(source, state=state, district=district)
+
+    st = require_match(catalogue.states(), state, "state")
+    if st is None:
+        raise ValueError(f"state {state!r} is not in the catalogue; refresh it first")
+    districts = catalogue.districts(st[0]) or []
+    if district is not None:
+        hit = require_match(districts, district, "district")
+        if hit is None:
+            raise ValueError(f"district {district!r} of {st[1]} is not in the catalogue; refresh it first")
+        districts = [hit]
+
+    courts = []
+    for dist_code, dist_name in districts:
+        for _, complex_name in catalogue.complexes(st[0], dist_code) or []:
+            courts.append((dist_name, complex_name))
+    return [
+        {"state": st[1], "district": dist_name, "court_complex": complex_name, "date_str": day}
+        for day in date_range(date_from, date_to, skip_weekdays)
+        for dist_name, complex_name in courts
+    ]
+
+
+class CrawlJournal:
+    """
+    Append-only JSONL record of finished targets, flushed and fsynced per line so a
+    crash loses at most the target in flight. The last line for a key wins; an "empty"
+    line also counts the runs in a row that came back empty ("empties").
+    """
+
+    def __init__(self, path):
+        self.path = path
+        ensure_dir(os.path.dirname(path) or ".")
+        self._lock = threading.Lock()
+        self.entries = {}
+        try:
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        rec = json.loads(line)
+                    except ValueError:
+                        continue  # a torn last line from a crash
+                    self.entries[rec["key"]] = rec
+        except OSError:
+            pass
+        self._f = open(path, "a", encoding="utf-8")
+
+    def completed(self, empty_retries=0):
+        """
+        Keys that need no further work: fetched, or empty on more than empty_retries runs
+        in a row. An empty result is often a table wait that timed out, not a day without
+        a list, so it is only final once it repeats.
+        """
+        return {k for k, rec in self.entries.items()
+                if rec.get("status") == "done"
+                or (rec.get("status") == "empty" and rec.get("empties", 1) > empty_retries)}
+
+    def record(self, target, status, rows=0, attempts=1, error=None, json_path=None):
+        rec = {"key": target_key(target), "status": status, "rows": rows, "attempts": attempts,
+               "error": error, "json": json_path, "ts": datetime.now().isoformat(timespec="seconds")}
+        with self._lock:
+            if status == "empty":
+                prev = self.entries.get(rec["key"])
+                rec["empties"] = (prev.get("empties", 1) if prev and prev.get("status") == "empty" else 0) + 1
+            self._f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+            self._f.flush()
+            os.fsync(self._f.fileno())
+            self.entries[rec["key"]] = rec
+        return rec
+
+    def close(self):
+        with self._lock:
+            self._f.close()
+
+
+class CrawlProgress:
+    """Counts and rate for a running crawl; eta() extrapolates from the rate so far."""
+
+    def __init__(self, total, skipped=0):
+        self.total = total
+        self.skipped = skipped
+        self.done = 0
+        self.empty = 0
+        self.failed = 0
+        self.rows = 0
+        self.started = time.monotonic()
+
+    @property
+    def finished(self):
+        return self.done + self.empty + self.failed
+
+    def rate(self):
+        """Targets per minute."""
+        elapsed = time.monotonic() - self.started
+        return self.finished / elapsed * 60 if elapsed > 0 else 0.0
+
+    def eta(self):
+        """Seconds left, or None before the first target finishes."""
+        rate = self.rate()
+        if not rate:
+            return None
+        return (self.total - self.skipped - self.finished) / rate * 60
+
+    def line(self):
+        eta = self.eta()
+        eta_text = "--:--:--" if eta is None else time.strftime("%H:%M:%S", time.gmtime(eta))
+        return (f"{self.skipped + self.finished}/{self.total} targets "
+                f"(done {self.done}, empty {self.empty}, failed {self.failed}, skipped {self.skipped}) "
+                f"{self.rows} rows  {self.rate():.1f}/min  ETA {eta_text}")
+
+
+class CrawlScheduler:
+    """
+    Runs a crawl's targets through a BatchRunner (pooled sessions, per-host rate limit,
+    retry with exponential backoff) and journals each outcome as it lands.
+    Targets already completed in the journal are skipped, so rerunning the same
+    command after a crash resumes the crawl.
+    """
+
+    def __init__(self, runner, journal, report=print, report_every=1, retry_failed=True, empty_retries=2):
+        """
+        runner: BatchRunner (set its retries/backoff for per-target retry)
+        journal: CrawlJournal or path
+        report: callable(str) for progress lines (None to stay quiet)
+        retry_failed: rerun targets the journal records as failed (otherwise skip them too)
+        empty_retries: further runs that refetch a target which came back empty before
+                       it is taken as having no list that day
+        """
+        self.runner = runner
+        self.journal = journal if isinstance(journal, CrawlJournal) else CrawlJournal(journal)
+        self.report = report
+        self.report_every = max(1, report_every)
+        self.retry_failed = retry_failed
+        self.empty_retries = max(0, int(empty_retries))
+        self.progress = None
+
+    def pending(self, targets):
+        skip = self.journal.completed(self.empty_retries)
+        if not self.retry_failed:
+            skip |= {k for k, rec in self.journal.entries.items() if rec.get("status") == "failed"}
+        return [t for t in targets if target_key(t) not in skip]
+
+    def _on_result(self, pos, target, result, error):
+        rows = len(result.get("data") or [])
+        if error is not None:
+            status = "failed"
+            self.progress.failed += 1
+        elif rows:
+            status = "done"
+            self.progress.done += 1
+        else:
+            status = "empty"
+            self.progress.empty += 1
+        self.progress.rows += rows
+        self.journal.record(target, status, rows=rows, attempts=self.runner.attempts.get(pos, 1),
+                            error=error, json_path=result.get("json"))
+        if self.report and (self.progress.finished % self.report_every == 0):
+            self.report(self.progress.line())
+
+    def run(self, targets):
+        """Run what is left of targets; returns the final CrawlProgress."""
+        todo = self.pending(targets)
+        self.progress = CrawlProgress(len(targets), skipped=len(targets) - len(todo))
+        if self.report:
+            self.report(f"{len(todo)} of {len(targets)} targets to fetch")
+        if todo:
+            self.runner.run(todo, on_result=self._on_result)
+        if self.report and (not todo or self.progress.finished % self.report_every):
+            self.report(self.progress.line())
+        return self.progress
+
+    def close(self):
+        self.journal.close()
+
+
+def journal_path(state, district, date_from, date_to, journal_dir=DEFAULT_JOURNAL_DIR):
+    name = "_".join(re.sub(r"\W+", "_", p) for p in (state, district or "all", date_from, date_to))
+    return os.path.join(journal_dir, f"{name}.jsonl")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Crawl every court complex of a state over a date range.")
+    ap.add_argument("--state", required=True)
+    ap.add_argument("--district")
+    ap.add_argument("--from", dest="date_from", required=True, help="YYYY-MM-DD")
+    ap.add_argument("--to", dest="date_to", required=True, help="YYYY-MM-DD")
+    ap.add_argument("--skip-sundays", action="store_true")
+    ap.add_argument("--engine", choices=["http", "selenium"], default="http")
+    ap.add_argument("--base-url", help="site root (http engine) or page (selenium), e.g. a stand-in server")
+    ap.add_argument("--headless", action="store_true", help="selenium engine: headless Chrome per session")
+    ap.add_argument("--pool", type=int, default=2)
+    ap.add_argument("--max-per-host", type=int, default=2)
+    ap.add_argument("--min-interval", type=float, default=1.0)
+    ap.add_argument("--retries", type=int, default=3)
+    ap.add_argument("--backoff", type=float, default=5.0)
+    ap.add_argument("--empty-retries", type=int, default=2,
+                    help="reruns that refetch a target which came back empty before it counts as done")
+    ap.add_argument("--download-dir", default="downloads")
+    ap.add_argument("--pdf-workers", type=int, default=1,
+                    help="processes rendering each PDF; lists over 2000 rows are drawn in parallel")
+    ap.add_argument("--archive", action="store_true",
+                    help="store rows in the .ecourts_cache/archive store instead of file triples")
+    ap.add_argument("--journal", help="journal path (default: one per state/district/range under .ecourts_cache/crawls)")
+    args = ap.parse_args()
+
+    from .http_scraper import HttpCourtsScraper
+    from .archive import ArchiveStore
+
+    catalogue = CourtCatalogue()
+    archive = ArchiveStore() if args.archive else None
+    source = HttpCourtsScraper(download_dir=args.download_dir, base_url=args.base_url if args.engine == "http" else None)
+    try:
+        targets = expand_targets(catalogue, args.state, args.district, args.date_from, args.date_to,
+                                 skip_weekdays=(6,) if args.skip_sundays else (), source=source)
+    finally:
+        source.close()
+
+    kwargs = {}
+    factory = None
+    if args.engine == "http":
+        def factory(index):
+            return HttpCourtsScraper(download_dir=args.download_dir, base_url=args.base_url, catalogue=catalogue,
+                                     archive=archive, pdf_workers=args.pdf_workers)
+    else:
+        kwargs = {"headless": args.headless, "catalogue": catalogue, "archive": archive,
+                  "pdf_workers": args.pdf_workers}
+        if args.base_url:
+            kwargs["base_url"] = args.base_url
+    runner = BatchRunner(pool_size=args.pool, download_dir=args.download_dir, max_per_host=args.max_per_host,
+                         min_interval=args.min_interval, scraper_factory=factory, scraper_kwargs=kwargs,
+                         retries=args.retries, backoff=args.backoff)
+    scheduler = CrawlScheduler(runner, args.journal or journal_path(args.state, args.district,
+                                                                    args.date_from, args.date_to),
+                               empty_retries=args.empty_retries)
+    try:
+        progress = scheduler.run(targets)
+    finally:
+        scheduler.close()
+        if archive is not None:
+            archive.close()
+    if progress.failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
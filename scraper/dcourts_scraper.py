@@ -1,14 +1,313 @@
 # scraper/dcourts_scraper.py
+import hashlib
+import multiprocessing
 import os
+import re
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from urllib.parse import urljoin, urlparse, unquote
+
 from .utils import generate_pdf, ensure_dir
+from .html_table import parse_tables_html
+from . import metrics
+
+DOCUMENT_EXTENSIONS = (".pdf", ".html", ".htm")
+CONTENT_TYPE_EXTENSIONS = {"application/pdf": ".pdf", "text/html": ".html"}
+LINK_RE = re.compile(r"<a\b[^>]*\bhref\s*=\s*[\"']([^\"']+)[\"'][^>]*>(.*?)</a>", re.I | re.S)
+TAG_RE = re.compile(r"<[^>]+>")
+SEGMENT_RE = re.compile(r"\S+(?: \S+)*")  # text runs separated by 2+ spaces
+SERIAL_HEADER_RE = re.compile(r"^(sr|s|sl)\.?\s*(no|number)\.?$", re.I)
+SERIAL_RE = re.compile(r"^\d+\.?$")
+PAGE_FOOTER_RE = re.compile(r"^page\s+\d+(\s+of\s+\d+)?$", re.I)
+CHUNK_SIZE = 64 * 1024
+
+
+def date_variants(date_str):
+    """Ways district sites write a date in file names and link text."""
+    d = datetime.strptime(date_str, "%Y-%m-%d")
+    return {
+        d.strftime("%Y-%m-%d"), d.strftime("%d-%m-%Y"), d.strftime("%d.%m.%Y"), d.strftime("%d/%m/%Y"),
+        d.strftime("%d_%m_%Y"), d.strftime("%d%m%Y"), d.strftime("%Y%m%d"),
+        f"{d.day} {d.strftime('%b')} {d.year}".lower(), f"{d.day} {d.strftime('%B')} {d.year}".lower(),
+        d.strftime("%d %b %Y").lower(), d.strftime("%d %B %Y").lower(),
+    }
+
+
+def find_documents(page_html, page_url, date_str):
+    """[(absolute url, link text), ...] of PDF/HTML cause lists on an index page for date_str."""
+    variants = date_variants(date_str)
+    out = []
+    seen = set()
+    for href, label in LINK_RE.findall(page_html):
+        url = urljoin(page_url, href.strip())
+        if url in seen or not urlparse(url).path.lower().endswith(DOCUMENT_EXTENSIONS):
+            continue
+        text = " ".join(TAG_RE.sub(" ", label).split())
+        haystack = f"{unquote(url)} {text}".lower()
+        if any(v in haystack for v in variants):
+            seen.add(url)
+            out.append((url, text))
+    return out
+
+
+def _segments(line):
+    return [(m.start(), m.group()) for m in SEGMENT_RE.finditer(line)]
+
+
+def _is_header(segs):
+    return len(segs) >= 2 and any(SERIAL_HEADER_RE.match(t) for _, t in segs)
+
+
+def rows_from_layout_text(pages):
+    """
+    Rows from pypdf layout-mode text of a tabular cause list, in the ECourtsScraper.parse_table
+    shape: the header line (the one with a 'Sr No' column) names the columns, every line
+    is split into runs separated by 2+ spaces and each run goes to the column whose header
+    starts nearest. A line with a serial number starts a row; other lines continue the current
+    row's cells (joined with newlines); a lone run after a blank line is a section heading
+    ({first header: text}), like the site's full-width stage rows.
+    """
+    headers, starts, serial_col = None, None, None
+    data = []
+    current = None
+    for text in pages:
+        lines = [_segments(line) for line in text.splitlines()]
+        header_at = next((i for i, segs in enumerate(lines) if _is_header(segs)), None)
+        if header_at is not None:
+            # the title block above the (first or repeated) header is not part of the table
+            if headers is None:
+                headers = [t for _, t in lines[header_at]]
+                starts = [s for s, _ in lines[header_at]]
+                serial_col = next(i for i, t in enumerate(headers) if SERIAL_HEADER_RE.match(t))
+            lines = lines[header_at + 1:]
+        if headers is None:
+            continue
+        blank = True
+        for segs in lines:
+            if not segs:
+                blank = True
+                continue
+            names = [t for _, t in segs]
+            if len(segs) == 1 and PAGE_FOOTER_RE.match(names[0]):
+                continue
+            cells = {}
+            for start, value in segs:
+                col = min(range(len(starts)), key=lambda i: abs(starts[i] - start))
+                cells[col] = f"{cells[col]} {value}" if col in cells else value
+            if SERIAL_RE.match(cells.get(serial_col, "")):
+                current = {h: cells.get(i, "") for i, h in enumerate(headers)}
+                data.append(current)
+            elif len(segs) == 1 and (blank or current is None):
+                current = None
+                data.append({headers[0]: names[0]})
+            elif current is not None:
+                for col, value in cells.items():
+                    key = headers[col]
+                    current[key] = f"{current[key]}\n{value}" if current[key] else value
+            blank = False
+    return data
+
+
+def extract_rows(path):
+    """
+    Rows of one downloaded cause list (runs in a worker process): every table of an HTML
+    page, or the layout text of a PDF. Returns (path, rows, error).
+    """
+    try:
+        if path.lower().endswith(".pdf"):
+            from pypdf import PdfReader
+
+            pages = [page.extract_text(extraction_mode="layout") or "" for page in PdfReader(path).pages]
+            return path, rows_from_layout_text(pages), None
+        with open(path, encoding="utf-8", errors="replace") as f:
+            tables = parse_tables_html(f.read())
+        return path, [row for rows in tables for row in rows], None
+    except Exception as e:
+        return path, [], f"{type(e).__name__}: {e}"
+
 
 class DCourtsScraper:
-    def __init__(self, download_dir="downloads"):
+    """
+    Fallback engine for district court websites (<district>.dcourts.gov.in), which
+    publish each day's cause lists as PDF or HTML files linked from a cause list page.
+    Files for the date are downloaded concurrently over one pooled keep-alive session,
+    streamed to disk, and their rows are extracted in a process pool once the day's
+    documents are numerous or large enough to pay for starting one.
+    """
+
+    SITE_URL = "https://{slug}.dcourts.gov.in/"
+    INDEX_PATH = "cause-list/"
+
+    def __init__(self, download_dir="downloads", district=None, base_url=None, index_path=None,
+                 pool_size=4, workers=None, timeout=30, retries=2, session=None,
+                 pool_min_documents=8, pool_min_bytes=8 * 1024 * 1024):
+        """
+        district: district whose site is used when download_all_for_date gets none
+        base_url: site root to use instead of the district's own (e.g. a local stand-in server)
+        index_path: page listing the cause list files, relative to the site root
+                    (the path differs between district sites)
+        pool_size: concurrent downloads / keep-alive connections
+        workers: extraction processes (default: CPU count; 1 extracts in this process)
+        pool_min_documents / pool_min_bytes: the process pool is only started once the date
+                    has this many documents or this many bytes have been downloaded;
+                    below that, spawning workers costs more than it saves
+        """
         self.download_dir = download_dir
         ensure_dir(download_dir)
+        self.district = district
+        self.base_url = base_url
+        self.index_path = index_path or self.INDEX_PATH
+        self.pool_size = max(1, int(pool_size))
+        self.workers = workers or os.cpu_count() or 1
+        self.pool_min_documents = pool_min_documents
+        self.pool_min_bytes = pool_min_bytes
+        self.timeout = timeout
+        if session is None:
+            from .http_scraper import HttpCourtsScraper
+
+            session = HttpCourtsScraper._build_session(self.pool_size, retries)
+        self.session = session
+        self.last_documents = []
+
+    def site_url(self, district):
+        if self.base_url:
+            return self.base_url.rstrip("/") + "/"
+        slug = re.sub(r"[^a-z0-9]", "", (district or "").lower())
+        if not slug:
+            raise ValueError("a district is needed to find its court website")
+        return self.SITE_URL.format(slug=slug)
 
-    def download_all_for_date(self, date_str):
-        data = [{"serial": "1", "judge": "Hon. Judge A", "court": "Court 1", "case": "Case A vs B"}]
-        pdf_path = os.path.join(self.download_dir, f"fallback_causelist_{date_str}.pdf")
-        generate_pdf(data, pdf_path, title="Fallback Cause List")
+    def list_documents(self, date_str, district=None):
+        index_url = urljoin(self.site_url(district or self.district), self.index_path)
+        resp = self.session.get(index_url, timeout=self.timeout)
+        resp.raise_for_status()
+        return find_documents(resp.text, index_url, date_str)
+
+    def _download(self, url, folder, refresh=False):
+        """
+        Stream one file to folder; an already downloaded copy is reused unless refresh.
+        Sites publish per-court files with the same name in different folders
+        (civil/27-10-2025.pdf, criminal/27-10-2025.pdf), so the local name carries a
+        hash of the whole URL.
+        """
+        base = re.sub(r"[^\w.-]+", "_", unquote(os.path.basename(urlparse(url).path))) or "document"
+        tag = hashlib.blake2b(url.encode("utf-8"), digest_size=4).hexdigest()
+        path = os.path.join(folder, f"{tag}_{base}")
+        if not base.lower().endswith(DOCUMENT_EXTENSIONS):
+            # the extension comes from the Content-Type; reuse whichever copy is already there
+            existing = [path + ext for ext in set(CONTENT_TYPE_EXTENSIONS.values()) if os.path.exists(path + ext)]
+            if existing:
+                path = existing[0]
+        if not refresh and os.path.exists(path) and os.path.getsize(path):
+            return path
+        fd, tmp = tempfile.mkstemp(dir=folder, prefix=f".{tag}_", suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as f, self.session.get(url, stream=True, timeout=self.timeout) as resp:
+                resp.raise_for_status()
+                ctype = resp.headers.get("Content-Type", "").split(";")[0].strip().lower()
+                if not path.lower().endswith(DOCUMENT_EXTENSIONS) and ctype in CONTENT_TYPE_EXTENSIONS:
+                    path += CONTENT_TYPE_EXTENSIONS[ctype]
+                for chunk in resp.iter_content(CHUNK_SIZE):
+                    f.write(chunk)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
+        return path
+
+    def fetch_rows(self, date_str, district=None, refresh=False):
+        """
+        Download every cause list for the date and extract its rows. Rows come back in
+        the order the site lists the files; each file's outcome is in last_documents.
+        """
+        district = district or self.district
+        with metrics.phase("list"):
+            documents = self.list_documents(date_str, district)
+        folder = os.path.join(self.download_dir, "dcourts",
+                              f"{re.sub(r'[^A-Za-z0-9]+', '_', district or 'district')}_{date_str}")
+        ensure_dir(folder)
+        self.last_documents = [{"url": url, "label": label, "path": None, "rows": 0, "error": None}
+                               for url, label in documents]
+        if not documents:
+            return []
+
+        results = [None] * len(documents)
+        pool = None
+        pooled = self.workers > 1 and len(documents) > 1
+        downloaded = 0
+        try:
+            with metrics.phase("download"), ThreadPoolExecutor(max_workers=self.pool_size) as downloads:
+                pending = {downloads.submit(self._download, url, folder, refresh): i
+                           for i, (url, _label) in enumerate(documents)}
+                extracting = {}
+                for fut in as_completed(pending):
+                    i = pending[fut]
+                    doc = self.last_documents[i]
+                    try:
+                        doc["path"] = fut.result()
+                    except Exception as e:
+                        doc["error"] = f"{type(e).__name__}: {e}"
+                        metrics.event("download_failed", url=doc["url"])
+                        continue
+                    downloaded += os.path.getsize(doc["path"])
+                    if pool is None and pooled and (len(documents) >= self.pool_min_documents
+                                                    or downloaded >= self.pool_min_bytes):
+                        # spawn, not fork: the download threads are already running
+                        pool = ProcessPoolExecutor(max_workers=min(self.workers, len(documents)),
+                                                   mp_context=multiprocessing.get_context("spawn"))
+                    # extraction starts as soon as each file lands, overlapping the other downloads
+                    if pool is not None and pooled:
+                        try:
+                            extracting[pool.submit(extract_rows, doc["path"])] = i
+                            continue
+                        except BrokenProcessPool:
+                            # a worker died: the pool takes no more work, the rest is extracted here
+                            metrics.event("extract_retry", path=doc["path"])
+                            pooled = False
+                    results[i] = extract_rows(doc["path"])
+            with metrics.phase("extract"):
+                for fut in as_completed(extracting):
+                    i = extracting[fut]
+                    try:
+                        results[i] = fut.result()
+                    except Exception:
+                        # a worker died (or could not start); extract here instead
+                        metrics.event("extract_retry", path=self.last_documents[i]["path"])
+                        results[i] = extract_rows(self.last_documents[i]["path"])
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        data = []
+        for doc, res in zip(self.last_documents, results):
+            if res is None:
+                continue
+            _path, rows, error = res
+            doc["rows"] = len(rows)
+            doc["error"] = error
+            data.extend(rows)
+        metrics.current().count("documents", sum(1 for d in self.last_documents if d["path"]))
+        return data
+
+    def download_all_for_date(self, date_str, district=None, refresh=False):
+        """
+        Fallback cause list for a date: the district's published lists merged into one PDF.
+        Returns (pdf_path, rows); (None, []) when the site has nothing for the date.
+        """
+        district = district or self.district
+        data = self.fetch_rows(date_str, district, refresh=refresh)
+        if not data:
+            return None, []
+        name = re.sub(r"[^A-Za-z0-9]+", "_", district) + "_" if district else ""
+        pdf_path = os.path.join(self.download_dir, f"fallback_causelist_{name}{date_str}.pdf")
+        with metrics.phase("export"):
+            generate_pdf(data, pdf_path, title=f"Fallback Cause List - {district or 'District Court'} - {date_str}")
         return pdf_path, data
+
+    def close(self):
+        self.session.close()
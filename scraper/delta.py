@@ -0,0 +1,155 @@
+# scraper/delta.py
+import hashlib
+import json
+import os
+from datetime import datetime
+
+from .utils import export_basename, save_exports, DEFAULT_PDF_WORKERS
+
+# columns that identify a listing (the case) rather than describe it
+KEY_COLUMN_HINTS = ("case", "cnr")
+# a .delta.jsonl log past this size is rotated to .delta.jsonl.1 (one older generation kept)
+DELTA_LOG_MAX_BYTES = 4 * 1024 * 1024
+
+
+def _norm(value):
+    return " ".join(str(value).split())
+
+
+def row_fingerprint(row):
+    """
+    Stable content hash of a row: whitespace-normalized values, key order ignored.
+    """
+    canon = json.dumps({k: _norm(v) for k, v in row.items()}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(canon.encode("utf-8")).hexdigest()[:16]
+
+
+def row_key(row):
+    """
+    Identity of a row across refreshes: the case number column when there is one,
+    so a re-ordered or edited listing is seen as 'changed' rather than removed + added.
+    Rows without a case column (section headers, unknown layouts) fall back to their content.
+    """
+    for k, v in row.items():
+        if any(h in k.lower() for h in KEY_COLUMN_HINTS) and _norm(v):
+            return "case:" + _norm(v).lower()
+    return "row:" + row_fingerprint(row)
+
+
+def fingerprint_rows(rows):
+    """
+    [(key, fingerprint), ...] aligned with rows. A case listed more than once
+    gets '#2', '#3', ... on its later keys so every key is unique.
+    """
+    seen = {}
+    out = []
+    for row in rows:
+        key = row_key(row)
+        n = seen.get(key, 0) + 1
+        seen[key] = n
+        out.append((key if n == 1 else f"{key}#{n}", row_fingerprint(row)))
+    return out
+
+
+def diff_rows(old_rows, new_rows):
+    """
+    Compare two scrapes of the same list.
+    Returns {"added": [rows], "removed": [rows], "changed": [{"key", "before", "after"}], "unchanged": n}.
+    """
+    old = {k: (fp, row) for (k, fp), row in zip(fingerprint_rows(old_rows), old_rows)}
+    new = {k: (fp, row) for (k, fp), row in zip(fingerprint_rows(new_rows), new_rows)}
+    added, changed = [], []
+    unchanged = 0
+    for k, (fp, row) in new.items():
+        if k not in old:
+            added.append(row)
+        elif old[k][0] != fp:
+            changed.append({"key": k, "before": old[k][1], "after": row})
+        else:
+            unchanged += 1
+    removed = [row for k, (fp, row) in old.items() if k not in new]
+    return {"added": added, "removed": removed, "changed": changed, "unchanged": unchanged}
+
+
+def has_changes(delta):
+    return bool(delta["added"] or delta["removed"] or delta["changed"])
+
+
+def save_exports_delta(data, download_dir, state, district, court_complex, date_str, archive=None,
+                       pdf_workers=DEFAULT_PDF_WORKERS):
+    """
+    Delta-mode counterpart of save_exports: diff against the last stored JSON for this
+    court and date, rewrite the PDF/JSON/CSV triple only when something changed, and
+    append each non-empty diff to <name>.delta.jsonl next to the JSON export for pollers.
+    archive: optional ArchiveStore holding the previous version (see save_exports).
+    Returns the usual result dict plus "delta", "changed" and "fingerprints".
+    """
+    base = os.path.join(download_dir, export_basename(state, district, court_complex, date_str))
+    paths = {"pdf": f"{base}.pdf", "json": f"{base}.json", "csv": f"{base}.csv"}
+    previous = None
+    if archive is not None:
+        paths = archive.export_paths(state, district, court_complex, date_str)
+        previous = archive.get(state, district, court_complex, date_str)
+    else:
+        try:
+            with open(paths["json"], encoding="utf-8") as f:
+                previous = json.load(f)
+        except (OSError, ValueError):
+            previous = None
+
+    delta = diff_rows(previous or [], data)
+    files_present = all(os.path.exists(p) for p in paths.values())
+    changed = previous is None or has_changes(delta) or not files_present
+    if changed:
+        result = save_exports(data, download_dir, state, district, court_complex, date_str, archive=archive,
+                              pdf_workers=pdf_workers)
+    else:
+        result = dict(paths, data=data)
+
+    if has_changes(delta):
+        record = {"ts": datetime.now().isoformat(timespec="milliseconds"), "date": date_str,
+                  "added": delta["added"], "removed": delta["removed"], "changed": delta["changed"]}
+        # next to the exports actually written (the archive's export directory when there is one)
+        append_delta(delta_log_path(result["json"]), record)
+
+    result["delta"] = delta
+    result["changed"] = changed
+    result["fingerprints"] = [fp for _k, fp in fingerprint_rows(data)]
+    return result
+
+
+def delta_log_path(json_path):
+    """The .delta.jsonl log kept beside a JSON export."""
+    return f"{os.path.splitext(json_path)[0]}.delta.jsonl"
+
+
+def append_delta(delta_path, record, max_bytes=DELTA_LOG_MAX_BYTES):
+    """Append one diff record, first rotating a log that has reached max_bytes to <log>.1."""
+    try:
+        if os.path.getsize(delta_path) >= max_bytes:
+            os.replace(delta_path, f"{delta_path}.1")
+    except OSError:
+        pass
+    with open(delta_path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def read_deltas(delta_path, since=None):
+    """
+    Diff records from a .delta.jsonl log (its rotated .1 generation first), optionally
+    only those with ts > since (ISO timestamp string as written in the log).
+    """
+    out = []
+    for path in (f"{delta_path}.1", delta_path):
+        try:
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    rec = json.loads(line)
+                    if since is None or rec.get("ts", "") > since:
+                        out.append(rec)
+        except OSError:
+            pass
+    return out
@@ -0,0 +1,346 @@
+# scraper/driver_service.py
+import json
+import os
+import subprocess
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from pathlib import Path
+
+# selenium and webdriver_manager are imported by the functions that start a browser,
+# so importing this module (constants, DriverService) stays cheap for cache-only callers
+from .utils import ensure_dir, DEFAULT_CACHE_DIR
+
+DEFAULT_DEBUG_PORT = 9222
+DEFAULT_USER_DATA_DIR = r"C:/chrome-debug-eCourts"
+CHROMEDRIVER_CACHE_PATH = os.path.join(DEFAULT_CACHE_DIR, "chromedriver.json")
+
+# Network.setBlockedURLs patterns per resource category
+BLOCK_PATTERNS = {
+    "images": ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico", "*.bmp"],
+    "fonts": ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot", "*fonts.googleapis.com*", "*fonts.gstatic.com*"],
+    "stylesheets": ["*.css", "*.css?*"],
+    "analytics": ["*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+                  "*analytics.js*", "*gtag/js*"],
+}
+DEFAULT_BLOCK = ("images", "fonts", "stylesheets", "analytics")
+# the captcha on the cause list form is an image served by PHP, not matched above
+
+# navigation timing plus every resource entry, summed in the page
+PAGE_LOAD_JS = """
+var nav = performance.getEntriesByType('navigation')[0];
+var res = performance.getEntriesByType('resource');
+var bytes = nav ? (nav.transferSize || 0) : 0;
+for (var i = 0; i < res.length; i++) { bytes += res[i].transferSize || 0; }
+return {
+    load_ms: nav ? Math.round(nav.loadEventEnd > 0 ? nav.loadEventEnd : nav.duration) : null,
+    dom_ms: nav ? Math.round(nav.domContentLoadedEventEnd) : null,
+    transfer_bytes: bytes,
+    resources: res.length
+};
+"""
+
+_chromedriver_lock = threading.Lock()
+_chromedriver_path = None
+
+
+def resolve_chromedriver(cache_path=CHROMEDRIVER_CACHE_PATH, refresh=False):
+    """
+    Path to chromedriver, resolved once per process. The path is also persisted so
+    later processes skip ChromeDriverManager's network lookup while the file still exists.
+    """
+    global _chromedriver_path
+    with _chromedriver_lock:
+        if _chromedriver_path and not refresh and os.path.exists(_chromedriver_path):
+            return _chromedriver_path
+        if not refresh:
+            try:
+                with open(cache_path, encoding="utf-8") as f:
+                    cached = json.load(f).get("path")
+                if cached and os.path.exists(cached):
+                    _chromedriver_path = cached
+                    return cached
+            except (OSError, ValueError):
+                pass
+        from webdriver_manager.chrome import ChromeDriverManager
+
+        path = ChromeDriverManager().install()
+        try:
+            ensure_dir(os.path.dirname(cache_path) or ".")
+            with open(cache_path, "w", encoding="utf-8") as f:
+                json.dump({"path": path, "resolved_at": time.time()}, f)
+        except OSError:
+            pass
+        _chromedriver_path = path
+        return path
+
+
+def guess_chrome_path():
+    # common Windows locations
+    candidates = [
+        r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+        r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe"
+    ]
+    for p in candidates:
+        if Path(p).exists():
+            return p
+    return None
+
+
+def debug_port_ready(port, timeout=0.5):
+    """True if a Chrome DevTools endpoint answers on 127.0.0.1:port."""
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/json/version", timeout=timeout) as resp:
+            return resp.status == 200
+    except Exception:
+        return False
+
+
+def wait_for_debug_port(port, timeout=15.0, interval=0.1):
+    """
+    Poll the DevTools endpoint until Chrome is listening, instead of sleeping a fixed time.
+    """
+    end_time = time.monotonic() + timeout
+    while time.monotonic() < end_time:
+        if debug_port_ready(port):
+            return True
+        time.sleep(interval)
+    return False
+
+
+def launch_chrome_debug(chrome_path, debug_port, user_data_dir, timeout=15.0):
+    # Launch a visible Chrome with remote debugging
+    if not chrome_path:
+        raise RuntimeError("Chrome executable not found. Please provide chrome_path or install Chrome.")
+    ensure_dir(user_data_dir)
+    cmd = [
+        chrome_path,
+        f"--remote-debugging-port={debug_port}",
+        f'--user-data-dir={user_data_dir}',
+        "--no-first-run",
+        "--no-default-browser-check",
+        "--disable-extensions"
+    ]
+    # start detached process
+    subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    # return as soon as the debug socket is up
+    if not wait_for_debug_port(debug_port, timeout):
+        raise RuntimeError(f"Chrome did not open debug port {debug_port} within {timeout}s.")
+
+
+def attach_chrome(debug_port=DEFAULT_DEBUG_PORT,
+                  user_data_dir=DEFAULT_USER_DATA_DIR,
+                  chrome_path=None,
+                  try_launch_chrome=True):
+    """
+    Attach to existing Chrome at localhost:debug_port (debuggerAddress).
+    If nothing is listening and try_launch_chrome is True, launch Chrome with debugging and attach.
+    """
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    from selenium.webdriver.chrome.options import Options
+
+    options = Options()
+    debugger_addr = f"127.0.0.1:{debug_port}"
+    options.add_experimental_option("debuggerAddress", debugger_addr)
+    # keep GUI visible
+    options.add_argument("--start-maximized")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--remote-allow-origins=*")
+
+    service = Service(resolve_chromedriver())
+
+    first_error = None
+    if debug_port_ready(debug_port):
+        try:
+            # attach (user or an earlier run already started Chrome with the debug port)
+            return webdriver.Chrome(service=service, options=options)
+        except Exception as e:
+            first_error = e
+    else:
+        first_error = RuntimeError(f"nothing listening on {debugger_addr}")
+
+    if not try_launch_chrome:
+        raise RuntimeError(f"Failed to attach to Chrome debugger. error: {first_error}")
+    try:
+        launch_chrome_debug(chrome_path or guess_chrome_path(), debug_port, user_data_dir)
+        return webdriver.Chrome(service=service, options=options)
+    except Exception as e2:
+        raise RuntimeError(f"Failed to attach to Chrome debugger. errors: {first_error} | {e2}")
+
+
+def launch_headless(chrome_path=None, window_size="1366,900"):
+    """
+    Start a private headless Chrome owned by this process (no debug port, no visible window).
+    """
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    from selenium.webdriver.chrome.options import Options
+
+    options = Options()
+    options.add_argument("--headless=new")
+    options.add_argument(f"--window-size={window_size}")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--disable-extensions")
+    options.add_argument("--no-first-run")
+    if chrome_path:
+        options.binary_location = chrome_path
+    return webdriver.Chrome(service=Service(resolve_chromedriver()), options=options)
+
+
+def block_categories(value):
+    """block_resources option -> categories: True means DEFAULT_BLOCK, falsy means none."""
+    if value is True:
+        return DEFAULT_BLOCK
+    if not value:
+        return ()
+    if isinstance(value, str):
+        value = [value]
+    unknown = [c for c in value if c not in BLOCK_PATTERNS]
+    if unknown:
+        raise ValueError(f"unknown resource categories: {', '.join(unknown)}")
+    return tuple(value)
+
+
+def block_resources(driver, categories=DEFAULT_BLOCK, extra_patterns=()):
+    """
+    Have Chrome drop requests for the given categories (see BLOCK_PATTERNS) before they
+    leave the browser, via the DevTools Network.setBlockedURLs command. Works on both
+    headless and attached sessions; block_resources(driver, ()) lifts the block.
+    Returns the patterns in force.
+    """
+    patterns = [p for c in categories for p in BLOCK_PATTERNS[c]] + list(extra_patterns)
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+    return patterns
+
+
+def page_load_stats(driver):
+    """
+    Load time (ms) and bytes transferred for the current page, from the Performance API.
+    Blocked requests never start, so they cost nothing here.
+    """
+    try:
+        return driver.execute_script(PAGE_LOAD_JS) or {}
+    except Exception:
+        return {}
+
+
+def driver_healthy(driver):
+    """
+    Cheap liveness probe: the session answers a script call and still has a window.
+    """
+    if driver is None:
+        return False
+    try:
+        driver.execute_script("return 1")
+        return bool(driver.window_handles)
+    except Exception:
+        return False
+
+
+def start_driver(headless=False, block=(), debug_port=DEFAULT_DEBUG_PORT, user_data_dir=DEFAULT_USER_DATA_DIR,
+                 chrome_path=None, try_launch_chrome=True):
+    """
+    Headless: launch a private headless Chrome. Otherwise attach to (or launch) the
+    visible debug-port Chrome. block: resource categories to block on the new session.
+    """
+    if headless:
+        driver = launch_headless(chrome_path)
+    else:
+        driver = attach_chrome(debug_port, user_data_dir, chrome_path, try_launch_chrome)
+    if block:
+        try:
+            block_resources(driver, block)
+        except Exception:
+            # older drivers without CDP support: load everything
+            pass
+    return driver
+
+
+class DriverService:
+    """
+    Long-lived owner of one attached Chrome session. acquire() hands out the warm driver
+    after a health check (re-attaching only when it has died); release() keeps it alive
+    for the next caller. Keep one instance per process (e.g. st.cache_resource in Streamlit).
+    """
+
+    def __init__(self,
+                 debug_port=DEFAULT_DEBUG_PORT,
+                 user_data_dir=DEFAULT_USER_DATA_DIR,
+                 chrome_path=None,
+                 try_launch_chrome=True,
+                 headless=False,
+                 block_resources=False):
+        """
+        headless: own a headless Chrome instead of attaching to a visible one
+        block_resources: True, or resource categories to block (keys of BLOCK_PATTERNS)
+        """
+        self.debug_port = debug_port
+        self.user_data_dir = user_data_dir
+        self.chrome_path = chrome_path
+        self.try_launch_chrome = try_launch_chrome
+        self.headless = headless
+        self.block = block_categories(block_resources)
+        self.driver = None
+        self.starts = 0
+        self._lock = threading.RLock()
+        self._in_use = threading.Lock()
+
+    def _start(self):
+        self.driver = start_driver(self.headless, self.block, self.debug_port, self.user_data_dir,
+                                   self.chrome_path, self.try_launch_chrome)
+        self.starts += 1
+
+    def acquire(self, blocking=True):
+        """
+        Return a healthy driver, exclusive to the caller until release().
+        """
+        if not self._in_use.acquire(blocking):
+            raise RuntimeError("Driver session is busy.")
+        try:
+            with self._lock:
+                if not driver_healthy(self.driver):
+                    self._discard()
+                    self._start()
+                return self.driver
+        except Exception:
+            self._in_use.release()
+            raise
+
+    def release(self):
+        try:
+            self._in_use.release()
+        except RuntimeError:
+            pass
+
+    @contextmanager
+    def session(self):
+        driver = self.acquire()
+        try:
+            yield driver
+        finally:
+            self.release()
+
+    def warm_up(self):
+        """Resolve chromedriver and attach now, so the first real fetch starts warm."""
+        with self.session():
+            pass
+        return self
+
+    def _discard(self):
+        if self.driver is not None:
+            try:
+                self.driver.quit()
+            except Exception:
+                pass
+            self.driver = None
+
+    def shutdown(self):
+        with self._lock:
+            self._discard()
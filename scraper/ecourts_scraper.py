@@ -1,169 +1,380 @@
 # scraper/ecourts_scraper.py
-import subprocess
-import time
 import os
-import re
-from pathlib import Path
+import time
 
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.support.ui import WebDriverWait, Select
+from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
+from selenium.common.exceptions import WebDriverException
+
+from .utils import ensure_dir, finish_export, DEFAULT_CACHE_DIR, DEFAULT_PDF_WORKERS
+from .html_table import parse_table_html
+from .selector_cache import SelectorCache
+from .models import normalize_rows
+from .catalogue import CourtCatalogue, NameNotFound, best_match, normalize_name, suggest
+from . import metrics
+from .driver_service import (
+    DEFAULT_DEBUG_PORT, DEFAULT_USER_DATA_DIR, guess_chrome_path, launch_chrome_debug,
+    start_driver, block_categories, page_load_stats,
+)
+
+# outerHTML of every result table in one round trip; falls back to all tables,
+# and skips tables nested inside another matched table
+RESULT_TABLES_JS = """
+var sel = "table[id*='result'], table[class*='result'], table[class*='cause']";
+var ts = document.querySelectorAll(sel);
+if (!ts.length) { sel = "table"; ts = document.querySelectorAll(sel); }
+var out = [];
+for (var i = 0; i < ts.length; i++) {
+    var p = ts[i].parentElement;
+    if (p && p.closest(sel)) continue;
+    out.push(ts[i].outerHTML);
+}
+return out;
+"""
+
+# First element matching any selector (in the given order).
+# opts.rows: element must contain a <tr>; opts.option: element must hold an <option> with that text;
+# opts.value: ... an <option> with that value; opts.loaded: ... any enabled <option> with a value.
+FIND_FIRST_JS = """
+var sels = arguments[0], timeoutMs = arguments[1], opts = arguments[2] || {};
+function norm(s) {
+    // catalogue.normalize_name
+    return (s || '').toLowerCase().replace(/&/g, ' and ').replace(/[^0-9a-z]+/g, ' ').trim();
+}
+function ok(el) {
+    if (opts.rows && !el.querySelector('tr')) return false;
+    if (opts.name) {
+        var ns = el.querySelectorAll('option');
+        for (var n = 0; n < ns.length; n++) {
+            if (ns[n].value && !ns[n].disabled && norm(ns[n].textContent).indexOf(opts.name) >= 0) return true;
+        }
+        return false;
+    }
+    if (opts.value || opts.loaded) {
+        var vs = el.querySelectorAll('option');
+        for (var k = 0; k < vs.length; k++) {
+            if (opts.value ? vs[k].value === opts.value : (vs[k].value && !vs[k].disabled)) return true;
+        }
+        return false;
+    }
+    if (opts.option) {
+        var want = opts.option.toLowerCase(), os = el.querySelectorAll('option');
+        for (var j = 0; j < os.length; j++) {
+            if ((os[j].textContent || '').trim().toLowerCase().indexOf(want) >= 0) return true;
+        }
+        return false;
+    }
+    return true;
+}
+function find() {
+    for (var i = 0; i < sels.length; i++) {
+        var el = document.querySelector(sels[i]);
+        if (el && ok(el)) return [el, sels[i]];
+    }
+    return null;
+}
+"""
 
-from .utils import ensure_dir, generate_pdf, save_json, save_csv
+# Same lookup, resolved by a MutationObserver as soon as a match shows up instead of polling.
+# Returns [element, selector], or null on timeout.
+AWAIT_FIRST_JS = FIND_FIRST_JS + """
+var done = arguments[arguments.length - 1];
+var hit = find();
+if (hit) { done(hit); return; }
+var timer = null;
+var obs = new MutationObserver(function() {
+    var h = find();
+    if (h) { obs.disconnect(); clearTimeout(timer); done(h); }
+});
+obs.observe(document.documentElement, {childList: true, subtree: true, characterData: true});
+timer = setTimeout(function() { obs.disconnect(); done(null); }, timeoutMs);
+"""
+
+# Select the option of a <select> with the given value (names are matched in Python, by
+# catalogue.best_match) and fire input/change so the page's own handlers run.
+# Without a value nothing is picked. Returns the pick and every option seen.
+SELECT_OPTION_JS = """
+var sel = arguments[0], value = arguments[1];
+var opts = [], pick = null;
+for (var i = 0; i < sel.options.length; i++) {
+    var o = sel.options[i], t = (o.textContent || '').trim();
+    opts.push([o.value, t, o.disabled]);
+    if (!pick && value && !o.disabled && o.value === value) pick = o;
+}
+if (pick) {
+    sel.value = pick.value;
+    sel.dispatchEvent(new Event('input', {bubbles: true}));
+    sel.dispatchEvent(new Event('change', {bubbles: true}));
+}
+return {picked: pick ? [pick.value, (pick.textContent || '').trim()] : null, options: opts};
+"""
+
+# Resolve once the document has finished loading.
+AWAIT_READY_JS = """
+var done = arguments[arguments.length - 1];
+if (document.readyState === 'complete') { done(true); }
+else { window.addEventListener('load', function() { done(true); }); }
+"""
+
+def _no_progress(stage, rows):
+    pass
 
-DEFAULT_DEBUG_PORT = 9222
-DEFAULT_USER_DATA_DIR = r"C:/chrome-debug-eCourts"
 
 class ECourtsScraper:
     BASE_URL = "https://services.ecourts.gov.in/ecourtindia_v6/?p=cause_list/"
 
+    # seconds a dropdown gets to offer the wanted option before any loaded option will do
+    OPTION_TIMEOUT = 5
+    # fallback IDs for the popup dropdowns; learned winners are tried first
+    STATE_IDS = ["selState", "sess_state_code", "state", "sess_state", "sel_state", "statecode"]
+    DISTRICT_IDS = ["selDistrict", "sess_dist_code", "dist", "sess_dist", "sel_district", "distcode"]
+    COMPLEX_IDS = ["selCourtComplex", "court_complex_code", "courtComplex", "selCourt", "court_complex"]
+    # result table selectors, most specific first
+    TABLE_SELECTORS = [
+        "#resultTable",
+        "#result_table",
+        "#result",
+        "table[id*='result'], table[class*='result'], table[class*='cause']",
+        "table",
+    ]
+
     def __init__(self,
                  download_dir="downloads",
                  chrome_path=None,
                  debug_port=DEFAULT_DEBUG_PORT,
                  user_data_dir=DEFAULT_USER_DATA_DIR,
-                 try_launch_chrome=True):
+                 try_launch_chrome=True,
+                 driver=None,
+                 field_timeout=30,
+                 selector_cache_path=None,
+                 driver_service=None,
+                 search_index=None,
+                 metrics_recorder=None,
+                 base_url=None,
+                 headless=False,
+                 block_resources=False,
+                 catalogue=None,
+                 archive=None,
+                 pdf_workers=DEFAULT_PDF_WORKERS):
         """
         chrome_path: optional explicit path to chrome.exe
         try_launch_chrome: if attach to debugger fails, attempt to launch chrome with debugging port
+        driver: optional already-created WebDriver to use instead of attaching to Chrome
+        driver_service: optional DriverService; its warm session is borrowed and close()
+                        hands it back instead of quitting it
+        search_index: optional SearchIndex updated with every saved JSON (or archived listing)
+        metrics_recorder: optional MetricsRecorder receiving each run's timings
+                          (JSON log + Prometheus textfile); last_metrics is kept either way
+        field_timeout: seconds to wait for each popup field (all fallback IDs at once)
+        selector_cache_path: JSON file remembering which selectors worked last time
+        base_url: cause list page to open instead of the live site (e.g. a local stand-in server)
+        headless: launch a private headless Chrome instead of attaching to the visible debug-port one
+                  (manual popup filling is then impossible)
+        block_resources: True (images, fonts, stylesheets, analytics) or a list of those categories
+                         to block through the DevTools protocol
+        catalogue: CourtCatalogue used to pick dropdown values offline (and taught the options
+                   seen in the page); defaults to the shared .ecourts_cache/catalogue.json
+        archive: optional ArchiveStore; rows are stored there and the PDF/JSON/CSV files are
+                 generated into its export directory instead of download_dir
+        pdf_workers: processes rendering each exported PDF (default 1); with more, lists longer
+                     than one render chunk are drawn in parallel (needs pypdf, and scripts need
+                     an if __name__ == "__main__" guard since the workers are spawned)
         """
         self.download_dir = download_dir
         ensure_dir(download_dir)
+        self.base_url = base_url or self.BASE_URL
+        self.search_index = search_index
+        self.metrics_recorder = metrics_recorder
+        self.last_metrics = None
         self.debug_port = debug_port
         self.user_data_dir = user_data_dir
         self.chrome_path = chrome_path or self._guess_chrome_path()
         self.try_launch_chrome = try_launch_chrome
-        self.driver = None
-        self.wait = None
-        self._ensure_driver_attached()
+        self.headless = headless
+        self.block = block_categories(block_resources)
+        self.last_page_load = {}
+        self.catalogue = catalogue if catalogue is not None else CourtCatalogue()
+        self.archive = archive
+        self.pdf_workers = pdf_workers
+        self.field_timeout = field_timeout
+        self.selector_cache = SelectorCache(selector_cache_path or os.path.join(DEFAULT_CACHE_DIR, "selectors.json"))
+        self.driver_service = None
+        t0 = time.perf_counter()
+        if driver is None and driver_service is not None:
+            driver = driver_service.acquire()
+            self.driver_service = driver_service
+            self.headless = self.headless or driver_service.headless
+            self.block = self.block or driver_service.block
+        self.driver = driver
+        self.wait = WebDriverWait(driver, 30) if driver else None
+        if not driver:
+            self._ensure_driver_attached()
+        # charged to the first run as its "attach" phase
+        self._attach_seconds = time.perf_counter() - t0
 
     def _guess_chrome_path(self):
-        # common Windows locations
-        candidates = [
-            r"C:\Program Files\Google\Chrome\Application\chrome.exe",
-            r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe"
-        ]
-        for p in candidates:
-            if Path(p).exists():
-                return p
-        return None
+        return guess_chrome_path()
 
     def _launch_chrome_debug(self):
-        # Launch a visible Chrome with remote debugging
-        if not self.chrome_path:
-            raise RuntimeError("Chrome executable not found. Please provide chrome_path or install Chrome.")
-        ensure_dir(self.user_data_dir)
-        cmd = [
-            self.chrome_path,
-            f"--remote-debugging-port={self.debug_port}",
-            f'--user-data-dir={self.user_data_dir}',
-            "--no-first-run",
-            "--no-default-browser-check",
-            "--disable-extensions"
-        ]
-        # start detached process
-        subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-        # give Chrome time to start and open debug socket
-        time.sleep(2.5)
+        # Launch a visible Chrome with remote debugging; returns once the debug port answers
+        launch_chrome_debug(self.chrome_path, self.debug_port, self.user_data_dir)
 
     def _ensure_driver_attached(self):
         """
         Attempt to attach to existing Chrome at localhost:debug_port (debuggerAddress)
         If fails and try_launch_chrome True, launch Chrome with debugging and attach.
+        In headless mode a private headless Chrome is started instead.
         """
-        options = Options()
-        debugger_addr = f"127.0.0.1:{self.debug_port}"
-        options.add_experimental_option("debuggerAddress", debugger_addr)
-        # keep GUI visible
-        options.add_argument("--start-maximized")
-        options.add_argument("--disable-dev-shm-usage")
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-gpu")
-        options.add_argument("--remote-allow-origins=*")
-
-        chromedriver_path = ChromeDriverManager().install()
-        service = Service(chromedriver_path)
-
-        try:
-            # First try attach (assumes user already started Chrome with debug port)
-            self.driver = webdriver.Chrome(service=service, options=options)
-            self.wait = WebDriverWait(self.driver, 30)
-            return
-        except Exception as e:
-            # try launching Chrome with debug and attach
-            if self.try_launch_chrome:
-                try:
-                    self._launch_chrome_debug()
-                    time.sleep(1.5)
-                    self.driver = webdriver.Chrome(service=service, options=options)
-                    self.wait = WebDriverWait(self.driver, 30)
-                    return
-                except Exception as e2:
-                    raise RuntimeError(f"Failed to attach to Chrome debugger. errors: {e} | {e2}")
-            else:
-                raise RuntimeError(f"Failed to attach to Chrome debugger. error: {e}")
+        self.driver = start_driver(self.headless, self.block, self.debug_port, self.user_data_dir,
+                                   self.chrome_path, self.try_launch_chrome)
+        self.wait = WebDriverWait(self.driver, 30)
 
     # ---------- Navigation & popup handling ----------
     def open_page(self):
-        self.driver.get(self.BASE_URL)
+        self.driver.get(self.base_url)
+        self.wait_for_dom_ready()
+        # load time and bytes on the wire for this mode (headless / blocking)
+        self.last_page_load = page_load_stats(self.driver)
+        run = metrics.current()
+        if self.last_page_load.get("load_ms") is not None:
+            run.count("page_load_ms", self.last_page_load["load_ms"])
+        run.count("page_transfer_bytes", self.last_page_load.get("transfer_bytes") or 0)
 
-    def _find_and_select_option(self, select_elem, desired_text):
+    def wait_for_dom_ready(self, timeout=15):
         """
-        Helper: click option with matching visible text (case-insensitive substring)
+        Block until document.readyState is 'complete' (fires on the load event, no sleeps).
         """
-        desired_text = (desired_text or "").strip().lower()
-        for opt in select_elem.find_elements(By.TAG_NAME, "option"):
-            txt = opt.text.strip().lower()
-            if desired_text and desired_text in txt:
-                opt.click()
-                return True
-        return False
+        try:
+            self.driver.set_script_timeout(timeout)
+            self.driver.execute_async_script(AWAIT_READY_JS)
+        except WebDriverException:
+            pass
 
-    def try_auto_fill_popup(self, state, district, court_complex, wait_for_options=True):
+    def wait_for_first(self, field, selectors, timeout, rows=False, option_text=None, option_value=None,
+                       loaded=False, option_name=None):
         """
-        Try multiple fallback IDs to find state/district/court dropdowns.
-        Return True if we clicked a proceed or auto-filled at least one field.
+        Wait once for whichever of selectors appears first, trying the ones learned
+        for field first. Returns the element and records the winning selector.
+        option_text / option_value / option_name / loaded: the element must also hold that
+        option (option_name compares normalize_name forms; with loaded, any real option
+        will do) - dropdowns that are filled by AJAX.
+        Raises TimeoutError if none shows up in time.
         """
-        filled_any = False
-        # list of possible IDs for state/dropdown
-        state_ids = ["selState", "sess_state_code", "state", "sess_state", "sel_state", "statecode"]
-        district_ids = ["selDistrict", "sess_dist_code", "dist", "sess_dist", "sel_district", "distcode"]
-        complex_ids = ["selCourtComplex", "court_complex_code", "courtComplex", "selCourt", "court_complex"]
+        ordered = self.selector_cache.order(field, selectors)
+        opts = {"rows": rows, "option": (option_text or "").strip() or None,
+                "value": option_value or None, "loaded": loaded,
+                "name": normalize_name(option_name) or None}
+        try:
+            self.driver.set_script_timeout(timeout + 5)
+            hit = self.driver.execute_async_script(AWAIT_FIRST_JS, ordered, int(timeout * 1000), opts)
+        except WebDriverException:
+            # e.g. page navigated mid-wait: fall back to polling the same lookup
+            metrics.event("wait_fallback", field=field)
+            hit = self._poll_first(ordered, timeout, opts)
+        if not hit:
+            metrics.event("timeout", field=field, timeout=timeout)
+            raise TimeoutError(f"Timed out waiting for {field} ({', '.join(ordered)}).")
+        elem, selector = hit
+        self.selector_cache.record(field, selector)
+        return elem
 
-        # try each combination; we expect at least one valid select element exists
-        for sid in state_ids:
-            try:
-                sel_state = self.wait.until(EC.presence_of_element_located((By.ID, sid)))
-                # wrap with Select if it's a <select>
-                try:
-                    sel = Select(sel_state)
-                except Exception:
-                    sel = Select(self.driver.find_element(By.ID, sid))
-                self._find_and_select_option(sel_state, state)
-                filled_any = True
-                break
-            except Exception:
-                continue
+    def _poll_first(self, ordered, timeout, opts):
+        # same predicate, evaluated synchronously on each poll
+        try:
+            return WebDriverWait(self.driver, timeout, poll_frequency=0.25).until(
+                lambda d: d.execute_script(FIND_FIRST_JS + "return find();", ordered, 0, opts))
+        except Exception:
+            return None
 
-        for did in district_ids:
-            try:
-                sel_d = self.wait.until(EC.presence_of_element_located((By.ID, did)))
-                self._find_and_select_option(sel_d, district)
-                filled_any = True
-                break
-            except Exception:
-                continue
+    def _find_and_select_option(self, select_elem, desired_text, value=None):
+        """
+        Helper: select an option by value in one scripted call. Without a value the first
+        call only reads the options; desired_text is matched against them by best_match
+        (the rule the HTTP engine and the catalogue use) and its value selected in a second.
+        Near (fuzzy) names are never picked.
+        Returns ((value, text) picked or None, [(value, text, disabled), ...]).
+        """
+        res = self.driver.execute_script(SELECT_OPTION_JS, select_elem, value) or {}
+        options = [tuple(o) for o in res.get("options") or []]
+        picked = tuple(res["picked"]) if res.get("picked") else None
+        if picked is None and not value:
+            hit = best_match([(v, t) for v, t, disabled in options if not disabled], desired_text)
+            if hit:
+                res = self.driver.execute_script(SELECT_OPTION_JS, select_elem, hit[0]) or {}
+                picked = tuple(res["picked"]) if res.get("picked") else None
+        return picked, options
+
+    def _learn_options(self, field, parents, options):
+        if self.catalogue is None:
+            return
+        options = [(v, t) for v, t, disabled in options if v and not disabled]
+        if field == "state":
+            changed = self.catalogue.learn_states(options)
+        elif field == "district" and len(parents) >= 1:
+            changed = self.catalogue.learn_districts(parents[0], options)
+        elif field == "complex" and len(parents) >= 2:
+            changed = self.catalogue.learn_complexes(parents[0], parents[1], options)
+        else:
+            return
+        if changed:
+            self.catalogue.save()
 
-        for cid in complex_ids:
+    def _wait_for_dropdown(self, field, ids, desired, value, wait_for_options):
+        """
+        The field's dropdown once it offers the wanted option (by catalogue value, else by
+        name). A district or complex list still shows the previous parent's options for a
+        moment after a pick, so any option is accepted only after OPTION_TIMEOUT, and a
+        stale catalogue value or unmatched name then no longer stalls the wait.
+        """
+        selectors = [f"#{i}" for i in ids]
+        if not wait_for_options:
+            return self.wait_for_first(field, selectors, self.field_timeout)
+        short = min(self.OPTION_TIMEOUT, self.field_timeout)
+        try:
+            return self.wait_for_first(field, selectors, short, option_value=value,
+                                       option_name=None if value else desired)
+        except TimeoutError:
+            metrics.event("option_wait_fallback", field=field)
+        return self.wait_for_first(field, selectors, max(1, self.field_timeout - short), loaded=True)
+
+    def try_auto_fill_popup(self, state, district, court_complex, wait_for_options=True):
+        """
+        Find state/district/court dropdowns with one combined wait per field over all fallback IDs,
+        then set each by value in one scripted call. Values come from the court catalogue when it
+        knows the names (matched offline); otherwise the options are matched in the page.
+        wait_for_options: also wait until the dropdown holds its options
+                          (district/complex options arrive by AJAX after the previous pick).
+        Return True if we clicked a proceed or auto-filled at least one field.
+        Raises NameNotFound when a name only resembles the options offered.
+        """
+        filled_any = False
+        known = self.catalogue.resolve(state, district, court_complex) if self.catalogue is not None else {}
+        fields = [
+            ("state", self.STATE_IDS, state),
+            ("district", self.DISTRICT_IDS, district),
+            ("complex", self.COMPLEX_IDS, court_complex),
+        ]
+        picked_values = []
+        for field, ids, desired in fields:
+            value = (known.get(field) or (None,))[0]
             try:
-                sel_c = self.wait.until(EC.presence_of_element_located((By.ID, cid)))
-                self._find_and_select_option(sel_c, court_complex)
+                elem = self._wait_for_dropdown(field, ids, desired, value, wait_for_options)
+                picked, options = self._find_and_select_option(elem, desired, value)
+                if picked is None and value:
+                    # catalogue value no longer offered: fall back to the names on the page
+                    metrics.event("catalogue_stale", field=field)
+                    picked, options = self._find_and_select_option(elem, desired)
+                self._learn_options(field, picked_values, options)
+                if picked is None:
+                    hint = suggest([(v, t) for v, t, disabled in options if not disabled], desired)
+                    if hint is not None:
+                        metrics.event("name_not_found", field=field, suggestion=hint[1])
+                        raise NameNotFound(field, desired, hint)
+                    continue
+                picked_values.append(picked[0])
                 filled_any = True
-                break
+            except NameNotFound:
+                raise
             except Exception:
                 continue
 
@@ -181,37 +392,44 @@ class ECourtsScraper:
         """
         Wait until the result table appears in the page.
         Some pages use ID 'resultTable', others 'result', 'result_table', or contain <table>.
+        All selectors are watched at once; the table must have at least one row.
         """
-        possible_table_selectors = [
-            (By.ID, "resultTable"),
-            (By.ID, "result_table"),
-            (By.ID, "result"),
-            (By.CSS_SELECTOR, "table#resultTable"),
-            (By.XPATH, "//table[contains(@id,'result') or contains(@class,'result') or contains(@class,'cause')]"),
-            (By.TAG_NAME, "table")
-        ]
-        end_time = time.time() + timeout
-        while time.time() < end_time:
-            for by, sel in possible_table_selectors:
-                try:
-                    elem = self.driver.find_element(by, sel) if by != By.XPATH else self.driver.find_element(By.XPATH, sel)
-                    # ensure it has rows
-                    try:
-                        trs = elem.find_elements(By.TAG_NAME, "tr")
-                        if len(trs) >= 1:
-                            return elem
-                    except Exception:
-                        return elem
-                except Exception:
-                    continue
-            time.sleep(1)
-        raise TimeoutError("Timed out waiting for result table to appear.")
+        return self.wait_for_first("table", self.TABLE_SELECTORS, timeout, rows=True)
 
     # ---------- Scrape ----------
-    def parse_table(self, table_elem):
+    def parse_table(self, table_elem, fast=True):
         """
         Parse a Selenium table element into list of dicts.
         Tries header-based mapping if header row present, else uses common columns.
+        fast: pull the table's outerHTML in one WebDriver call and parse it in-process,
+              instead of one call per row and per cell.
+        """
+        if not fast:
+            return self._parse_table_elements(table_elem)
+        return parse_table_html(table_elem.get_attribute("outerHTML"))
+
+    def parse_result_tables(self):
+        """
+        Parse every result table on the current page in a single WebDriver call.
+        Returns one list of dicts per table.
+        """
+        tables_html = self.driver.execute_script(RESULT_TABLES_JS) or []
+        return [parse_table_html(t) for t in tables_html]
+
+    def parse_cause_list(self):
+        """
+        All result tables on the page as one normalized CauseList
+        (stage, case type/number/year, parties and advocates split out).
+        """
+        rows = []
+        for table_rows in self.parse_result_tables():
+            rows.extend(table_rows)
+        return normalize_rows(rows)
+
+    def _parse_table_elements(self, table_elem):
+        """
+        Element-by-element parse (one round trip per row and per cell).
+        Kept for comparison and for drivers without script support.
         """
         rows = table_elem.find_elements(By.TAG_NAME, "tr")
         data = []
@@ -236,31 +454,64 @@ class ECourtsScraper:
             data.append(rowd)
         return data
 
-    def generate_pdf_for_date(self, state, district, court_complex, date_str, allow_manual_fill=True):
+    def generate_pdf_for_date(self, state, district, court_complex, date_str, allow_manual_fill=True, delta=False,
+                              columnar=False, profile=None, progress=None):
         """
         Full flow: open page, try auto-fill popup, optionally wait for manual fill, wait for table, parse and save PDF/JSON/CSV.
         Returns dict with paths and scraped data.
+        delta: compare with the last stored version and only rewrite exports when rows changed;
+               the result then also carries "delta", "changed" and "fingerprints".
+        columnar: also write the normalized CauseList as <name>.ccl (result key "columnar").
+        profile: True (or a .prof path) to run this call under cProfile.
+        progress: optional callable(stage, rows) told of each step ("open_page", "auto_fill",
+                  "wait_table", "parse", "export") and of each parsed table's rows.
+        Phase timings and WebDriver call counts end up in self.last_metrics.
         """
-        self.open_page()
-        time.sleep(1.2)
+        labels = {"state": state, "district": district, "court_complex": court_complex, "date": date_str,
+                  "headless": self.headless, "blocked": ",".join(self.block)}
+        with metrics.measure_run(self.metrics_recorder, "selenium", labels, profile) as run:
+            self.last_metrics = run
+            if self._attach_seconds:
+                run.phases["attach"] += self._attach_seconds
+                self._attach_seconds = 0.0
+            with metrics.watch_driver(self.driver, run):
+                result = self._generate(state, district, court_complex, date_str, allow_manual_fill, delta, columnar,
+                                        progress or _no_progress)
+            run.count("rows", len(result.get("data") or []))
+        return result
+
+    def _generate(self, state, district, court_complex, date_str, allow_manual_fill, delta, columnar, progress):
+        progress("open_page", None)
+        with metrics.phase("open_page"):
+            self.open_page()
 
         filled = False
+        progress("auto_fill", None)
         try:
-            filled = self.try_auto_fill_popup(state, district, court_complex)
+            with metrics.phase("auto_fill"):
+                filled = self.try_auto_fill_popup(state, district, court_complex)
+        except NameNotFound:
+            raise
         except Exception:
             filled = False
+        if not filled:
+            metrics.event("auto_fill_failed")
 
         # If auto-fill didn't work and manual allowed, instruct user to fill the popup in Chrome
-        if not filled and allow_manual_fill:
+        # nobody can fill a headless popup by hand
+        if not filled and allow_manual_fill and not self.headless:
             # wait until user clicks proceed and table loads
+            progress("wait_table", None)
             table_elem = None
             try:
-                table_elem = self.wait_for_table(timeout=90)
+                with metrics.phase("wait_table"):
+                    table_elem = self.wait_for_table(timeout=90)
             except TimeoutError:
-                # allow one more try after short sleep
-                time.sleep(2)
+                # allow one more try
+                metrics.event("retry", step="wait_table")
                 try:
-                    table_elem = self.wait_for_table(timeout=30)
+                    with metrics.phase("wait_table"):
+                        table_elem = self.wait_for_table(timeout=30)
                 except TimeoutError:
                     table_elem = None
             if not table_elem:
@@ -269,27 +520,36 @@ class ECourtsScraper:
 
         else:
             # if auto-filled we still wait for table to appear
+            progress("wait_table", None)
             try:
-                table_elem = self.wait_for_table(timeout=30)
+                with metrics.phase("wait_table"):
+                    table_elem = self.wait_for_table(timeout=30)
             except TimeoutError:
                 return {"pdf": None, "json": None, "csv": None, "data": []}
 
-        data = self.parse_table(table_elem)
-        safe_state = re.sub(r'\W+', '_', state or "state")
-        safe_dist = re.sub(r'\W+', '_', district or "dist")
-        safe_complex = re.sub(r'\W+', '_', court_complex or "complex")
-        fname_base = f"{safe_state}_{safe_dist}_{safe_complex}_{date_str}"
-        pdf_path = os.path.join(self.download_dir, f"{fname_base}.pdf")
-        json_path = os.path.join(self.download_dir, f"{fname_base}.json")
-        csv_path = os.path.join(self.download_dir, f"{fname_base}.csv")
-
-        generate_pdf(data, pdf_path, title=f"Cause List - {state} / {district} / {court_complex}")
-        save_json(data, json_path)
-        save_csv(data, csv_path)
-
-        return {"pdf": pdf_path, "json": json_path, "csv": csv_path, "data": data}
+        # all result tables on the page, merged; the waited-for table if script parsing yields nothing
+        data = []
+        with metrics.phase("parse"):
+            try:
+                tables = self.parse_result_tables()
+            except Exception:
+                tables = []
+            for rows in tables:
+                data.extend(rows)
+                progress("parse", rows)
+            if not data:
+                metrics.event("parse_fallback")
+                data = self.parse_table(table_elem)
+                progress("parse", data)
+        progress("export", None)
+        return finish_export(data, self, state, district, court_complex, date_str, delta, columnar)
 
     def close(self):
+        if self.driver_service is not None:
+            # keep the warm session alive for the next caller
+            self.driver_service.release()
+            self.driver = None
+            return
         try:
             if self.driver:
                 self.driver.quit()
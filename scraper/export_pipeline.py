@@ -0,0 +1,148 @@
+# scraper/export_pipeline.py
+import csv
+import json
+import os
+import tempfile
+
+from .utils import ensure_dir, generate_pdf
+from . import metrics
+
+
+class JsonSink:
+    """
+    Writes a JSON array row by row, byte-identical to json.dump(rows, indent=2, ensure_ascii=False).
+    """
+
+    def __init__(self, out_path):
+        ensure_dir(os.path.dirname(out_path))
+        self.out_path = out_path
+        self._f = open(out_path, "w", encoding="utf-8")
+        self._count = 0
+
+    def write(self, row, columns):
+        body = json.dumps(row, ensure_ascii=False, indent=2).replace("\n", "\n  ")
+        self._f.write(("[\n  " if self._count == 0 else ",\n  ") + body)
+        self._count += 1
+
+    def close(self, columns, spool):
+        self._f.write("[]" if self._count == 0 else "\n]")
+        self._f.close()
+        return self.out_path
+
+
+class JsonlSink:
+    """One JSON object per line; readable while it is still being written."""
+
+    def __init__(self, out_path):
+        ensure_dir(os.path.dirname(out_path))
+        self.out_path = out_path
+        self._f = open(out_path, "w", encoding="utf-8")
+
+    def write(self, row, columns):
+        self._f.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+    def close(self, columns, spool):
+        self._f.close()
+        return self.out_path
+
+
+class CsvSink:
+    """
+    CSV needs its header before the first row, but new columns can appear late,
+    so rows are replayed from the pipeline's spool once the column set is final.
+    """
+    needs_spool = True
+
+    def __init__(self, out_path):
+        self.out_path = out_path
+
+    def write(self, row, columns):
+        pass
+
+    def close(self, columns, spool):
+        if not columns:
+            return None
+        ensure_dir(os.path.dirname(self.out_path))
+        with open(self.out_path, "w", newline='', encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=columns, restval="")
+            writer.writeheader()
+            for row in spool():
+                writer.writerow(row)
+        return self.out_path
+
+
+class PdfSink:
+    """PDF table laid out with the final column set, rows streamed from the spool."""
+    needs_spool = True
+
+    def __init__(self, out_path, title="eCourts Cause List", workers=1):
+        self.out_path = out_path
+        self.title = title
+        self.workers = workers
+
+    def write(self, row, columns):
+        pass
+
+    def close(self, columns, spool):
+        return generate_pdf(spool(), self.out_path, title=self.title, headers=columns, workers=self.workers)
+
+
+def export_stream(rows, json_path=None, csv_path=None, pdf_path=None, jsonl_path=None,
+                  title="eCourts Cause List", pdf_workers=1):
+    """
+    Consume rows (any iterable of dicts, e.g. a generator over several merged courts)
+    exactly once and fan them out to every requested sink.
+    Columns follow first-seen order. CSV and PDF read the rows back from a single
+    on-disk spool, so memory stays bounded by one row regardless of list size.
+    pdf_workers: processes rendering the PDF (see generate_pdf).
+    Returns {"rows": n, "columns": [...], "json"/"jsonl"/"csv"/"pdf": path or None}.
+    """
+    sinks = {}
+    if json_path:
+        sinks["json"] = JsonSink(json_path)
+    if jsonl_path:
+        sinks["jsonl"] = JsonlSink(jsonl_path)
+    if csv_path:
+        sinks["csv"] = CsvSink(csv_path)
+    if pdf_path:
+        sinks["pdf"] = PdfSink(pdf_path, title=title, workers=pdf_workers)
+
+    spool_file = None
+    if any(getattr(s, "needs_spool", False) for s in sinks.values()):
+        spool_file = tempfile.TemporaryFile("w+", encoding="utf-8")
+
+    columns = []
+    seen = set()
+    count = 0
+    try:
+        with metrics.phase("stream"):
+            for row in rows:
+                for k in row.keys():
+                    if k not in seen:
+                        seen.add(k)
+                        columns.append(k)
+                for sink in sinks.values():
+                    sink.write(row, columns)
+                if spool_file is not None:
+                    spool_file.write(json.dumps(row, ensure_ascii=False) + "\n")
+                count += 1
+
+        def spool():
+            if spool_file is None:
+                return
+            spool_file.seek(0)
+            for line in spool_file:
+                yield json.loads(line)
+
+        out = {"rows": count, "columns": columns}
+        for name, sink in sinks.items():
+            with metrics.phase(name):
+                out[name] = sink.close(columns, spool)
+        return out
+    finally:
+        for sink in sinks.values():
+            f = getattr(sink, "_f", None)
+            if f is not None and not f.closed:
+                f.close()
+        if spool_file is not None:
+            spool_file.close()
@@ -0,0 +1,243 @@
+# scraper/html_table.py
+import html
+import re
+from html.parser import HTMLParser
+
+# elements whose boundaries render as line breaks in the browser's innerText
+BLOCK_TAGS = {"div", "p", "li", "ul", "ol", "h1", "h2", "h3", "h4", "h5", "h6", "section", "article"}
+WHITESPACE_RE = re.compile(r"[ \t\r\n\f\v]+")
+# placeholder for a block boundary; adjacent boundaries collapse into one line break
+BLOCK_BREAK = "\x00"
+BLOCK_BREAK_RE = re.compile(r"\x00+")
+
+
+class _TableCollector(HTMLParser):
+    """
+    Collects every <table> in a document as a list of rows.
+    Each row is a list of (tag, text) cells where tag is 'th' or 'td'.
+    Nested tables are collected separately and do not leak into their parent cell.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.tables = []
+        self._stack = []  # open tables: {"rows": [...], "row": [...] or None, "cell": (tag, parts) or None}
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "table":
+            t = {"rows": [], "row": None, "cell": None}
+            # register on open so tables come out in document order, outer before nested
+            self.tables.append(t["rows"])
+            self._stack.append(t)
+            return
+        if not self._stack:
+            return
+        t = self._stack[-1]
+        if tag == "tr":
+            self._close_row(t)
+            t["row"] = []
+        elif tag in ("td", "th"):
+            self._close_cell(t)
+            if t["row"] is None:
+                t["row"] = []
+            t["cell"] = (tag, [])
+        elif tag == "br":
+            self._text("\n")
+        elif tag in BLOCK_TAGS:
+            self._text(BLOCK_BREAK)
+
+    def handle_startendtag(self, tag, attrs):
+        if tag == "br":
+            self._text("\n")
+
+    def handle_endtag(self, tag):
+        if not self._stack:
+            return
+        t = self._stack[-1]
+        if tag == "table":
+            self._close_row(t)
+            self._stack.pop()
+        elif tag == "tr":
+            self._close_row(t)
+        elif tag in ("td", "th"):
+            self._close_cell(t)
+        elif tag in BLOCK_TAGS:
+            self._text(BLOCK_BREAK)
+
+    def handle_data(self, data):
+        if data:
+            self._text(WHITESPACE_RE.sub(" ", data))
+
+    def close(self):
+        super().close()
+        # tolerate truncated markup: flush anything still open
+        while self._stack:
+            self._close_row(self._stack.pop())
+
+    def _text(self, s):
+        if self._stack and self._stack[-1]["cell"] is not None:
+            self._stack[-1]["cell"][1].append(s)
+
+    def _close_cell(self, t):
+        if t["cell"] is None:
+            return
+        tag, parts = t["cell"]
+        t["row"].append((tag, _render_text("".join(parts))))
+        t["cell"] = None
+
+    def _close_row(self, t):
+        self._close_cell(t)
+        if t["row"] is not None:
+            t["rows"].append(t["row"])
+        t["row"] = None
+
+
+class _OptionCollector(HTMLParser):
+    """
+    Collects (value, text, disabled) for every <option> in a fragment.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.options = []
+        self._current = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "option":
+            self._close()
+            a = dict(attrs)
+            self._current = [a.get("value"), [], "disabled" in a]
+
+    def handle_endtag(self, tag):
+        if tag in ("option", "select"):
+            self._close()
+
+    def handle_data(self, data):
+        if self._current is not None:
+            self._current[1].append(data)
+
+    def close(self):
+        super().close()
+        self._close()
+
+    def _close(self):
+        if self._current is None:
+            return
+        value, parts, disabled = self._current
+        text = WHITESPACE_RE.sub(" ", "".join(parts)).strip()
+        # an option without a value attribute submits its text
+        self.options.append((text if value is None else value, text, disabled))
+        self._current = None
+
+
+def _render_text(raw):
+    """
+    Approximate Selenium's WebElement.text for a cell: collapse whitespace per line,
+    keep explicit line breaks, strip the ends.
+    """
+    raw = BLOCK_BREAK_RE.sub(BLOCK_BREAK, raw)
+    # a block boundary right next to an explicit <br> does not add another line
+    raw = raw.replace("\n" + BLOCK_BREAK, "\n").replace(BLOCK_BREAK + "\n", "\n")
+    raw = raw.replace(BLOCK_BREAK, "\n")
+    return "\n".join(ln.strip() for ln in raw.split("\n")).strip()
+
+
+def extract_tables(page_html):
+    """
+    Return every table in the HTML as a list of rows, each row a list of (tag, text) cells.
+    """
+    parser = _TableCollector()
+    parser.feed(page_html or "")
+    parser.close()
+    return parser.tables
+
+
+def parse_options(fragment_html):
+    """
+    Return [(value, text, disabled), ...] for the <option> elements in an HTML fragment.
+    """
+    parser = _OptionCollector()
+    parser.feed(fragment_html or "")
+    parser.close()
+    return parser.options
+
+
+def match_option(options, desired_text):
+    """
+    Pick the value of the first enabled option whose text contains desired_text
+    (case-insensitive substring, same rule as the browser dropdown helper).
+    Returns None when nothing matches.
+    """
+    desired_text = (desired_text or "").strip().lower()
+    if not desired_text:
+        return None
+    for value, text, disabled in options:
+        if not disabled and value and desired_text in text.lower():
+            return value
+    return None
+
+
+def rows_from_cells(rows):
+    """
+    Map raw table rows to list of dicts, same rules as ECourtsScraper.parse_table:
+    first row is the header (th, else td), rows without <td> are skipped.
+    """
+    data = []
+    if not rows:
+        return data
+    headers = [text if text else f"col{i}" for i, (_tag, text) in enumerate(rows[0], 1)]
+    for r in rows[1:]:
+        cols = [text for tag, text in r if tag == "td"]
+        if not cols:
+            continue
+        rowd = {}
+        for i, text in enumerate(cols):
+            key = headers[i] if i < len(headers) else f"col{i+1}"
+            rowd[key] = text
+        data.append(rowd)
+    return data
+
+
+def parse_table_html(table_html):
+    """
+    Parse the outerHTML of a single table into list of dicts.
+    """
+    tables = extract_tables(table_html)
+    return rows_from_cells(tables[0]) if tables else []
+
+
+def parse_tables_html(page_html):
+    """
+    Parse every table in the HTML. Returns a list with one list of dicts per table.
+    """
+    return [rows_from_cells(t) for t in extract_tables(page_html)]
+
+
+def rows_to_html(data, table_id="resultTable"):
+    """
+    Render list of dicts back into a cause-list style HTML table.
+    Single-value rows become full-width section rows, newlines become <br>.
+    Used to build fixtures from saved JSON.
+    """
+    headers = []
+    for row in data:
+        for k in row.keys():
+            if k not in headers:
+                headers.append(k)
+    parts = [f'<table id="{html.escape(table_id)}" class="table">', "<thead><tr>"]
+    parts.extend(f"<th>{html.escape(h)}</th>" for h in headers)
+    parts.append("</tr></thead><tbody>")
+    for row in data:
+        if len(row) == 1 and len(headers) > 1:
+            value = html.escape(str(next(iter(row.values()))))
+            parts.append(f'<tr><td colspan="{len(headers)}">{value}</td></tr>')
+            continue
+        parts.append("<tr>")
+        for h in headers:
+            if h not in row:
+                continue
+            value = html.escape(str(row[h])).replace("\n", "<br>")
+            parts.append(f"<td>{value}</td>")
+        parts.append("</tr>")
+    parts.append("</tbody></table>")
+    return "".join(parts)
@@ -0,0 +1,318 @@
+# scraper/http_scraper.py
+import json
+import re
+from datetime import datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .utils import ensure_dir, finish_export, DEFAULT_PDF_WORKERS
+from .html_table import parse_options, parse_tables_html
+from .catalogue import best_match, require_match
+from . import metrics
+
+STATE_SELECT_IDS = ["sess_state_code", "selState", "state", "sess_state", "sel_state", "statecode"]
+APP_TOKEN_RES = [
+    re.compile(r"""id=["']app_token["'][^>]*value=["']([^"']*)["']""", re.I),
+    re.compile(r"""value=["']([^"']*)["'][^>]*id=["']app_token["']""", re.I),
+    re.compile(r"""app_token\s*[:=]\s*["']([^"']+)["']""", re.I),
+]
+
+
+class HttpCourtsScraper:
+    """
+    Browserless engine: replays the eCourts cause-list form submissions over one
+    pooled, keep-alive requests.Session and parses the returned HTML in-process.
+    Same generate_pdf_for_date interface and result shape as ECourtsScraper.
+    """
+    BASE_URL = "https://services.ecourts.gov.in/ecourtindia_v6/"
+    # ?p= routes used by the cause list page's own AJAX calls
+    PAGE_ROUTE = "cause_list/"
+    DISTRICT_ROUTE = "casestatus/fillDistrict"
+    COMPLEX_ROUTE = "casestatus/fillcomplex"
+    COURTS_ROUTE = "cause_list/fillCauseList"
+    SUBMIT_ROUTE = "cause_list/submitCauseList"
+    CAPTCHA_ROUTE = "vendor/securimage/securimage_show.php"
+
+    def __init__(self,
+                 download_dir="downloads",
+                 base_url=None,
+                 pool_size=4,
+                 timeout=30,
+                 retries=2,
+                 captcha_solver=None,
+                 session=None,
+                 search_index=None,
+                 metrics_recorder=None,
+                 catalogue=None,
+                 archive=None,
+                 pdf_workers=DEFAULT_PDF_WORKERS):
+        """
+        base_url: site root; point it at a local stand-in server for offline runs
+        pool_size: keep-alive connections kept per host
+        captcha_solver: optional callable(image_bytes) -> text for the cause list captcha;
+                        without it the captcha field is sent empty
+        session: optional requests.Session to share between engines
+        search_index: optional SearchIndex updated with every saved JSON (or archived listing)
+        metrics_recorder: optional MetricsRecorder receiving each run's timings
+        catalogue: optional CourtCatalogue; known district/complex lists are taken from it
+                   instead of the site, and lists fetched from the site are saved to it
+        archive: optional ArchiveStore; rows are stored there and the PDF/JSON/CSV files are
+                 generated into its export directory instead of download_dir
+        pdf_workers: processes rendering each exported PDF (default 1); with more, lists longer
+                     than one render chunk are drawn in parallel (needs pypdf, and scripts need
+                     an if __name__ == "__main__" guard since the workers are spawned)
+        """
+        self.download_dir = download_dir
+        ensure_dir(download_dir)
+        self.search_index = search_index
+        self.metrics_recorder = metrics_recorder
+        self.last_metrics = None
+        self.base_url = (base_url or self.BASE_URL).rstrip("/") + "/"
+        self.timeout = timeout
+        self.captcha_solver = captcha_solver
+        self.session = session or self._build_session(pool_size, retries)
+        self.catalogue = catalogue
+        self.archive = archive
+        self.pdf_workers = pdf_workers
+        self.app_token = ""
+        self._states = None
+        self._districts = {}
+        self._complexes = {}
+        self._from_catalogue = set()
+
+    # ---------- Session ----------
+    @staticmethod
+    def _build_session(pool_size, retries):
+        session = requests.Session()
+        retry = Retry(total=retries, backoff_factor=0.5,
+                      status_forcelist=(500, 502, 503, 504),
+                      allowed_methods=frozenset(["GET", "POST"]))
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers.update({
+            "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120 Safari/537.36",
+            "X-Requested-With": "XMLHttpRequest",
+        })
+        return session
+
+    def _url(self, route):
+        return f"{self.base_url}?p={route}"
+
+    @staticmethod
+    def _note_response(route, resp):
+        run = metrics.current()
+        run.count("http_requests")
+        # urllib3 keeps the Retry object that produced the final response
+        retries = getattr(getattr(resp, "raw", None), "retries", None)
+        history = getattr(retries, "history", None)
+        if history:
+            run.event("retry", route=route, attempts=len(history))
+
+    def _post(self, route, data):
+        """
+        POST one AJAX form. The site answers JSON (and rotates app_token);
+        anything that isn't JSON is returned as raw HTML under 'html'.
+        """
+        payload = dict(data)
+        payload.setdefault("ajax_req", "true")
+        payload.setdefault("app_token", self.app_token)
+        try:
+            resp = self.session.post(self._url(route), data=payload, timeout=self.timeout)
+        except requests.Timeout:
+            metrics.event("timeout", route=route)
+            raise
+        self._note_response(route, resp)
+        resp.raise_for_status()
+        try:
+            body = resp.json()
+        except ValueError:
+            return {"html": resp.text}
+        if isinstance(body, dict) and body.get("app_token"):
+            self.app_token = body["app_token"]
+        return body if isinstance(body, dict) else {"html": json.dumps(body)}
+
+    # ---------- Form cascade ----------
+    def open_page(self):
+        """
+        Load the cause list page once: sets session cookies, app_token and the state list.
+        """
+        resp = self.session.get(self._url(self.PAGE_ROUTE), timeout=self.timeout)
+        self._note_response(self.PAGE_ROUTE, resp)
+        resp.raise_for_status()
+        page = resp.text
+        for rx in APP_TOKEN_RES:
+            m = rx.search(page)
+            if m:
+                self.app_token = m.group(1)
+                break
+        self._states = []
+        for sid in STATE_SELECT_IDS:
+            m = re.search(r"""<select[^>]*id=["']%s["'][^>]*>(.*?)</select>""" % re.escape(sid), page, re.S | re.I)
+            if m:
+                self._states = parse_options(m.group(1))
+                break
+        return page
+
+    def state_options(self):
+        if self._states is None:
+            self.open_page()
+        options = [(v, t) for v, t, disabled in self._states if v and not disabled]
+        if self.catalogue is not None and self.catalogue.learn_states(options):
+            self.catalogue.save()
+        return options
+
+    def district_options(self, state_code, live=False):
+        """(value, name) districts of a state; from the catalogue when it has them, unless live."""
+        key = ("district", state_code)
+        if live or state_code not in self._districts:
+            cached = None if live or self.catalogue is None else self.catalogue.districts(state_code)
+            if cached:
+                self._from_catalogue.add(key)
+                self._districts[state_code] = cached
+            else:
+                body = self._post(self.DISTRICT_ROUTE, {"state_code": state_code})
+                options = parse_options(body.get("dist_list") or body.get("html", ""))
+                self._districts[state_code] = [(v, t) for v, t, disabled in options if v and not disabled]
+                self._from_catalogue.discard(key)
+                if self.catalogue is not None and self.catalogue.learn_districts(state_code,
+                                                                                 self._districts[state_code]):
+                    self.catalogue.save()
+        return self._districts[state_code]
+
+    def complex_options(self, state_code, dist_code, live=False):
+        """(value, name) court complexes of a district; values look like '1150004@2,3,4@N'."""
+        key = ("complex", state_code, dist_code)
+        if live or (state_code, dist_code) not in self._complexes:
+            cached = None if live or self.catalogue is None else self.catalogue.complexes(state_code, dist_code)
+            if cached:
+                self._from_catalogue.add(key)
+                self._complexes[(state_code, dist_code)] = cached
+            else:
+                body = self._post(self.COMPLEX_ROUTE, {"state_code": state_code, "dist_code": dist_code})
+                options = parse_options(body.get("complex_list") or body.get("html", ""))
+                self._complexes[(state_code, dist_code)] = [(v, t) for v, t, disabled in options
+                                                            if v and not disabled]
+                self._from_catalogue.discard(key)
+                if self.catalogue is not None and self.catalogue.learn_complexes(
+                        state_code, dist_code, self._complexes[(state_code, dist_code)]):
+                    self.catalogue.save()
+        return self._complexes[(state_code, dist_code)]
+
+    # A name that only resembles an option raises NameNotFound (with the suggestion)
+    # instead of silently fetching another court's list.
+    def state_code(self, state):
+        hit = require_match(self.state_options(), state, "state")
+        return hit[0] if hit else None
+
+    def district_code(self, state_code, district):
+        options = self.district_options(state_code)
+        hit = best_match(options, district)
+        if hit is None and ("district", state_code) in self._from_catalogue:
+            # the catalogue may be stale: ask the site once
+            options = self.district_options(state_code, live=True)
+        hit = hit or require_match(options, district, "district")
+        return hit[0] if hit else None
+
+    def complex_code(self, state_code, dist_code, court_complex):
+        """
+        Returns (court_complex_code, est_code). Complex option values look like
+        '1150004@2,3,4@N': complex code, establishment codes, flag.
+        """
+        options = self.complex_options(state_code, dist_code)
+        hit = best_match(options, court_complex)
+        if hit is None and ("complex", state_code, dist_code) in self._from_catalogue:
+            options = self.complex_options(state_code, dist_code, live=True)
+        hit = hit or require_match(options, court_complex, "court complex")
+        if not hit:
+            return None, None
+        parts = hit[0].split("@")
+        return parts[0], (parts[1] if len(parts) > 1 else "")
+
+    def court_options(self, state_code, dist_code, complex_code, est_code):
+        body = self._post(self.COURTS_ROUTE, {
+            "state_code": state_code,
+            "dist_code": dist_code,
+            "court_complex_code": complex_code,
+            "est_code": est_code,
+        })
+        options = parse_options(body.get("cause_list") or body.get("html", ""))
+        # disabled options are establishment headings, not courts
+        return [(v, t) for v, t, disabled in options if v and not disabled and v.upper() != "D"]
+
+    def _captcha_code(self):
+        if not self.captcha_solver:
+            return ""
+        resp = self.session.get(f"{self.base_url}{self.CAPTCHA_ROUTE}", timeout=self.timeout)
+        self._note_response(self.CAPTCHA_ROUTE, resp)
+        resp.raise_for_status()
+        return self.captcha_solver(resp.content) or ""
+
+    # ---------- Scrape ----------
+    def fetch_cause_list(self, state, district, court_complex, date_str, case_types=("civ", "cri"), progress=None):
+        """
+        Submit the cause list form for every court in the complex and merge the rows.
+        date_str: YYYY-MM-DD
+        progress: optional callable(stage, rows), called with each court's rows as they arrive
+        """
+        with metrics.phase("resolve"):
+            st_code = self.state_code(state)
+            if not st_code:
+                return []
+            dist_code = self.district_code(st_code, district)
+            if not dist_code:
+                return []
+            complex_code, est_code = self.complex_code(st_code, dist_code, court_complex)
+            if not complex_code:
+                return []
+
+        causelist_date = datetime.strptime(date_str, "%Y-%m-%d").strftime("%d-%m-%Y")
+        data = []
+        with metrics.phase("courts"):
+            courts = self.court_options(st_code, dist_code, complex_code, est_code)
+        for court_no, court_name in courts:
+            for cicri in case_types:
+                with metrics.phase("submit"):
+                    body = self._post(self.SUBMIT_ROUTE, {
+                        "CL_court_no": court_no,
+                        "causelist_date": causelist_date,
+                        "cause_list_captcha_code": self._captcha_code(),
+                        "court_name_txt": court_name,
+                        "state_code": st_code,
+                        "dist_code": dist_code,
+                        "court_complex_code": complex_code,
+                        "est_code": est_code,
+                        "cicri": cicri,
+                        "selprevdays": "0",
+                    })
+                with metrics.phase("parse"):
+                    for rows in parse_tables_html(body.get("case_data") or body.get("html", "")):
+                        data.extend(rows)
+                        if progress is not None and rows:
+                            progress("parse", rows)
+        return data
+
+    def generate_pdf_for_date(self, state, district, court_complex, date_str, allow_manual_fill=True, delta=False,
+                              columnar=False, profile=None, progress=None):
+        """
+        Same contract as ECourtsScraper.generate_pdf_for_date. allow_manual_fill is
+        accepted for interface compatibility; there is no browser to fill by hand.
+        """
+        labels = {"state": state, "district": district, "court_complex": court_complex, "date": date_str}
+        with metrics.measure_run(self.metrics_recorder, "http", labels, profile) as run:
+            self.last_metrics = run
+            data = self.fetch_cause_list(state, district, court_complex, date_str, progress=progress)
+            run.count("rows", len(data))
+            if not data:
+                return {"pdf": None, "json": None, "csv": None, "data": []}
+            if progress is not None:
+                progress("export", None)
+            return finish_export(data, self, state, district, court_complex, date_str, delta, columnar)
+
+    def close(self):
+        try:
+            self.session.close()
+        except Exception:
+            pass
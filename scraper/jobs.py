@@ -0,0 +1,253 @@
+# scraper/jobs.py
+"""
+Background fetch jobs for the Streamlit app: a shared worker pool runs fetches while
+the UI polls job status, shows rows as they are parsed and serves the finished
+files from memory.
+"""
+import os
+import queue
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from .driver_service import DriverService, DEFAULT_DEBUG_PORT, DEFAULT_USER_DATA_DIR
+
+MIME_TYPES = {"pdf": "application/pdf", "csv": "text/csv", "json": "application/json"}
+
+
+class FetchJob:
+    """
+    One submitted fetch. Worker threads update it through progress()/finish()/fail();
+    readers take a consistent copy with snapshot().
+    """
+
+    def __init__(self, params, key=None):
+        self.id = uuid.uuid4().hex[:12]
+        self.key = key
+        self.params = dict(params)
+        self.status = "queued"  # queued -> running -> done | failed
+        self.stage = "queued"
+        self.rows = []
+        self.result = None
+        self.error = None
+        self.files = {}  # "pdf"/"csv"/"json" -> (file name, bytes, mime type)
+        self.info = {}
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self._lock = threading.Lock()
+
+    @property
+    def done(self):
+        return self.status in ("done", "failed")
+
+    def progress(self, stage, rows=None):
+        """Engine progress callback: the current step and any newly parsed rows."""
+        with self._lock:
+            self.stage = stage
+            if rows:
+                self.rows.extend(rows)
+
+    def start(self):
+        with self._lock:
+            self.status = "running"
+            self.stage = "starting"
+            self.started = time.time()
+
+    def finish(self, result):
+        # read the exports once here, so UI reruns never touch the disk
+        files = {}
+        for kind in ("pdf", "csv", "json"):
+            path = result.get(kind)
+            if path and os.path.exists(path):
+                with open(path, "rb") as f:
+                    files[kind] = (os.path.basename(path), f.read(), MIME_TYPES[kind])
+        with self._lock:
+            self.result = result
+            self.rows = list(result.get("data") or [])
+            self.files = files
+            self.status = "done"
+            self.stage = "done"
+            self.finished = time.time()
+
+    def fail(self, error):
+        with self._lock:
+            self.error = f"{type(error).__name__}: {error}"
+            self.status = "failed"
+            self.stage = "failed"
+            self.finished = time.time()
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "id": self.id,
+                "params": dict(self.params),
+                "status": self.status,
+                "stage": self.stage,
+                "rows": list(self.rows),
+                "error": self.error,
+                "files": dict(self.files),
+                "info": dict(self.info),
+                "elapsed": (self.finished or time.time()) - (self.started or self.created),
+            }
+
+
+class JobManager:
+    """
+    Thread pool shared by every user of the app (keep one per process, e.g. in
+    st.cache_resource). Each running job holds a slot number in range(max_workers),
+    so the runner can give concurrent jobs separate browser sessions.
+    Submitting a fetch that is already queued or running returns that job instead.
+    """
+
+    def __init__(self, runner, max_workers=2, keep=200):
+        """
+        runner: callable(job, slot) -> result dict; report progress via job.progress
+        keep: finished jobs remembered for polling before the oldest are dropped
+        """
+        self.runner = runner
+        self.max_workers = max(1, int(max_workers))
+        self.keep = keep
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="fetch")
+        self._slots = queue.Queue()
+        for slot in range(self.max_workers):
+            self._slots.put(slot)
+        self._jobs = {}
+        self._active = {}  # key -> job
+        self._lock = threading.Lock()
+
+    def submit(self, params, key=None):
+        """Queue a fetch; returns its FetchJob (an in-flight one when key matches)."""
+        with self._lock:
+            if key is not None:
+                running = self._active.get(key)
+                if running is not None and not running.done:
+                    return running
+            job = FetchJob(params, key=key)
+            self._jobs[job.id] = job
+            if key is not None:
+                self._active[key] = job
+            self._prune()
+        self._pool.submit(self._run, job)
+        return job
+
+    def _run(self, job):
+        slot = self._slots.get()
+        try:
+            job.start()
+            job.finish(self.runner(job, slot))
+        except Exception as e:
+            job.fail(e)
+        finally:
+            self._slots.put(slot)
+            with self._lock:
+                if job.key is not None and self._active.get(job.key) is job:
+                    del self._active[job.key]
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self):
+        with self._lock:
+            return list(self._jobs.values())
+
+    def _prune(self):
+        finished = [j for j in self._jobs.values() if j.done]
+        for job in sorted(finished, key=lambda j: j.finished)[:max(0, len(finished) - self.keep)]:
+            del self._jobs[job.id]
+
+    def shutdown(self, wait=False):
+        self._pool.shutdown(wait=wait)
+
+
+class CauseListFetcher:
+    """
+    JobManager runner for the eCourts flow: result cache first, then an ECourtsScraper
+    on the slot's own warm Chrome session (one DriverService per slot and mode, on its
+    own debug port), then the district court fallback when nothing was scraped.
+    Job params: state, district, court_complex, date_str, and optionally
+    allow_manual_fill, refresh, headless, block_resources.
+    """
+
+    def __init__(self, download_dir="downloads", cache=None, search_index=None, metrics_recorder=None,
+                 fallback=True, base_debug_port=DEFAULT_DEBUG_PORT, user_data_dir=DEFAULT_USER_DATA_DIR,
+                 archive=None):
+        self.download_dir = download_dir
+        self.cache = cache
+        self.archive = archive
+        self.search_index = search_index
+        self.metrics_recorder = metrics_recorder
+        self.fallback = fallback
+        self.base_debug_port = base_debug_port
+        self.user_data_dir = user_data_dir
+        self._services = {}
+        self._lock = threading.Lock()
+
+    def service(self, slot, headless=False, block_resources=False):
+        key = (slot, bool(headless), bool(block_resources))
+        with self._lock:
+            svc = self._services.get(key)
+            if svc is None:
+                # slot 0 keeps the usual port and profile, so a Chrome the user started is reused
+                svc = DriverService(debug_port=self.base_debug_port + slot,
+                                    user_data_dir=self.user_data_dir if slot == 0 else f"{self.user_data_dir}-{slot}",
+                                    headless=headless, block_resources=block_resources)
+                self._services[key] = svc
+            return svc
+
+    def __call__(self, job, slot):
+        from .ecourts_scraper import ECourtsScraper
+        from .result_cache import ResultCache, CachedScraper
+
+        p = job.params
+        with self._lock:
+            if self.cache is None:
+                self.cache = ResultCache()
+        service = self.service(slot, p.get("headless", False), p.get("block_resources", False))
+        cached = CachedScraper(
+            lambda: ECourtsScraper(download_dir=self.download_dir, driver_service=service,
+                                   search_index=self.search_index, metrics_recorder=self.metrics_recorder,
+                                   archive=self.archive),
+            cache=self.cache,
+            download_dir=self.download_dir,
+            archive=self.archive,
+        )
+        try:
+            result = cached.generate_pdf_for_date(
+                p["state"], p["district"], p["court_complex"], p["date_str"],
+                allow_manual_fill=p.get("allow_manual_fill", True),
+                refresh=p.get("refresh", False),
+                progress=job.progress,
+            )
+            job.info["cache_hit"] = cached.last_hit
+            run = getattr(cached.scraper, "last_metrics", None)
+            if run is not None:
+                job.info["metrics"] = run.to_dict()
+        finally:
+            cached.close()
+
+        if not result.get("data") and self.fallback:
+            from .dcourts_scraper import DCourtsScraper
+
+            job.progress("fallback")
+            fallback = DCourtsScraper(download_dir=self.download_dir)
+            try:
+                pdf_path, data = fallback.download_all_for_date(p["date_str"], district=p["district"])
+            except Exception as e:
+                # an unreachable district site leaves the (empty) primary result standing
+                pdf_path, data = None, []
+                job.info["fallback_error"] = f"{type(e).__name__}: {e}"
+            finally:
+                fallback.close()
+            job.info["fallback"] = True
+            job.info["documents"] = len(fallback.last_documents)
+            result = {"pdf": pdf_path, "json": None, "csv": None, "data": data}
+        return result
+
+    def shutdown(self):
+        with self._lock:
+            for svc in self._services.values():
+                svc.shutdown()
+            self._services.clear()
@@ -0,0 +1,290 @@
+# scraper/metrics.py
+import contextvars
+import cProfile
+import json
+import os
+import threading
+import time
+import uuid
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+
+from .utils import ensure_dir, DEFAULT_CACHE_DIR
+
+DEFAULT_LOG_PATH = os.path.join(DEFAULT_CACHE_DIR, "metrics.jsonl")
+DEFAULT_PROM_PATH = os.path.join(DEFAULT_CACHE_DIR, "metrics.prom")
+DEFAULT_PROFILE_DIR = os.path.join(DEFAULT_CACHE_DIR, "profiles")
+
+_current = contextvars.ContextVar("ecourts_run_metrics", default=None)
+
+
+class RunMetrics:
+    """
+    Everything measured during one generate_pdf_for_date call: wall time per phase
+    (nested phases are recorded under their own dotted name), WebDriver commands,
+    counters such as rows, and notable events (retries, timeouts, fallbacks).
+    """
+
+    def __init__(self, engine, labels=None, profile=None):
+        """
+        profile: True or a .prof path to run the whole call under cProfile.
+        """
+        self.run_id = uuid.uuid4().hex[:12]
+        self.engine = engine
+        self.labels = dict(labels or {})
+        self.phases = defaultdict(float)
+        self.webdriver_calls = Counter()
+        self.webdriver_seconds = 0.0
+        self.counters = Counter()
+        self.events = []
+        self.status = "ok"
+        self.error = None
+        self.started_at = None
+        self.duration = None
+        self.profile_path = None
+        if profile:
+            self.profile_path = profile if isinstance(profile, str) else os.path.join(
+                DEFAULT_PROFILE_DIR, f"{engine}_{self.run_id}.prof")
+        self._profiler = None
+        self._t0 = None
+        self._token = None
+        self._stack = []
+
+    # ---------- Recording ----------
+    @contextmanager
+    def phase(self, name):
+        full = ".".join(self._stack + [name])
+        self._stack.append(name)
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[full] += time.perf_counter() - t0
+            self._stack.pop()
+
+    def count(self, name, n=1):
+        self.counters[name] += n
+
+    def event(self, kind, **fields):
+        self.events.append(dict(fields, kind=kind, t=round(time.perf_counter() - (self._t0 or 0), 3)))
+
+    # ---------- Lifecycle ----------
+    def start(self):
+        self.started_at = datetime.now().isoformat(timespec="milliseconds")
+        self._t0 = time.perf_counter()
+        self._token = _current.set(self)
+        if self.profile_path:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        return self
+
+    def finish(self, error=None):
+        if self._profiler is not None:
+            self._profiler.disable()
+            ensure_dir(os.path.dirname(self.profile_path) or ".")
+            self._profiler.dump_stats(self.profile_path)
+            self._profiler = None
+        self.duration = time.perf_counter() - self._t0
+        if error is not None:
+            self.status = "error"
+            self.error = f"{type(error).__name__}: {error}"
+        if self._token is not None:
+            _current.reset(self._token)
+            self._token = None
+        return self
+
+    def to_dict(self):
+        return {
+            "run_id": self.run_id,
+            "engine": self.engine,
+            "labels": self.labels,
+            "started_at": self.started_at,
+            "status": self.status,
+            "error": self.error,
+            "duration_s": round(self.duration or 0.0, 4),
+            "phases_s": {k: round(v, 4) for k, v in self.phases.items()},
+            "webdriver_calls": dict(self.webdriver_calls),
+            "webdriver_s": round(self.webdriver_seconds, 4),
+            "counters": dict(self.counters),
+            "events": self.events,
+            "profile": self.profile_path,
+        }
+
+
+class _NullRun:
+    """Stand-in when no run is being measured; every call is a no-op."""
+
+    @contextmanager
+    def phase(self, name):
+        yield
+
+    def count(self, name, n=1):
+        pass
+
+    def event(self, kind, **fields):
+        pass
+
+
+_NULL_RUN = _NullRun()
+
+
+def current():
+    """The RunMetrics active in this thread/context, or a no-op recorder."""
+    return _current.get() or _NULL_RUN
+
+
+def phase(name):
+    """Time a block against the active run, e.g. `with metrics.phase("export.pdf"):`."""
+    return current().phase(name)
+
+
+def event(kind, **fields):
+    current().event(kind, **fields)
+
+
+@contextmanager
+def watch_driver(driver, run):
+    """
+    Count every WebDriver command (get, executeScript, findElement, ...) sent while the
+    block runs. WebDriver.execute is wrapped on this instance only and restored afterwards,
+    so a shared warm session is left untouched.
+    """
+    if driver is None or run is None:
+        yield
+        return
+    original = driver.execute
+
+    def execute(driver_command, params=None):
+        t0 = time.perf_counter()
+        try:
+            return original(driver_command, params)
+        finally:
+            run.webdriver_calls[driver_command] += 1
+            run.webdriver_seconds += time.perf_counter() - t0
+
+    driver.execute = execute
+    try:
+        yield
+    finally:
+        try:
+            del driver.execute
+        except AttributeError:
+            driver.execute = original
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels):
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+class MetricsRecorder:
+    """
+    Collects finished runs: appends each one as a JSON line to log_path and rewrites a
+    Prometheus textfile (node_exporter textfile-collector format) with running totals.
+    Thread-safe; share one instance between scrapers.
+    """
+
+    def __init__(self, log_path=DEFAULT_LOG_PATH, prom_path=DEFAULT_PROM_PATH):
+        self.log_path = log_path
+        self.prom_path = prom_path
+        self._lock = threading.Lock()
+        self.runs = Counter()
+        self.run_seconds = defaultdict(float)
+        self.phase_seconds = defaultdict(float)
+        self.phase_count = Counter()
+        self.webdriver_calls = Counter()
+        self.counters = Counter()
+        self.events = Counter()
+        self.last_run = {}
+
+    def run(self, engine, labels=None, profile=None):
+        """Context manager yielding a started RunMetrics that is recorded on exit."""
+        return _recording(self, engine, labels, profile)
+
+    def record(self, run):
+        data = run.to_dict()
+        with self._lock:
+            self.runs[(run.engine, run.status)] += 1
+            self.run_seconds[run.engine] += run.duration or 0.0
+            for name, secs in run.phases.items():
+                self.phase_seconds[(run.engine, name)] += secs
+                self.phase_count[(run.engine, name)] += 1
+            for cmd, n in run.webdriver_calls.items():
+                self.webdriver_calls[(run.engine, cmd)] += n
+            for name, n in run.counters.items():
+                self.counters[(run.engine, name)] += n
+            for ev in run.events:
+                self.events[(run.engine, ev["kind"])] += 1
+            self.last_run[run.engine] = time.time()
+            if self.log_path:
+                ensure_dir(os.path.dirname(self.log_path) or ".")
+                with open(self.log_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(data, ensure_ascii=False) + "\n")
+            if self.prom_path:
+                self._write_prometheus()
+        return data
+
+    def prometheus_text(self):
+        lines = [
+            "# HELP ecourts_runs_total Scrape runs by engine and outcome.",
+            "# TYPE ecourts_runs_total counter",
+        ]
+        lines += [f"ecourts_runs_total{_labels(engine=e, status=s)} {n}" for (e, s), n in sorted(self.runs.items())]
+        lines += ["# HELP ecourts_run_seconds_total Wall time spent in runs.",
+                  "# TYPE ecourts_run_seconds_total counter"]
+        lines += [f"ecourts_run_seconds_total{_labels(engine=e)} {v:.6f}" for e, v in sorted(self.run_seconds.items())]
+        lines += ["# HELP ecourts_phase_seconds Time per pipeline phase.",
+                  "# TYPE ecourts_phase_seconds summary"]
+        for (e, p), v in sorted(self.phase_seconds.items()):
+            lines.append(f"ecourts_phase_seconds_sum{_labels(engine=e, phase=p)} {v:.6f}")
+            lines.append(f"ecourts_phase_seconds_count{_labels(engine=e, phase=p)} {self.phase_count[(e, p)]}")
+        lines += ["# HELP ecourts_webdriver_calls_total WebDriver commands sent.",
+                  "# TYPE ecourts_webdriver_calls_total counter"]
+        lines += [f"ecourts_webdriver_calls_total{_labels(engine=e, command=c)} {n}"
+                  for (e, c), n in sorted(self.webdriver_calls.items())]
+        lines += ["# HELP ecourts_items_total Counted items (rows scraped, requests sent, ...).",
+                  "# TYPE ecourts_items_total counter"]
+        lines += [f"ecourts_items_total{_labels(engine=e, item=k)} {n}" for (e, k), n in sorted(self.counters.items())]
+        lines += ["# HELP ecourts_events_total Retries, timeouts and fallbacks.",
+                  "# TYPE ecourts_events_total counter"]
+        lines += [f"ecourts_events_total{_labels(engine=e, event=k)} {n}" for (e, k), n in sorted(self.events.items())]
+        lines += ["# HELP ecourts_last_run_timestamp_seconds Unix time of the last recorded run.",
+                  "# TYPE ecourts_last_run_timestamp_seconds gauge"]
+        lines += [f"ecourts_last_run_timestamp_seconds{_labels(engine=e)} {t:.3f}"
+                  for e, t in sorted(self.last_run.items())]
+        return "\n".join(lines) + "\n"
+
+    def _write_prometheus(self):
+        # write-then-rename so a collector never reads a half-written file
+        ensure_dir(os.path.dirname(self.prom_path) or ".")
+        tmp = f"{self.prom_path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self.prometheus_text())
+        os.replace(tmp, self.prom_path)
+
+
+@contextmanager
+def _recording(recorder, engine, labels, profile):
+    run = RunMetrics(engine, labels=labels, profile=profile).start()
+    error = None
+    try:
+        yield run
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        run.finish(error)
+        if recorder is not None:
+            recorder.record(run)
+
+
+def measure_run(recorder, engine, labels=None, profile=None):
+    """
+    Measure one run; recorder may be None, in which case the RunMetrics is only
+    kept in memory (engines expose it as last_metrics).
+    """
+    return _recording(recorder, engine, labels, profile)
@@ -0,0 +1,287 @@
+# scraper/models.py
+import json
+import os
+import re
+import struct
+import sys
+from array import array
+
+from .utils import ensure_dir, export_basename
+
+CASE_RE = re.compile(r"^(?:View\s*)?(?P<type>.+?)\s*/\s*(?P<number>\d+)\s*/\s*(?P<year>\d{4})$")
+VERSUS_RE = re.compile(r"\n\s*(?:versus|vs\.?|v/s\.?)\s*\n", re.I)
+BLANK_LINE_RE = re.compile(r"\n\s*\n")
+
+# header substrings used to find each column in a scraped row
+COLUMN_HINTS = {
+    "sr_no": ("sr",),
+    "case": ("case",),
+    "party": ("party", "parties"),
+    "advocate": ("advocate",),
+}
+
+STR_FIELDS = ("stage", "case_type", "case_text", "petitioner", "respondent",
+              "petitioner_advocate", "respondent_advocate")
+INT_FIELDS = ("sr_no", "case_number", "case_year")
+MISSING = -1  # stored for absent integers
+
+COLUMNAR_MAGIC = b"ECCL1\n"
+
+
+class CauseListEntry:
+    """
+    One listed case. Section headings of the scraped table ('Hearing', 'Evidence', ...)
+    become the stage of the rows that follow them.
+    """
+    __slots__ = ("stage", "sr_no", "case_type", "case_number", "case_year", "case_text",
+                 "petitioner", "respondent", "petitioner_advocate", "respondent_advocate")
+
+    def __init__(self, stage="", sr_no=None, case_type="", case_number=None, case_year=None, case_text="",
+                 petitioner="", respondent="", petitioner_advocate="", respondent_advocate=""):
+        self.stage = stage
+        self.sr_no = sr_no
+        self.case_type = case_type
+        self.case_number = case_number
+        self.case_year = case_year
+        self.case_text = case_text
+        self.petitioner = petitioner
+        self.respondent = respondent
+        self.petitioner_advocate = petitioner_advocate
+        self.respondent_advocate = respondent_advocate
+
+    @property
+    def case_id(self):
+        """'S.C.C./35/2022' style key, or the raw case text when it didn't parse."""
+        if self.case_type and self.case_number is not None and self.case_year is not None:
+            return f"{self.case_type}/{self.case_number}/{self.case_year}"
+        return self.case_text
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __eq__(self, other):
+        return isinstance(other, CauseListEntry) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        return f"CauseListEntry({self.sr_no!r}, {self.case_id!r}, stage={self.stage!r})"
+
+
+def _to_int(value):
+    value = (value or "").strip()
+    return int(value) if value.isdigit() else None
+
+
+def parse_case(text):
+    """
+    'ViewS.C.C./35/2022' -> ('S.C.C.', 35, 2022, 'S.C.C./35/2022').
+    Unparseable text comes back as ('', None, None, cleaned text).
+    """
+    text = " ".join((text or "").split())
+    m = CASE_RE.match(text)
+    if not m:
+        return "", None, None, text[4:] if text.startswith("View") else text
+    case_type = m.group("type").strip()
+    return case_type, int(m.group("number")), int(m.group("year")), f"{case_type}/{m.group('number')}/{m.group('year')}"
+
+
+def split_parties(text):
+    """'A\\nversus\\nB' -> ('A', 'B'); no separator -> (text, '')."""
+    parts = VERSUS_RE.split((text or "").strip(), maxsplit=1)
+    if len(parts) == 2:
+        return " ".join(parts[0].split()), " ".join(parts[1].split())
+    return " ".join((text or "").split()), ""
+
+
+def split_advocates(text):
+    """Petitioner and respondent advocates are separated by a blank line."""
+    parts = BLANK_LINE_RE.split((text or "").strip(), maxsplit=1)
+    if len(parts) == 2:
+        return " ".join(parts[0].split()), " ".join(parts[1].split())
+    return " ".join((text or "").split()), ""
+
+
+def _find_columns(headers):
+    cols = {}
+    for field, hints in COLUMN_HINTS.items():
+        for h in headers:
+            if any(hint in h.lower() for hint in hints):
+                cols[field] = h
+                break
+    return cols
+
+
+def normalize_rows(rows):
+    """
+    Turn parse_table output into a CauseList: junk rows dropped, section headings
+    folded into stage, case type/number/year and parties/advocates split out.
+    """
+    out = CauseList()
+    stage = ""
+    cols = {}
+    for row in rows:
+        if len(row) > 1 or not cols:
+            cols = _find_columns(row.keys()) or cols
+        values = [v for v in row.values() if (v or "").strip()]
+        if not values:
+            continue
+        if len(row) == 1 or (len(values) == 1 and _to_int(values[0]) is None):
+            # a heading row such as {"Sr No": "Hearing"}
+            stage = " ".join(values[0].split())
+            continue
+        case_type, case_number, case_year, case_text = parse_case(row.get(cols.get("case"), ""))
+        petitioner, respondent = split_parties(row.get(cols.get("party"), ""))
+        pet_adv, resp_adv = split_advocates(row.get(cols.get("advocate"), ""))
+        out.append(CauseListEntry(
+            stage=stage,
+            sr_no=_to_int(row.get(cols.get("sr_no"), "")),
+            case_type=case_type,
+            case_number=case_number,
+            case_year=case_year,
+            case_text=case_text,
+            petitioner=petitioner,
+            respondent=respondent,
+            petitioner_advocate=pet_adv,
+            respondent_advocate=resp_adv,
+        ))
+    return out
+
+
+class CauseList:
+    """
+    Column store of CauseListEntry records. Strings are interned into one pool and
+    kept as array('I') indexes, integers as array('i'), so a long list costs a few
+    bytes per field instead of a dict per row. Indexing materializes an entry.
+    """
+
+    def __init__(self):
+        self.pool = [""]
+        self._pool_index = {"": 0}
+        self.columns = {name: array("I") for name in STR_FIELDS}
+        self.columns.update({name: array("i") for name in INT_FIELDS})
+
+    def _intern(self, value):
+        value = value or ""
+        idx = self._pool_index.get(value)
+        if idx is None:
+            idx = len(self.pool)
+            self.pool.append(value)
+            self._pool_index[value] = idx
+        return idx
+
+    def append(self, entry):
+        for name in STR_FIELDS:
+            self.columns[name].append(self._intern(getattr(entry, name)))
+        for name in INT_FIELDS:
+            value = getattr(entry, name)
+            self.columns[name].append(MISSING if value is None else value)
+
+    def extend(self, entries):
+        for entry in entries:
+            self.append(entry)
+
+    def __len__(self):
+        return len(self.columns["stage"])
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        kwargs = {name: self.pool[self.columns[name][i]] for name in STR_FIELDS}
+        for name in INT_FIELDS:
+            value = self.columns[name][i]
+            kwargs[name] = None if value == MISSING else value
+        return CauseListEntry(**kwargs)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def column(self, name):
+        """Decoded values of one field, without building entries."""
+        if name in INT_FIELDS:
+            return [None if v == MISSING else v for v in self.columns[name]]
+        return [self.pool[i] for i in self.columns[name]]
+
+    def filter(self, **equals):
+        """
+        Entries whose fields equal the given values, e.g. filter(case_type="S.C.C.", case_year=2022).
+        Compares pool indexes / raw ints, so no strings are rebuilt.
+        """
+        tests = []
+        for name, value in equals.items():
+            if name in STR_FIELDS:
+                idx = self._pool_index.get(value)
+                if idx is None:
+                    return CauseList()
+                tests.append((self.columns[name], idx))
+            elif name in INT_FIELDS:
+                tests.append((self.columns[name], MISSING if value is None else value))
+            else:
+                raise KeyError(name)
+        out = CauseList()
+        for i in range(len(self)):
+            if all(col[i] == want for col, want in tests):
+                out.append(self[i])
+        return out
+
+    def to_rows(self):
+        return [entry.to_dict() for entry in self]
+
+    # ---------- Columnar file ----------
+    def save(self, out_path):
+        """
+        Columnar file: magic, 4-byte header length, JSON header (row count, string pool,
+        column layout), then each column's raw little-endian array bytes.
+        """
+        ensure_dir(os.path.dirname(out_path))
+        layout = []
+        blobs = []
+        offset = 0
+        for name, col in self.columns.items():
+            data = col
+            if sys.byteorder != "little":
+                data = array(col.typecode, col)
+                data.byteswap()
+            blob = data.tobytes()
+            layout.append({"name": name, "typecode": col.typecode, "offset": offset, "length": len(blob)})
+            blobs.append(blob)
+            offset += len(blob)
+        header = json.dumps({"rows": len(self), "pool": self.pool, "columns": layout},
+                            ensure_ascii=False).encode("utf-8")
+        with open(out_path, "wb") as f:
+            f.write(COLUMNAR_MAGIC)
+            f.write(struct.pack("<I", len(header)))
+            f.write(header)
+            for blob in blobs:
+                f.write(blob)
+        return out_path
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            if f.read(len(COLUMNAR_MAGIC)) != COLUMNAR_MAGIC:
+                raise ValueError(f"{path} is not a cause list columnar file")
+            (header_len,) = struct.unpack("<I", f.read(4))
+            header = json.loads(f.read(header_len).decode("utf-8"))
+            body = f.read()
+        out = cls()
+        out.pool = header["pool"]
+        out._pool_index = {s: i for i, s in enumerate(out.pool)}
+        for spec in header["columns"]:
+            col = array(spec["typecode"])
+            col.frombytes(body[spec["offset"]:spec["offset"] + spec["length"]])
+            if sys.byteorder != "little":
+                col.byteswap()
+            out.columns[spec["name"]] = col
+        return out
+
+    @classmethod
+    def from_rows(cls, rows):
+        return normalize_rows(rows)
+
+
+def save_columnar(data, download_dir, state, district, court_complex, date_str):
+    """
+    Normalize scraped rows and write them next to the other exports as <name>.ccl.
+    """
+    out_path = os.path.join(download_dir, f"{export_basename(state, district, court_complex, date_str)}.ccl")
+    return normalize_rows(data).save(out_path)
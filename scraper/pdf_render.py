@@ -0,0 +1,329 @@
+# scraper/pdf_render.py
+import itertools
+import multiprocessing
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from functools import lru_cache
+
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfgen import canvas
+
+from .utils import ensure_dir, column_order
+
+BODY_FONT = "Helvetica"
+HEADER_FONT = "Helvetica-Bold"
+BODY_SIZE = 8
+HEADER_SIZE = 8.5
+LEADING = 10
+CELL_PAD = 3
+MARGIN_X = 40
+MARGIN_TOP = 60
+MARGIN_BOTTOM = 50
+MIN_COL_WIDTH = 36
+SAMPLE_ROWS = 500  # rows measured to size columns
+
+
+@lru_cache(maxsize=65536)
+def text_width(text, font=BODY_FONT, size=BODY_SIZE):
+    """Rendered width of text in points (memoized; cell values repeat a lot)."""
+    return stringWidth(text, font, size)
+
+
+def _break_word(word, width, font, size):
+    # split a word that is wider than the column on character boundaries
+    parts, current = [], ""
+    for ch in word:
+        if current and text_width(current + ch, font, size) > width:
+            parts.append(current)
+            current = ch
+        else:
+            current += ch
+    if current:
+        parts.append(current)
+    return parts
+
+
+def wrap_text(text, width, font=BODY_FONT, size=BODY_SIZE):
+    """
+    Word-wrap text to width points. Explicit newlines (e.g. 'A\\nversus\\nB') are kept;
+    blank lines inside a value collapse to one break.
+    """
+    lines = []
+    for para in str(text).split("\n"):
+        para = " ".join(para.split())
+        if not para:
+            continue
+        if text_width(para, font, size) <= width:
+            lines.append(para)
+            continue
+        current = ""
+        for word in para.split(" "):
+            candidate = f"{current} {word}" if current else word
+            if text_width(candidate, font, size) <= width:
+                current = candidate
+                continue
+            if current:
+                lines.append(current)
+            if text_width(word, font, size) <= width:
+                current = word
+            else:
+                pieces = _break_word(word, width, font, size)
+                lines.extend(pieces[:-1])
+                current = pieces[-1]
+        if current:
+            lines.append(current)
+    return lines
+
+
+def is_section_row(row, headers):
+    """A row with a single value (e.g. {"Sr No": "Hearing"}) is a stage heading spanning the table."""
+    return len(headers) > 1 and len(row) == 1
+
+
+def column_widths(headers, sample_rows, total_width, min_width=MIN_COL_WIDTH):
+    """
+    Size columns from their content: each column wants the width of its longest
+    header word and (roughly) its 90th percentile line. Columns that fit in an equal
+    share get their full width; the remaining space is split evenly among the wider
+    ones (water-filling), never going below min_width.
+    """
+    rows = [r for r in sample_rows if not is_section_row(r, headers)]
+    wants = []
+    for h in headers:
+        head = max((text_width(w, HEADER_FONT, HEADER_SIZE) for w in str(h).upper().split()), default=0)
+        widths = sorted(
+            max((text_width(ln, BODY_FONT, BODY_SIZE) for ln in str(row.get(h, "")).split("\n")), default=0)
+            for row in rows
+        )
+        body = widths[int(len(widths) * 0.9)] if widths else 0
+        wants.append(max(head, body, min_width) + 2 * CELL_PAD)
+
+    total_want = sum(wants)
+    if total_want <= total_width:
+        # spare room is shared in proportion to need
+        return [w * total_width / total_want for w in wants]
+    out = [0.0] * len(wants)
+    remaining = total_width
+    left = sorted(range(len(wants)), key=lambda i: wants[i])
+    while left:
+        share = remaining / len(left)
+        i = left[0]
+        if wants[i] <= share:
+            out[i] = wants[i]
+            remaining -= wants[i]
+            left.pop(0)
+        else:
+            for j in left:
+                out[j] = share
+            break
+    return out
+
+
+def _draw_title(c, title, width, y):
+    c.setFont("Helvetica-Bold", 16)
+    c.drawCentredString(width / 2.0, y, title)
+    y -= 24
+    c.setFont("Helvetica", 10)
+    c.drawCentredString(width / 2.0, y, f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    return y - 30
+
+
+class _TableCanvas:
+    """Draws rows page by page: wrapped cells, header repeated on each page, row rules."""
+
+    def __init__(self, out_path, title, headers, widths, show_title=True):
+        self.c = canvas.Canvas(out_path, pagesize=A4)
+        self.width, self.height = A4
+        self.headers = headers
+        self.widths = widths
+        self.title = title
+        self.y = self.height - MARGIN_TOP
+        self.pages = 1
+        self.header_lines = [wrap_text(str(h).upper(), w - 2 * CELL_PAD, HEADER_FONT, HEADER_SIZE)
+                             for h, w in zip(headers, widths)]
+        if show_title:
+            self.y = _draw_title(self.c, title, self.width, self.y)
+        self._draw_header()
+
+    def _draw_header(self):
+        self._draw_cells(self.header_lines, HEADER_FONT, HEADER_SIZE)
+        self.c.setLineWidth(0.8)
+        self.c.line(MARGIN_X, self.y + LEADING - 2, self.width - MARGIN_X, self.y + LEADING - 2)
+        self.y -= 4
+
+    def _draw_cells(self, cell_lines, font, size):
+        t = self.c.beginText()
+        t.setFont(font, size)
+        t.setLeading(LEADING)
+        x = MARGIN_X
+        for lines, w in zip(cell_lines, self.widths):
+            t.setTextOrigin(x + CELL_PAD, self.y)
+            for ln in lines:
+                t.textLine(ln)
+            x += w
+        self.c.drawText(t)
+        self.y -= LEADING * max(1, max((len(lines) for lines in cell_lines), default=1))
+
+    def _new_page(self):
+        self.c.showPage()
+        self.pages += 1
+        self.y = self.height - MARGIN_TOP
+        self._draw_header()
+
+    def add_section(self, text):
+        lines = wrap_text(text, self.width - 2 * MARGIN_X - 2 * CELL_PAD, HEADER_FONT, BODY_SIZE)
+        if not lines:
+            # empty spacer rows from the site carry nothing worth a line
+            return
+        if self.y - LEADING * (len(lines) + 1) < MARGIN_BOTTOM:
+            self._new_page()
+        self.y -= 2
+        t = self.c.beginText()
+        t.setFont(HEADER_FONT, BODY_SIZE)
+        t.setLeading(LEADING)
+        t.setTextOrigin(MARGIN_X + CELL_PAD, self.y)
+        for ln in lines:
+            t.textLine(ln)
+        self.c.drawText(t)
+        self.y -= LEADING * len(lines)
+        self.c.setLineWidth(0.25)
+        self.c.line(MARGIN_X, self.y + LEADING - 3, self.width - MARGIN_X, self.y + LEADING - 3)
+        self.y -= 4
+
+    def add_row(self, row):
+        if is_section_row(row, self.headers):
+            self.add_section(next(iter(row.values())))
+            return
+        cell_lines = [wrap_text(row.get(h, ""), w - 2 * CELL_PAD) for h, w in zip(self.headers, self.widths)]
+        page_lines = int((self.height - MARGIN_TOP - MARGIN_BOTTOM) // LEADING) - 4
+        tallest = max(1, max(len(lines) for lines in cell_lines))
+        if self.y - (LEADING * tallest + 4) < MARGIN_BOTTOM and tallest <= page_lines:
+            # a row that fits on one page is not split
+            self._new_page()
+        while True:
+            room = int((self.y - MARGIN_BOTTOM - 4) // LEADING)
+            if tallest <= room:
+                break
+            if room < 1:
+                self._new_page()
+                continue
+            # a cell taller than a page carries its remaining lines onto the next one
+            self._draw_cells([lines[:room] for lines in cell_lines], BODY_FONT, BODY_SIZE)
+            cell_lines = [lines[room:] for lines in cell_lines]
+            tallest = max(1, max(len(lines) for lines in cell_lines))
+            self._new_page()
+        self._draw_cells(cell_lines, BODY_FONT, BODY_SIZE)
+        self.c.setLineWidth(0.25)
+        self.c.line(MARGIN_X, self.y + LEADING - 3, self.width - MARGIN_X, self.y + LEADING - 3)
+        self.y -= 4
+
+    def save(self):
+        self.c.save()
+        return self.pages
+
+
+def _render_chunk(args):
+    """Process-pool worker: render one chunk of rows into its own PDF file."""
+    out_path, title, headers, widths, rows, show_title = args
+    table = _TableCanvas(out_path, title, headers, widths, show_title=show_title)
+    for row in rows:
+        table.add_row(row)
+    table.save()
+    return out_path
+
+
+def _chunk_result(fut, args):
+    # a chunk whose worker died (or that a broken pool refused) is drawn in this process
+    if fut is not None:
+        try:
+            return fut.result()
+        except BrokenProcessPool:
+            pass
+    return _render_chunk(args)
+
+
+def _merge_pdfs(parts, out_path):
+    from pypdf import PdfWriter
+
+    writer = PdfWriter()
+    for part in parts:
+        writer.append(part)
+    with open(out_path, "wb") as f:
+        writer.write(f)
+    writer.close()
+
+
+def _pypdf_available():
+    try:
+        import pypdf  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def render_pdf(rows, out_path, title="eCourts Cause List", headers=None, workers=1, chunk_rows=2000):
+    """
+    Render rows as a wrapped, content-sized table PDF.
+    rows: any iterable of dicts; headers default to first-seen column order (which reads rows into memory).
+    workers > 1: rows are cut into chunks of chunk_rows, each chunk is laid out and drawn
+                 in its own process and the parts are merged (needs the optional pypdf package;
+                 falls back to a single process without it). Every chunk starts a new page.
+                 Lists of at most chunk_rows rows are drawn in this process.
+    """
+    ensure_dir(os.path.dirname(out_path))
+    if headers is None:
+        rows = list(rows)
+        headers = column_order(rows)
+    rows = iter(rows)
+    # read past the first chunk: a list that fits in one is not worth starting a pool
+    head = list(itertools.islice(rows, max(SAMPLE_ROWS, chunk_rows + 1) if workers > 1 else SAMPLE_ROWS))
+    sample = head[:SAMPLE_ROWS]
+    rows = itertools.chain(head, rows)
+
+    if not headers:
+        c = canvas.Canvas(out_path, pagesize=A4)
+        width, height = A4
+        y = _draw_title(c, title, width, height - MARGIN_TOP)
+        c.setFont("Helvetica", 12)
+        c.drawString(MARGIN_X, y, "No data available.")
+        c.save()
+        return out_path
+
+    widths = column_widths(headers, sample, A4[0] - 2 * MARGIN_X)
+
+    if workers <= 1 or len(head) <= chunk_rows or not _pypdf_available():
+        _render_chunk((out_path, title, headers, widths, rows, True))
+        return out_path
+
+    tmp_dir = tempfile.mkdtemp(prefix="ecourts_pdf_")
+    try:
+        parts = []
+        # spawn, not fork: exports run on worker threads (batch pools, background jobs)
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            pending = []
+            broken = False
+            for i in itertools.count():
+                chunk = list(itertools.islice(rows, chunk_rows))
+                if not chunk:
+                    break
+                args = (os.path.join(tmp_dir, f"part{i:05d}.pdf"), title, headers, widths, chunk, i == 0)
+                fut = None
+                if not broken:
+                    try:
+                        fut = pool.submit(_render_chunk, args)
+                    except BrokenProcessPool:
+                        broken = True
+                pending.append((fut, args))
+                # bound the rows held in flight
+                if len(pending) >= workers * 2:
+                    parts.append(_chunk_result(*pending.pop(0)))
+            parts.extend(_chunk_result(fut, args) for fut, args in pending)
+        _merge_pdfs(parts, out_path)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    return out_path
@@ -0,0 +1,236 @@
+# scraper/result_cache.py
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import date, datetime
+
+from .utils import ensure_dir, export_basename, save_exports, DEFAULT_CACHE_DIR
+
+DEFAULT_CACHE_PATH = os.path.join(DEFAULT_CACHE_DIR, "results.sqlite3")
+
+
+def _is_past(date_str):
+    try:
+        return datetime.strptime(date_str, "%Y-%m-%d").date() < date.today()
+    except (TypeError, ValueError):
+        return False
+
+
+def cache_key(state, district, court_complex, date_str):
+    parts = [state, district, court_complex, date_str]
+    return "|".join(" ".join((p or "").split()).lower() for p in parts)
+
+
+class ResultCache:
+    """
+    SQLite cache of generate_pdf_for_date results keyed by (state, district, court_complex, date).
+    Past dates are effectively immutable (ttl_past=None never expires); today's and future
+    lists expire after ttl_today seconds. Least recently used entries are evicted once the
+    stored payloads exceed max_bytes. Hit/miss/eviction counters persist in the database.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl_today=15 * 60, ttl_past=None, max_bytes=256 * 1024 * 1024):
+        self.path = path
+        self.ttl_today = ttl_today
+        self.ttl_past = ttl_past
+        self.max_bytes = max_bytes
+        ensure_dir(os.path.dirname(path) or ".")
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS results (
+                key TEXT PRIMARY KEY,
+                date_str TEXT,
+                payload TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created REAL NOT NULL,
+                expires REAL,
+                last_access REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS results_last_access ON results(last_access);
+            CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL);
+        """)
+        self._conn.commit()
+
+    def _ttl_for(self, date_str):
+        return self.ttl_past if _is_past(date_str) else self.ttl_today
+
+    def _bump(self, name, n=1):
+        self._conn.execute(
+            "INSERT INTO counters(name, value) VALUES(?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value", (name, n))
+
+    def get(self, state, district, court_complex, date_str):
+        """
+        Cached result dict, or None on a miss or an expired entry.
+        """
+        key = cache_key(state, district, court_complex, date_str)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT payload, expires FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None or (row[1] is not None and row[1] <= now):
+                if row is not None:
+                    self._conn.execute("DELETE FROM results WHERE key = ?", (key,))
+                self._bump("misses")
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE results SET last_access = ? WHERE key = ?", (now, key))
+            self._bump("hits")
+            self._conn.commit()
+        return json.loads(row[0])
+
+    def put(self, state, district, court_complex, date_str, result, ttl=None):
+        """
+        Store a result. ttl overrides the date-based default (None = use default).
+        """
+        key = cache_key(state, district, court_complex, date_str)
+        payload = json.dumps(result, ensure_ascii=False)
+        now = time.time()
+        ttl = self._ttl_for(date_str) if ttl is None else ttl
+        expires = None if ttl is None else now + ttl
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results(key, date_str, payload, size, created, expires, last_access) "
+                "VALUES(?, ?, ?, ?, ?, ?, ?)",
+                (key, date_str, payload, len(payload.encode("utf-8")), now, expires, now))
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        self._conn.execute("DELETE FROM results WHERE expires IS NOT NULL AND expires <= ?", (time.time(),))
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        evicted = 0
+        for key, size in self._conn.execute("SELECT key, size FROM results ORDER BY last_access").fetchall():
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM results WHERE key = ?", (key,))
+            total -= size
+            evicted += 1
+        self._bump("evictions", evicted)
+
+    def invalidate(self, state, district, court_complex, date_str):
+        with self._lock:
+            self._conn.execute("DELETE FROM results WHERE key = ?",
+                               (cache_key(state, district, court_complex, date_str),))
+            self._conn.commit()
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self._conn.execute("SELECT name, value FROM counters").fetchall())
+            entries, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results").fetchone()
+        return {
+            "hits": counters.get("hits", 0),
+            "misses": counters.get("misses", 0),
+            "evictions": counters.get("evictions", 0),
+            "entries": entries,
+            "bytes": size,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class CachedScraper:
+    """
+    Cache layer in front of any engine's generate_pdf_for_date.
+    The engine (and its browser) is only created on a miss, so hits return without
+    opening Chrome. Exports already sitting in download_dir (or listings in the archive)
+    count as hits too: past dates always, today's while younger than the cache's ttl_today.
+    """
+
+    def __init__(self, scraper_factory, cache=None, download_dir="downloads", archive=None):
+        """
+        scraper_factory: zero-argument callable returning an engine, e.g.
+                         lambda: ECourtsScraper(download_dir="downloads")
+        archive: optional ArchiveStore the engine saves into; hits are exported from it
+        """
+        self.scraper_factory = scraper_factory
+        self.cache = cache or ResultCache()
+        self.download_dir = download_dir
+        self.archive = archive
+        self.scraper = None
+        self.last_hit = False
+
+    def _from_downloads(self, state, district, court_complex, date_str):
+        base = os.path.join(self.download_dir, export_basename(state, district, court_complex, date_str))
+        json_path = f"{base}.json"
+        ttl = self.cache._ttl_for(date_str)
+        if not os.path.exists(json_path):
+            return self._from_archive(state, district, court_complex, date_str, ttl)
+        if ttl is not None and time.time() - os.path.getmtime(json_path) > ttl:
+            return None
+        try:
+            with open(json_path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not data:
+            return None
+        pdf_path, csv_path = f"{base}.pdf", f"{base}.csv"
+        return {
+            "pdf": pdf_path if os.path.exists(pdf_path) else None,
+            "json": json_path,
+            "csv": csv_path if os.path.exists(csv_path) else None,
+            "data": data,
+        }
+
+    def _from_archive(self, state, district, court_complex, date_str, ttl):
+        if self.archive is None:
+            return None
+        info = self.archive.info(state, district, court_complex, date_str)
+        if info is None or not info["rows"] or (ttl is not None and time.time() - info["ts"] > ttl):
+            return None
+        return self.archive.export(state, district, court_complex, date_str)
+
+    def lookup(self, state, district, court_complex, date_str):
+        """
+        Cached result without touching the network, or None.
+        Missing export files are rewritten from the cached rows.
+        """
+        result = self.cache.get(state, district, court_complex, date_str)
+        if result is None:
+            result = self._from_downloads(state, district, court_complex, date_str)
+            if result is None:
+                return None
+            self.cache.put(state, district, court_complex, date_str, result)
+        if not all(result.get(k) and os.path.exists(result[k]) for k in ("pdf", "json", "csv")):
+            result = save_exports(result["data"], self.download_dir, state, district, court_complex, date_str,
+                                  archive=self.archive)
+            self.cache.put(state, district, court_complex, date_str, result)
+        return result
+
+    def generate_pdf_for_date(self, state, district, court_complex, date_str, allow_manual_fill=True,
+                              refresh=False, delta=False, progress=None):
+        """
+        Same contract as the wrapped engine. refresh=True skips the lookup and re-scrapes;
+        delta=True always re-scrapes too (a diff against the cache would be empty).
+        progress is handed to the engine on a miss.
+        Empty results are not cached (they are usually a failed or manual-fill run).
+        """
+        if not refresh and not delta:
+            hit = self.lookup(state, district, court_complex, date_str)
+            if hit is not None:
+                self.last_hit = True
+                return hit
+        self.last_hit = False
+        if self.scraper is None:
+            self.scraper = self.scraper_factory()
+        kwargs = {"delta": True} if delta else {}
+        if progress is not None:
+            kwargs["progress"] = progress
+        result = self.scraper.generate_pdf_for_date(state, district, court_complex, date_str,
+                                                    allow_manual_fill=allow_manual_fill, **kwargs)
+        if result.get("data"):
+            self.cache.put(state, district, court_complex, date_str, result)
+        return result
+
+    def close(self):
+        if self.scraper is not None:
+            self.scraper.close()
+            self.scraper = None
@@ -0,0 +1,269 @@
+# scraper/search_index.py
+import glob
+import json
+import os
+import re
+import sqlite3
+import threading
+
+from .utils import ensure_dir, DEFAULT_CACHE_DIR
+from .models import normalize_rows
+
+DEFAULT_INDEX_PATH = os.path.join(DEFAULT_CACHE_DIR, "search_index.sqlite3")
+FILENAME_RE = re.compile(r"^(?P<court>.+)_(?P<date>\d{4}-\d{2}-\d{2})\.json$")
+TOKEN_RE = re.compile(r"[0-9a-z]+")
+ARCHIVE_PREFIX = "archive:"  # files.path of listings indexed from an ArchiveStore
+
+# query field -> indexed fields
+FIELDS = {
+    "advocate": ("advocate",),
+    "party": ("party",),
+    "case": ("case",),
+    "court": ("court",),
+    None: ("advocate", "party", "case", "court"),
+}
+
+
+def tokenize(text):
+    return TOKEN_RE.findall((text or "").lower())
+
+
+def case_key(text):
+    """'S.C.C./35/2022' and 'scc 35 2022' both -> 'scc/35/2022'."""
+    m = re.match(r"^\s*(?:view\s*)?([a-z.\s()-]+?)[\s/]+(\d+)[\s/]+(\d{4})\s*$", (text or "").lower())
+    if not m:
+        return None
+    return f"{re.sub(r'[^0-9a-z]', '', m.group(1))}/{int(m.group(2))}/{m.group(3)}"
+
+
+class SearchIndex:
+    """
+    Incremental inverted index over the downloads/*_YYYY-MM-DD.json archive and,
+    through update_archive, the listings of an ArchiveStore. Terms from advocates,
+    parties, case numbers and the court name point at listing rows; files are
+    re-indexed only when their mtime changes, archive listings when a new version
+    is stored. A listing held by the archive is indexed from there, not from files.
+    """
+
+    def __init__(self, path=DEFAULT_INDEX_PATH):
+        self.path = path
+        ensure_dir(os.path.dirname(path) or ".")
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS files (
+                id INTEGER PRIMARY KEY,
+                path TEXT UNIQUE NOT NULL,
+                mtime REAL NOT NULL,
+                court TEXT,
+                date TEXT
+            );
+            CREATE INDEX IF NOT EXISTS files_date ON files(date);
+            CREATE TABLE IF NOT EXISTS entries (
+                id INTEGER PRIMARY KEY,
+                file_id INTEGER NOT NULL,
+                stage TEXT, sr_no INTEGER, case_id TEXT,
+                petitioner TEXT, respondent TEXT,
+                petitioner_advocate TEXT, respondent_advocate TEXT
+            );
+            CREATE INDEX IF NOT EXISTS entries_file ON entries(file_id);
+            CREATE TABLE IF NOT EXISTS postings (
+                term TEXT NOT NULL,
+                field TEXT NOT NULL,
+                entry_id INTEGER NOT NULL,
+                PRIMARY KEY (term, field, entry_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS postings_entry ON postings(entry_id);
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+        """)
+        self._conn.commit()
+
+    # ---------- Indexing ----------
+    def _remove_file(self, file_id):
+        self._conn.execute(
+            "DELETE FROM postings WHERE entry_id IN (SELECT id FROM entries WHERE file_id = ?)", (file_id,))
+        self._conn.execute("DELETE FROM entries WHERE file_id = ?", (file_id,))
+        self._conn.execute("DELETE FROM files WHERE id = ?", (file_id,))
+
+    def add_file(self, json_path, force=False):
+        """
+        Index one saved cause list JSON. Returns the number of rows indexed
+        (0 when the file is unchanged since it was last indexed).
+        """
+        path = os.path.abspath(json_path)
+        m = FILENAME_RE.match(os.path.basename(path))
+        if not m or not os.path.exists(path):
+            return 0
+        mtime = os.path.getmtime(path)
+        court, date_str = m.group("court"), m.group("date")
+        with self._lock:
+            row = self._conn.execute("SELECT id, mtime FROM files WHERE path = ?", (path,)).fetchone()
+            archived = self._conn.execute("SELECT 1 FROM files WHERE path = ?",
+                                          (f"{ARCHIVE_PREFIX}{court}_{date_str}",)).fetchone()
+        if archived or (row and row[1] == mtime and not force):
+            return 0  # unchanged or indexed from the archive: the file is not even opened
+        try:
+            with open(path, encoding="utf-8") as f:
+                rows = json.load(f)
+        except (OSError, ValueError):
+            return 0
+        if not isinstance(rows, list):
+            return 0
+        with self._lock:
+            return self._index_rows(path, mtime, court, date_str, rows)
+
+    def add_listing(self, court, date_str, rows, ts, force=False):
+        """
+        Index one archived listing (court: ArchiveStore court key, ts: when that version
+        was stored). Replaces any entries indexed from a file for the same court and date.
+        Returns the number of rows indexed (0 when that version is already indexed).
+        """
+        key = f"{ARCHIVE_PREFIX}{court}_{date_str}"
+        with self._lock:
+            row = self._conn.execute("SELECT mtime FROM files WHERE path = ?", (key,)).fetchone()
+            if row and row[0] == ts and not force:
+                return 0
+            for (file_id,) in self._conn.execute(
+                    "SELECT id FROM files WHERE court = ? AND date = ? AND path NOT LIKE ?",
+                    (court.replace("_", " "), date_str, ARCHIVE_PREFIX + "%")).fetchall():
+                self._remove_file(file_id)
+            return self._index_rows(key, ts, court, date_str, rows)
+
+    def _index_rows(self, path, mtime, court, date_str, rows):
+        # caller holds the lock
+        court_label = court.replace("_", " ")
+        row = self._conn.execute("SELECT id FROM files WHERE path = ?", (path,)).fetchone()
+        if row:
+            self._remove_file(row[0])
+        cur = self._conn.execute("INSERT INTO files(path, mtime, court, date) VALUES(?, ?, ?, ?)",
+                                 (path, mtime, court_label, date_str))
+        file_id = cur.lastrowid
+        postings = []
+        count = 0
+        for entry in normalize_rows(rows):
+            cur = self._conn.execute(
+                "INSERT INTO entries(file_id, stage, sr_no, case_id, petitioner, respondent, "
+                "petitioner_advocate, respondent_advocate) VALUES(?, ?, ?, ?, ?, ?, ?, ?)",
+                (file_id, entry.stage, entry.sr_no, entry.case_id, entry.petitioner, entry.respondent,
+                 entry.petitioner_advocate, entry.respondent_advocate))
+            entry_id = cur.lastrowid
+            terms = set()
+            for t in tokenize(entry.petitioner_advocate + " " + entry.respondent_advocate):
+                terms.add((t, "advocate"))
+            for t in tokenize(entry.petitioner + " " + entry.respondent):
+                terms.add((t, "party"))
+            for t in tokenize(entry.case_id):
+                terms.add((t, "case"))
+            key = case_key(entry.case_id)
+            if key:
+                terms.add((key, "case"))
+            for t in tokenize(court_label):
+                terms.add((t, "court"))
+            postings.extend((t, fld, entry_id) for t, fld in terms)
+            count += 1
+        self._conn.executemany("INSERT OR IGNORE INTO postings(term, field, entry_id) VALUES(?, ?, ?)", postings)
+        self._conn.commit()
+        return count
+
+    def update(self, download_dir="downloads"):
+        """
+        Bring the index in line with download_dir: new or modified JSON files are
+        (re)indexed, deleted ones dropped. Returns {"indexed": files, "removed": files}.
+        """
+        paths = {os.path.abspath(p) for p in glob.glob(os.path.join(download_dir, "*.json"))}
+        root = os.path.abspath(download_dir) + os.sep
+        indexed = 0
+        for p in sorted(paths):
+            if self.add_file(p):
+                indexed += 1
+        removed = 0
+        with self._lock:
+            for file_id, path in self._conn.execute("SELECT id, path FROM files").fetchall():
+                if path.startswith(root) and path not in paths:
+                    self._remove_file(file_id)
+                    removed += 1
+            self._conn.commit()
+        return {"indexed": indexed, "removed": removed}
+
+    def update_archive(self, archive):
+        """
+        Index the listings stored in an ArchiveStore since the last call (its position in
+        the archive's listings index is kept in the meta table). Archived listings survive
+        migrate(remove=True) and export pruning, which delete the files they came from.
+        Returns {"indexed": listings}.
+        """
+        key = f"{ARCHIVE_PREFIX}{os.path.abspath(archive.root)}"
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        end, changed = archive.changes(int(row[0]) if row else 0)
+        indexed = 0
+        for court, date_str, ts in changed:
+            rows = archive.get_key(court, date_str)
+            if rows is not None and self.add_listing(court, date_str, rows, ts):
+                indexed += 1
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO meta(key, value) VALUES(?, ?)", (key, str(end)))
+            self._conn.commit()
+        return {"indexed": indexed}
+
+    # ---------- Query ----------
+    @staticmethod
+    def _term_clause(term, fields, prefix):
+        marks = ",".join("?" * len(fields))
+        if prefix:
+            return (f"SELECT entry_id FROM postings WHERE term >= ? AND term < ? AND field IN ({marks})",
+                    [term, term + "\uffff", *fields])
+        return f"SELECT entry_id FROM postings WHERE term = ? AND field IN ({marks})", [term, *fields]
+
+    def search(self, query, field=None, court=None, date_from=None, date_to=None, limit=200):
+        """
+        Listings matching every word of query (the last word also as a prefix).
+        field: 'advocate', 'party', 'case', 'court' or None for all of them.
+        court: substring of the court name; date_from/date_to: inclusive YYYY-MM-DD bounds.
+        Results are newest first.
+        """
+        if field not in FIELDS:
+            raise ValueError(f"unknown field {field!r}")
+        fields = FIELDS[field]
+        key = case_key(query) if field in (None, "case") else None
+        terms = [key] if key else tokenize(query)
+        if not terms:
+            return []
+        # posting lists are intersected inside SQLite
+        clauses, args = [], []
+        for i, term in enumerate(terms):
+            clause, clause_args = self._term_clause(term, fields, prefix=(i == len(terms) - 1 and not key))
+            clauses.append(clause)
+            args.extend(clause_args)
+        sql = ("WITH hits(entry_id) AS (" + " INTERSECT ".join(clauses) + ") "
+               "SELECT f.court, f.date, e.stage, e.sr_no, e.case_id, e.petitioner, e.respondent, "
+               "e.petitioner_advocate, e.respondent_advocate, f.path "
+               "FROM hits JOIN entries e ON e.id = hits.entry_id JOIN files f ON f.id = e.file_id WHERE 1 = 1")
+        if court:
+            sql += " AND f.court LIKE ?"
+            args.append(f"%{court.replace('_', ' ')}%")
+        if date_from:
+            sql += " AND f.date >= ?"
+            args.append(date_from)
+        if date_to:
+            sql += " AND f.date <= ?"
+            args.append(date_to)
+        sql += " ORDER BY f.date DESC, f.court, e.sr_no LIMIT ?"
+        args.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, args).fetchall()
+        keys = ("court", "date", "stage", "sr_no", "case", "petitioner", "respondent",
+                "petitioner_advocate", "respondent_advocate", "json")
+        return [dict(zip(keys, r)) for r in rows]
+
+    def stats(self):
+        with self._lock:
+            files = self._conn.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+            entries = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            terms = self._conn.execute("SELECT COUNT(DISTINCT term) FROM postings").fetchone()[0]
+        return {"files": files, "entries": entries, "terms": terms}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,55 @@
+# scraper/selector_cache.py
+import json
+import os
+import threading
+
+from .utils import ensure_dir
+
+
+class SelectorCache:
+    """
+    Remembers which selector worked for each page field (state dropdown, result table, ...)
+    and persists it as JSON, so the next run tries the learned selectors first.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._learned = self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            return {k: list(v) for k, v in data.items() if isinstance(v, list)}
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self):
+        ensure_dir(os.path.dirname(self.path) or ".")
+        # unique per process and thread: sessions in other processes share the file
+        tmp = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._learned, f, indent=2)
+        os.replace(tmp, self.path)
+
+    def order(self, field, candidates):
+        """
+        candidates reordered so selectors that worked before (most recent first) lead.
+        Learned selectors that are no longer candidates are ignored.
+        """
+        with self._lock:
+            learned = [s for s in self._learned.get(field, []) if s in candidates]
+        return learned + [s for s in candidates if s not in learned]
+
+    def record(self, field, selector):
+        """Mark selector as the latest one that worked for field."""
+        with self._lock:
+            current = self._learned.get(field, [])
+            if current[:1] == [selector]:
+                return
+            self._learned[field] = [selector] + [s for s in current if s != selector]
+            try:
+                self._save()
+            except OSError:
+                pass
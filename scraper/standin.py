@@ -0,0 +1,342 @@
+# scraper/standin.py
+"""
+Local stand-in for the eCourts site that serves recorded responses.
+Lets the engines run offline against known input: HttpCourtsScraper replays the
+AJAX routes, ECourtsScraper drives the popup page served at "/", and DCourtsScraper
+reads the district court cause list files added with add_documents().
+
+    python -m scraper.standin benchmarks/fixtures/recordings/pune_2025-10-27.json --port 8765
+    python -m scraper.standin pune.json --seed-from downloads   # rebuild from saved lists first
+"""
+import argparse
+import base64
+import glob
+import html
+import json
+import os
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs, unquote
+
+from .html_table import rows_to_html, parse_options
+from .utils import export_basename
+
+
+def load_recording(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_recording(recording, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(recording, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def _options_html(options):
+    return "".join(f'<option value="{html.escape(v)}">{html.escape(t)}</option>' for v, t in options)
+
+
+def seed_recording(data, state, district, court_complex, date_str,
+                   state_code="1", dist_code="1", complex_code="1000001", est_code="1"):
+    """
+    Build a recording for one court complex from saved cause list rows
+    (e.g. a downloads/*.json file). Covers the page load, the district/complex/court
+    cascade and the cause list submission, in the shapes the live site answers with.
+    """
+    page = (
+        "<html><body>"
+        '<input type="hidden" id="app_token" value="standin-token">'
+        f'<select id="sess_state_code"><option value="">Select State</option>'
+        f'{_options_html([(state_code, state)])}</select>'
+        "</body></html>"
+    )
+    recording = {
+        "browser_date": date_str,
+        "routes": {
+            "cause_list/": [{"content_type": "text/html", "body": page}],
+            "casestatus/fillDistrict": [{
+                "match": {"state_code": state_code},
+                "json": {"dist_list": '<option value="">Select District</option>' + _options_html([(dist_code, district)]),
+                         "app_token": "standin-token"},
+            }],
+            "casestatus/fillcomplex": [{
+                "match": {"state_code": state_code, "dist_code": dist_code},
+                "json": {"complex_list": '<option value="">Select Court Complex</option>'
+                                         + _options_html([(f"{complex_code}@{est_code}@N", court_complex)]),
+                         "app_token": "standin-token"},
+            }],
+            "cause_list/fillCauseList": [{
+                "match": {"court_complex_code": complex_code},
+                "json": {"cause_list": '<option value="D" disabled>Courts</option>'
+                                       + _options_html([("1^1", "1-Civil Judge Senior Division")]),
+                         "app_token": "standin-token"},
+            }],
+            "cause_list/submitCauseList": [
+                {
+                    # any other court/date/case type: the site's empty answer
+                    "json": {"case_data": "<table id='resultTable'><tr><th>Sr No</th></tr></table>",
+                             "app_token": "standin-token"},
+                },
+            ],
+        }
+    }
+    return add_listing(recording, data, date_str)
+
+
+def add_listing(recording, data, date_str, court_no="1^1", cicri="civ"):
+    """
+    Record the cause list answer for one more date (ahead of the empty catch-all).
+    The page served to browsers defaults to the latest recorded date.
+    """
+    causelist_date = "-".join(reversed(date_str.split("-")))
+    candidates = recording["routes"]["cause_list/submitCauseList"]
+    candidates[:] = [c for c in candidates if c.get("match") != {
+        "CL_court_no": court_no, "causelist_date": causelist_date, "cicri": cicri}]
+    candidates.insert(len(candidates) - 1, {
+        "match": {"CL_court_no": court_no, "causelist_date": causelist_date, "cicri": cicri},
+        "json": {"case_data": rows_to_html(data), "app_token": "standin-token"},
+    })
+    recording["browser_date"] = max(recording.get("browser_date") or date_str, date_str)
+    return recording
+
+
+def seed_from_downloads(download_dir, state, district, court_complex, **codes):
+    """
+    Recording covering every saved list of one court complex in download_dir
+    (<State>_<District>_<Complex>_<YYYY-MM-DD>.json), e.g. the Pune samples.
+    codes: state_code / dist_code / complex_code / est_code as for seed_recording.
+    """
+    prefix = export_basename(state, district, court_complex, "")
+    recording = None
+    for path in sorted(glob.glob(os.path.join(download_dir, f"{glob.escape(prefix)}*.json"))):
+        m = re.fullmatch(re.escape(prefix) + r"(\d{4}-\d{2}-\d{2})\.json", os.path.basename(path))
+        if not m:
+            continue
+        data = load_recording(path)
+        if recording is None:
+            recording = seed_recording(data, state, district, court_complex, m.group(1), **codes)
+        else:
+            add_listing(recording, data, m.group(1))
+    if recording is None:
+        raise FileNotFoundError(f"no saved lists for {prefix}* in {download_dir}")
+    return recording
+
+
+def add_documents(recording, documents, index_route="cause-list/"):
+    """
+    Serve district court cause list files the way district sites publish them: a page at
+    index_route linking each file. documents: [(file name, link text, content, content type)]
+    with str or bytes content (e.g. PDFs); the files are served under index_route.
+    """
+    routes = recording.setdefault("routes", {})
+    links = recording.setdefault("documents", {}).setdefault(index_route, [])
+    for name, label, content, content_type in documents:
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        routes[index_route + name] = [{"content_type": content_type,
+                                       "body_b64": base64.b64encode(content).decode("ascii")}]
+        links[:] = [link for link in links if link[0] != name] + [[name, label]]
+    items = "".join(f'<li><a href="{html.escape(n)}">{html.escape(t)}</a></li>' for n, t in links)
+    routes[index_route] = [{"content_type": "text/html",
+                            "body": f"<html><body><h1>Cause List</h1><ul>{items}</ul></body></html>"}]
+    return recording
+
+
+# The cause list page as a browser sees it: the State/District/Court Complex popup
+# (options cascade through the recorded AJAX routes), then result tables revealed by script.
+BROWSER_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Cause List (stand-in)</title></head>
+<body>
+<div id="popup" class="modal">
+  <select id="sess_state_code"><option value="">Select State</option>%(states)s</select>
+  <select id="sess_dist_code"><option value="">Select District</option></select>
+  <select id="court_complex_code"><option value="">Select Court Complex</option></select>
+  <button type="button" id="proceed">Proceed</button>
+</div>
+<input type="hidden" id="causelist_date" value="%(date)s">
+<div id="res"></div>
+<script>
+var token = "standin-token";
+function post(route, data) {
+  data.ajax_req = "true"; data.app_token = token;
+  return fetch("?p=" + route, {method: "POST", body: new URLSearchParams(data)})
+    .then(function(r) { return r.json(); })
+    .then(function(b) { if (b.app_token) token = b.app_token; return b; });
+}
+function val(id) { return document.getElementById(id).value; }
+var q = new URLSearchParams(location.search);
+if (q.get("date")) document.getElementById("causelist_date").value = q.get("date");
+document.getElementById("sess_state_code").addEventListener("change", function() {
+  post("casestatus/fillDistrict", {state_code: val("sess_state_code")}).then(function(b) {
+    document.getElementById("sess_dist_code").innerHTML = b.dist_list || "";
+  });
+});
+document.getElementById("sess_dist_code").addEventListener("change", function() {
+  post("casestatus/fillcomplex", {state_code: val("sess_state_code"), dist_code: val("sess_dist_code")})
+    .then(function(b) { document.getElementById("court_complex_code").innerHTML = b.complex_list || ""; });
+});
+document.getElementById("proceed").addEventListener("click", function() {
+  var parts = val("court_complex_code").split("@");
+  var form = {state_code: val("sess_state_code"), dist_code: val("sess_dist_code"),
+              court_complex_code: parts[0], est_code: parts[1] || ""};
+  document.getElementById("popup").style.display = "none";
+  var d = val("causelist_date").split("-").reverse().join("-");
+  post("cause_list/fillCauseList", Object.assign({}, form)).then(function(b) {
+    var box = document.createElement("select"); box.innerHTML = b.cause_list || "";
+    var jobs = [];
+    Array.prototype.forEach.call(box.options, function(o) {
+      if (!o.value || o.disabled || o.value.toUpperCase() === "D") return;
+      ["civ", "cri"].forEach(function(c) {
+        jobs.push(post("cause_list/submitCauseList", Object.assign({
+          CL_court_no: o.value, causelist_date: d, court_name_txt: o.text,
+          cause_list_captcha_code: "", cicri: c, selprevdays: "0"}, form)));
+      });
+    });
+    return Promise.all(jobs);
+  }).then(function(answers) {
+    // reveal every non-empty list at once, like the live page after submit
+    var html = answers.map(function(b) { return b.case_data || ""; })
+      .filter(function(t) { return t.indexOf("<td") >= 0; }).join("");
+    document.getElementById("res").innerHTML = html;
+  });
+});
+</script>
+</body></html>
+"""
+
+
+def browser_page(recording):
+    """HTML for "/" built from the recorded state list."""
+    states = []
+    for entry in recording.get("routes", {}).get("cause_list/", []):
+        m = re.search(r"<select[^>]*>(.*?)</select>", entry.get("body", ""), re.S | re.I)
+        if m:
+            states = [(v, t) for v, t, _ in parse_options(m.group(1)) if v]
+            break
+    return BROWSER_PAGE % {"states": _options_html(states), "date": html.escape(recording.get("browser_date") or "")}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "eCourtsStandIn/1.0"
+    protocol_version = "HTTP/1.1"  # keep-alive, like the live site
+
+    def log_message(self, fmt, *args):
+        if self.server.verbose:
+            super().log_message(fmt, *args)
+
+    def _params(self):
+        url = urlparse(self.path)
+        params = {k: v[-1] for k, v in parse_qs(url.query, keep_blank_values=True).items()}
+        if self.command == "POST":
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length).decode("utf-8", "replace") if length else ""
+            params.update({k: v[-1] for k, v in parse_qs(body, keep_blank_values=True).items()})
+        return unquote(url.path), params
+
+    def _respond(self):
+        path, params = self._params()
+        with self.server.hits_lock:
+            self.server.hits += 1
+        route = params.get("p") or path.lstrip("/")
+        entry = None
+        for candidate in self.server.recording.get("routes", {}).get(route, []):
+            if all(params.get(k) == str(v) for k, v in candidate.get("match", {}).items()):
+                entry = candidate
+                break
+        if entry is None and route == "":
+            self._send(200, "text/html", browser_page(self.server.recording).encode("utf-8"))
+            return
+        if entry is None:
+            self._send(404, "text/plain", f"no recording for {route}".encode("utf-8"))
+            return
+        if "json" in entry:
+            self._send(200, "application/json", json.dumps(entry["json"]).encode("utf-8"))
+        elif "body_b64" in entry:
+            self._send(200, entry.get("content_type", "application/octet-stream"), base64.b64decode(entry["body_b64"]))
+        else:
+            self._send(200, entry.get("content_type", "text/html"), entry.get("body", "").encode("utf-8"))
+
+    def _send(self, status, content_type, body):
+        self.send_response(status)
+        text = content_type.startswith("text/") or content_type.endswith("json")
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8" if text else content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = _respond
+    do_POST = _respond
+
+
+class StandInServer:
+    """
+    Threaded HTTP server for a recording; use as a context manager.
+    Each recorded route maps to a list of candidates; the first whose "match"
+    params all equal the request's (query + form) params answers.
+    """
+
+    def __init__(self, recording, host="127.0.0.1", port=0, verbose=False):
+        self.httpd = ThreadingHTTPServer((host, port), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.recording = recording
+        self.httpd.verbose = verbose
+        self.httpd.hits = 0
+        self.httpd.hits_lock = threading.Lock()  # handlers run on one thread per request
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    @property
+    def hits(self):
+        with self.httpd.hits_lock:
+            return self.httpd.hits
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Serve a recorded eCourts session locally.")
+    ap.add_argument("recording")
+    ap.add_argument("--seed-from", metavar="DIR",
+                    help="rebuild the recording from the saved lists in DIR before serving")
+    ap.add_argument("--state", default="Maharashtra")
+    ap.add_argument("--district", default="Pune")
+    ap.add_argument("--court-complex", default="Pune, Civil and Criminal Court")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--verbose", action="store_true")
+    args = ap.parse_args()
+    if args.seed_from:
+        save_recording(seed_from_downloads(args.seed_from, args.state, args.district, args.court_complex),
+                       args.recording)
+    server = StandInServer(load_recording(args.recording), args.host, args.port, args.verbose)
+    print(f"Serving {args.recording} at {server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,95 @@
 # scraper/utils.py
 import os
+import re
 import json
 import csv
 from pathlib import Path
-from reportlab.lib.pagesizes import A4
-from reportlab.pdfgen import canvas
-from datetime import datetime
+
+# local state kept between runs (learned selectors, caches, indexes)
+DEFAULT_CACHE_DIR = ".ecourts_cache"
+# processes for exported PDFs: parallel rendering spawns a process pool, which re-imports
+# the caller's __main__, so it is opt-in (render_pdf also needs more than one chunk of rows)
+DEFAULT_PDF_WORKERS = 1
 
 def ensure_dir(path):
     Path(path).mkdir(parents=True, exist_ok=True)
 
+def export_basename(state, district, court_complex, date_str):
+    """
+    File name stem shared by the PDF/JSON/CSV exports of one cause list.
+    """
+    safe_state = re.sub(r'\W+', '_', state or "state")
+    safe_dist = re.sub(r'\W+', '_', district or "dist")
+    safe_complex = re.sub(r'\W+', '_', court_complex or "complex")
+    return f"{safe_state}_{safe_dist}_{safe_complex}_{date_str}"
+
+def save_exports(data, download_dir, state, district, court_complex, date_str, archive=None,
+                 pdf_workers=DEFAULT_PDF_WORKERS):
+    """
+    Write the PDF/JSON/CSV triple for one scraped cause list.
+    archive: optional ArchiveStore; the rows are stored there and the files are generated
+             into its bounded export directory instead of download_dir.
+    pdf_workers: processes rendering the PDF (see generate_pdf)
+    Returns dict with paths and data (the generate_pdf_for_date result shape).
+    """
+    from .export_pipeline import export_stream
+
+    if archive is not None:
+        archive.put(state, district, court_complex, date_str, data)
+        return archive.export(state, district, court_complex, date_str, rows=data, pdf_workers=pdf_workers)
+
+    fname_base = export_basename(state, district, court_complex, date_str)
+    # one pass over the rows feeds all three files
+    out = export_stream(
+        data,
+        json_path=os.path.join(download_dir, f"{fname_base}.json"),
+        csv_path=os.path.join(download_dir, f"{fname_base}.csv"),
+        pdf_path=os.path.join(download_dir, f"{fname_base}.pdf"),
+        title=f"Cause List - {state} / {district} / {court_complex}",
+        pdf_workers=pdf_workers,
+    )
+    return {"pdf": out["pdf"], "json": out["json"], "csv": out["csv"], "data": data}
+
+def finish_export(data, scraper, state, district, court_complex, date_str, delta=False, columnar=False):
+    """
+    Everything an engine does with a scraped cause list, each step in its own metrics phase:
+    exports (or delta exports), the optional .ccl file and the search index.
+    scraper: engine carrying download_dir, archive, pdf_workers and search_index
+    Returns the generate_pdf_for_date result dict.
+    """
+    from . import metrics
+    from .delta import save_exports_delta
+    from .models import save_columnar
+
+    save = save_exports_delta if delta else save_exports
+    with metrics.phase("export"):
+        result = save(data, scraper.download_dir, state, district, court_complex, date_str,
+                      archive=scraper.archive, pdf_workers=scraper.pdf_workers)
+    if columnar:
+        with metrics.phase("columnar"):
+            result["columnar"] = save_columnar(data, scraper.download_dir, state, district, court_complex, date_str)
+    if scraper.search_index is not None:
+        with metrics.phase("index"):
+            if scraper.archive is not None:
+                # exports under the archive are pruned; index the stored listing instead
+                scraper.search_index.update_archive(scraper.archive)
+            elif result.get("json"):
+                scraper.search_index.add_file(result["json"])
+    return result
+
+def column_order(rows):
+    """
+    Union of row keys in first-seen order (stable across runs, unlike a set).
+    """
+    keys = []
+    seen = set()
+    for row in rows:
+        for k in row.keys():
+            if k not in seen:
+                seen.add(k)
+                keys.append(k)
+    return keys
+
 def save_json(data, out_path):
     ensure_dir(os.path.dirname(out_path))
     with open(out_path, "w", encoding="utf-8") as f:
@@ -19,92 +99,29 @@ def save_json(data, out_path):
 def save_csv(data_list, out_path):
     """
     Save a list of dicts to CSV.
-    Handles dynamic/missing columns gracefully by using the union of all keys.
+    Handles dynamic/missing columns gracefully by using the union of all keys
+    (first-seen order); missing values are written as empty strings.
     """
     ensure_dir(os.path.dirname(out_path))
     if not data_list:
         return None
 
-    # Get union of all keys
-    all_keys = set()
-    for row in data_list:
-        all_keys.update(row.keys())
-    keys = list(all_keys)
-
-    # Normalize rows: fill missing keys with empty string
-    normalized_rows = []
-    for row in data_list:
-        normalized_rows.append({k: row.get(k, "") for k in keys})
+    keys = column_order(data_list)
 
     with open(out_path, "w", newline='', encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=keys)
+        writer = csv.DictWriter(f, fieldnames=keys, restval="")
         writer.writeheader()
-        writer.writerows(normalized_rows)
+        writer.writerows(data_list)
     return out_path
 
-def generate_pdf(data_list, out_path, title="eCourts Cause List"):
+def generate_pdf(data_list, out_path, title="eCourts Cause List", headers=None, workers=1):
     """
-    Simple multi-page PDF generator using ReportLab.
-    data_list: list of dicts
+    Multi-page PDF table using ReportLab (see pdf_render for the layout engine).
+    data_list: list of dicts, or any iterable of dicts when headers is given
+    headers: column order; defaults to the union of all keys (first-seen order)
+    workers: >1 renders page chunks in parallel processes and merges them (needs pypdf)
+    Cells are word-wrapped to content-sized columns instead of truncated.
     """
-    ensure_dir(os.path.dirname(out_path))
-    c = canvas.Canvas(out_path, pagesize=A4)
-    width, height = A4
-    margin_x = 40
-    y = height - 60
+    from .pdf_render import render_pdf
 
-    c.setFont("Helvetica-Bold", 16)
-    c.drawCentredString(width / 2.0, y, title)
-    y -= 24
-    c.setFont("Helvetica", 10)
-    c.drawCentredString(width / 2.0, y, f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    y -= 30
-
-    if not data_list:
-        c.setFont("Helvetica", 12)
-        c.drawString(margin_x, y, "No data available.")
-        c.save()
-        return out_path
-
-    # headers (use union of all keys)
-    headers = set()
-    for row in data_list:
-        headers.update(row.keys())
-    headers = list(headers)
-    col_width = (width - 2 * margin_x) / len(headers)
-    
-    # draw headers
-    c.setFont("Helvetica-Bold", 10)
-    x = margin_x
-    for h in headers:
-        c.drawString(x, y, str(h).upper())
-        x += col_width
-    y -= 16
-    c.setFont("Helvetica", 9)
-
-    # draw rows
-    for i, row in enumerate(data_list, 1):
-        x = margin_x
-        for h in headers:
-            value = str(row.get(h, "")).replace("\n", " ")
-            # wrap if too long
-            max_chars = int(col_width // 6)
-            if len(value) > max_chars:
-                value = value[: max_chars - 3] + "..."
-            c.drawString(x, y, value)
-            x += col_width
-        y -= 14
-        if y < 60:
-            c.showPage()
-            y = height - 60
-            # redraw headers
-            c.setFont("Helvetica-Bold", 10)
-            x = margin_x
-            for h in headers:
-                c.drawString(x, y, str(h).upper())
-                x += col_width
-            y -= 16
-            c.setFont("Helvetica", 9)
-
-    c.save()
-    return out_path
+    return render_pdf(data_list, out_path, title=title, headers=headers, workers=workers)
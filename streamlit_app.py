@@ -1,94 +1,142 @@
 # streamlit_app.py
 import streamlit as st
 from datetime import datetime
-import os
-from scraper.ecourts_scraper import ECourtsScraper
-from scraper.dcourts_scraper import DCourtsScraper
+import time
+from scraper.search_index import SearchIndex
+from scraper.metrics import MetricsRecorder
+from scraper.jobs import JobManager, CauseListFetcher
+from scraper.archive import ArchiveStore
+
+FETCH_WORKERS = 2  # concurrent fetches across all sessions, each on its own Chrome
 
 st.set_page_config(page_title="⚖️ eCourts Smart Cause List Downloader", layout="wide")
 st.title("⚖️ eCourts Smart Cause List Downloader")
 
+@st.cache_resource
+def get_search_index():
+    return SearchIndex()
+
+@st.cache_resource
+def get_metrics_recorder():
+    # .ecourts_cache/metrics.jsonl + metrics.prom, totals shared by every session
+    return MetricsRecorder()
+
+@st.cache_resource
+def get_archive():
+    # deduplicated store of every fetched list; downloads are generated from it on demand
+    return ArchiveStore()
+
+@st.cache_resource
+def get_job_manager():
+    # one worker pool per process; each worker slot keeps its own warm Chrome session
+    fetcher = CauseListFetcher(download_dir="downloads", search_index=get_search_index(),
+                               metrics_recorder=get_metrics_recorder(), archive=get_archive())
+    return JobManager(fetcher, max_workers=FETCH_WORKERS)
+
 # ---------------- Inputs ----------------
 state = st.text_input("Enter State Name", "Maharashtra")
 district = st.text_input("Enter District Name", "Pune")
 court_complex = st.text_input("Enter Court Complex Name", "Pune, Civil and Criminal Court")
 date = st.date_input("Select Date", datetime.today())
 headless = st.checkbox("Headless Browser (unchecked to see Chrome)", False)
+block_resources = st.checkbox("Block images, fonts, stylesheets and analytics (faster page loads)", False)
 manual_fill = st.checkbox("Allow manual popup filling if auto-fill fails", True)
+force_refresh = st.checkbox("Force refresh (ignore cached results)", False)
 
 run_btn = st.button("Fetch Live Cause List & Generate PDF")
 
 # ---------------- Run Scraper ----------------
+# The fetch runs on the shared worker pool; this script only submits it and then
+# polls the job on each rerun, so the page stays responsive while Chrome works.
+STAGES = {
+    "queued": "⏳ Waiting for a free browser...",
+    "starting": "🚀 Starting fetch...",
+    "open_page": "🚀 Opening eCourts website...",
+    "auto_fill": "📝 Filling the court selection...",
+    "wait_table": "⌛ Waiting for the cause list...",
+    "parse": "📄 Reading cause list tables...",
+    "export": "💾 Writing PDF/CSV/JSON...",
+    "fallback": "⚠️ No data fetched. Using fallback cause list PDF...",
+}
+
 if run_btn:
-    status = st.empty()
-    status.info("🚀 Opening eCourts website and waiting for data...")
-    try:
-        # Initialize scraper
-        e_scraper = ECourtsScraper(
-            download_dir="downloads",
-            try_launch_chrome=True
-        )
-        
-        # Generate PDF/JSON/CSV
-        result = e_scraper.generate_pdf_for_date(
-            state=state,
-            district=district,
-            court_complex=court_complex,
-            date_str=date.strftime("%Y-%m-%d"),
-            allow_manual_fill=manual_fill
-        )
-        e_scraper.close()
+    params = {
+        "state": state,
+        "district": district,
+        "court_complex": court_complex,
+        "date_str": date.strftime("%Y-%m-%d"),
+        "allow_manual_fill": manual_fill,
+        "refresh": force_refresh,
+        "headless": headless,
+        "block_resources": block_resources,
+    }
+    # identical requests from several sessions share one in-flight job
+    job = get_job_manager().submit(params, key=tuple(sorted(params.items())))
+    st.session_state["job_id"] = job.id
 
-        # ---------------- Display results ----------------
-        data = result.get("data", [])
-        if data:
-            st.success(f"✅ Cause list fetched! {len(data)} rows found.")
-            st.dataframe(data)
+job = get_job_manager().get(st.session_state.get("job_id"))
+snap = job.snapshot() if job is not None else None
+if snap is not None and snap["status"] in ("queued", "running"):
+    st.info(f"{STAGES.get(snap['stage'], snap['stage'])} ({snap['elapsed']:.0f}s)")
+    if snap["rows"]:
+        st.caption(f"{len(snap['rows'])} rows so far")
+        st.dataframe(snap["rows"])
+elif snap is not None and snap["status"] == "failed":
+    st.error(f"❌ Error during fetch: {snap['error']}")
+elif snap is not None:
+    info = snap["info"]
+    if info.get("cache_hit"):
+        st.info("⚡ Served from cache (no browser needed).")
+    elif info.get("metrics"):
+        with st.expander("⏱️ Run timings"):
+            st.json(info["metrics"])
 
-            # PDF download
-            pdf_path = result.get("pdf")
-            if pdf_path and os.path.exists(pdf_path):
-                with open(pdf_path, "rb") as f:
-                    st.download_button(
-                        label="Download PDF",
-                        data=f,
-                        file_name=os.path.basename(pdf_path),
-                        mime="application/pdf"
-                    )
+    # ---------------- Display results ----------------
+    data = snap["rows"]
+    if info.get("fallback") and data:
+        st.warning(f"⚠️ No data fetched. Using the district court's published cause lists "
+                   f"({info.get('documents', 0)} files, {len(data)} rows).")
+        st.dataframe(data)
+    elif info.get("fallback"):
+        st.warning("⚠️ No data fetched, and the district court site has no cause list for this date."
+                   + (f" ({info['fallback_error']})" if info.get("fallback_error") else ""))
+    elif data:
+        st.success(f"✅ Cause list fetched! {len(data)} rows found.")
+        st.dataframe(data)
+    else:
+        st.warning("⚠️ No data fetched.")
 
-            # CSV download
-            csv_path = result.get("csv")
-            if csv_path and os.path.exists(csv_path):
-                with open(csv_path, "rb") as f:
-                    st.download_button(
-                        label="Download CSV",
-                        data=f,
-                        file_name=os.path.basename(csv_path),
-                        mime="text/csv"
-                    )
+    # downloads are served from the bytes the job read once when it finished
+    labels = {"pdf": "Download Fallback PDF" if info.get("fallback") else "Download PDF",
+              "csv": "Download CSV", "json": "Download JSON"}
+    for kind in ("pdf", "csv", "json"):
+        if kind in snap["files"]:
+            file_name, payload, mime = snap["files"][kind]
+            st.download_button(label=labels[kind], data=payload, file_name=file_name, mime=mime,
+                               key=f"{snap['id']}_{kind}")
 
-            # JSON download
-            json_path = result.get("json")
-            if json_path and os.path.exists(json_path):
-                with open(json_path, "rb") as f:
-                    st.download_button(
-                        label="Download JSON",
-                        data=f,
-                        file_name=os.path.basename(json_path),
-                        mime="application/json"
-                    )
-        else:
-            st.warning("⚠️ No data fetched. Using fallback cause list PDF...")
-            d_scraper = DCourtsScraper(download_dir="downloads")
-            pdf_path, fallback_data = d_scraper.download_all_for_date(date.strftime("%Y-%m-%d"))
-            st.dataframe(fallback_data)
-            with open(pdf_path, "rb") as f:
-                st.download_button(
-                    label="Download Fallback PDF",
-                    data=f,
-                    file_name=os.path.basename(pdf_path),
-                    mime="application/pdf"
-                )
+# ---------------- Search archive ----------------
+st.header("🔎 Search downloaded cause lists")
+query = st.text_input("Advocate, party or case number", "")
+field_label = st.selectbox("Search in", ["Any", "Advocate", "Party", "Case number", "Court"])
+court_filter = st.text_input("Court name contains (optional)", "")
+date_range = st.date_input("Listing dates (optional)", [])
+if query:
+    index = get_search_index()
+    index.update("downloads")
+    index.update_archive(get_archive())
+    field = {"Any": None, "Advocate": "advocate", "Party": "party",
+             "Case number": "case", "Court": "court"}[field_label]
+    date_from = date_range[0].strftime("%Y-%m-%d") if len(date_range) > 0 else None
+    date_to = date_range[-1].strftime("%Y-%m-%d") if len(date_range) > 0 else None
+    started = time.perf_counter()
+    hits = index.search(query, field=field, court=court_filter or None, date_from=date_from, date_to=date_to)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    st.caption(f"{len(hits)} listings in {elapsed_ms:.1f} ms")
+    if hits:
+        st.dataframe(hits)
 
-    except Exception as e:
-        st.error(f"❌ Error during fetch: {e}")
+# keep polling while the fetch is in flight (placed last so the whole page renders first)
+if snap is not None and snap["status"] in ("queued", "running"):
+    time.sleep(0.5)
+    st.rerun()